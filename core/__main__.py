@@ -0,0 +1,3 @@
+from core.runner import main
+
+main()
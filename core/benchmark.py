@@ -0,0 +1,108 @@
+"""
+
+This module is the benchmark suite for the Game of Life engines.
+Every case runs in a fresh ``python -m core`` process (so peak memory is measured per case)
+and all results are written to a single JSON file, which makes it easy to compare
+the step loops between commits.
+
+Usage::
+
+    python -m core.benchmark --output benchmark.json
+    python -m core.benchmark --quick --engines tiled hashlife
+
+Version: 1.0
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from core.engines import FIXED_ENGINES, INFINITE_ENGINES
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOUP_SIZES = (128, 256, 512)
+INFINITE_PATTERNS = ("r-pentomino", "gosper-gun", "acorn")
+
+
+def benchmark_cases(engines, quick: bool = False):
+    """
+    Build the list of benchmark cases.
+
+    Fixed engines run a random 50% soup (with and without wrapping) at several sizes,
+    infinite engines run the canonical patterns and a random soup.
+
+    Returns:
+        (list) Tuples of (case name, command line arguments for ``python -m core``).
+    """
+    sizes = SOUP_SIZES[:1] if quick else SOUP_SIZES
+    generations = 20 if quick else 100
+    long_generations = 200 if quick else 2000
+    cases = []
+
+    for engine in engines:
+        if engine in FIXED_ENGINES:
+            for size in sizes:
+                for wrap in (False, True):
+                    args = ["--engine", engine, "--width", str(size), "--height", str(size),
+                            "--pattern", "soup", "--seed", "1", "--generations", str(generations)]
+                    if wrap:
+                        args.append("--wrap")
+                    cases.append((f"{engine}/soup-{size}{'-wrap' if wrap else ''}", args))
+        elif engine in INFINITE_ENGINES:
+            for pattern in INFINITE_PATTERNS:
+                args = ["--engine", engine, "--pattern", pattern, "--generations", str(long_generations)]
+                cases.append((f"{engine}/{pattern}", args))
+            for size in sizes:
+                args = ["--engine", engine, "--pattern", "soup", "--seed", "1", "--soup-size", str(size),
+                        "--generations", str(generations)]
+                cases.append((f"{engine}/soup-{size}", args))
+
+    return cases
+
+
+def run_case(args) -> dict:
+    """Run one case in a separate process and return its parsed JSON result."""
+    completed = subprocess.run([sys.executable, "-m", "core", "--json", *args],
+                               capture_output=True, text=True, check=True, cwd=ROOT_DIR)
+    return json.loads(completed.stdout)
+
+
+def main(argv=None):
+    """Entry point of ``python -m core.benchmark``."""
+    parser = argparse.ArgumentParser(prog="python -m core.benchmark", description="Benchmark the Game of Life engines.")
+    parser.add_argument("--engines", nargs="+", default=sorted(FIXED_ENGINES) + sorted(INFINITE_ENGINES),
+                        choices=sorted(FIXED_ENGINES) + sorted(INFINITE_ENGINES), help="engines to benchmark")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer generations")
+    parser.add_argument("--output", default="benchmark.json", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, case_args in benchmark_cases(args.engines, args.quick):
+        result = run_case(case_args)
+        result["case"] = name
+        results.append(result)
+        # rates are None when the run was too short to time
+        rate = result["generations_per_second"]
+        updates = result["cell_updates_per_second"]
+        rate = f"{rate:,.1f}" if rate is not None else "-"
+        updates = f"{updates:,.0f}" if updates is not None else "-"
+        print(f"{name:<36} {rate:>12} gen/s {updates:>16} cells/s {result['peak_rss_kb'] or 0:>10,} KB")
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
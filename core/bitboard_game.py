@@ -0,0 +1,343 @@
+"""
+
+This module defines a bit-packed version of the fixed-size Game of Life grid.
+Each row is stored as a single Python integer where bit ``x`` holds the cell in column ``x``.
+A generation is computed with bit-sliced full adders over whole rows,
+so every bitwise operation updates a full row of cells at once.
+
+Version: 1.0
+"""
+
+from core.changes import ChangeSet
+from core.game_of_life import GameOfLife
+from core.profiling import NEIGHBORS, RULE, SWAP, phase
+
+# maps the characters of a binary string to cell bytes
+_BIT_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def full_add(a: int, b: int, c: int):
+    """
+    Add three bit planes bit by bit.
+
+    Returns:
+        (tuple) Sum plane (weight 1) and carry plane (weight 2).
+    """
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def neighbor_planes(above: int, row: int, below: int, shift_left, shift_right):
+    """
+    Compute the neighbor count of every cell in a row as four bit planes.
+
+    Args:
+        above (int): Packed row above.
+        row (int): Packed row itself.
+        below (int): Packed row below.
+        shift_left: Function moving every bit one column towards higher x.
+        shift_right: Function moving every bit one column towards lower x.
+
+    Returns:
+        (tuple) Planes with weights 1, 2, 4 and 8 of the count (0-8).
+    """
+    return count_planes(shift_left(above), above, shift_right(above),
+                        shift_left(row), shift_right(row),
+                        shift_left(below), below, shift_right(below))
+
+
+def count_planes(above_left: int, above: int, above_right: int, left: int, right: int,
+                 below_left: int, below: int, below_right: int):
+    """
+    Add the eight neighbor planes of a block of cells.
+
+    Every argument holds, at the position of each cell, the state of one of its neighbors.
+
+    Returns:
+        (tuple) Planes with weights 1, 2, 4 and 8 of the count (0-8).
+    """
+    ones_top, twos_top = full_add(above_left, above, above_right)
+    ones_mid, twos_mid = left ^ right, left & right
+    ones_bottom, twos_bottom = full_add(below_left, below, below_right)
+
+    ones, twos_carry = full_add(ones_top, ones_mid, ones_bottom)
+    twos_partial, fours_a = full_add(twos_top, twos_mid, twos_bottom)
+    twos, fours_b = twos_partial ^ twos_carry, twos_partial & twos_carry
+
+    return ones, twos, fours_a ^ fours_b, fours_a & fours_b
+
+
+def apply_rule(row: int, planes, mask: int, survive, birth) -> int:
+    """
+    Select the next state of every cell in a row from its neighbor count planes.
+
+    Args:
+        row (int): Packed current row.
+        planes (tuple): Count planes as returned by ``neighbor_planes``.
+        mask (int): Bits that belong to the row.
+        survive (set): Neighbor counts that keep a live cell alive.
+        birth (set): Neighbor counts that make a dead cell alive.
+
+    Returns:
+        (int) Packed next row.
+    """
+    result = 0
+
+    for count in survive | birth:
+        matches = mask
+        for bit, plane in enumerate(planes):
+            matches &= plane if count >> bit & 1 else ~plane
+        if count in survive and count in birth:
+            result |= matches
+        elif count in survive:
+            result |= matches & row
+        else:
+            result |= matches & ~row
+
+    return result & mask
+
+
+def _row_cells(rows, other_rows):
+    """Yield (x, y) of cells set in rows but not in other_rows."""
+    for y, (row, other) in enumerate(zip(rows, other_rows)):
+        only = row & ~other
+        while only:
+            lowest = only & -only
+            yield lowest.bit_length() - 1, y
+            only ^= lowest
+
+
+class BitGrid:
+    """
+    Grid of packed rows that can still be indexed as ``grid[y][x]``.
+
+    Args:
+        width (int): Width of the grid in cells.
+        height (int): Height of the grid in cells.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.rows = [0] * height
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, y: int):
+        return _BitRow(self, y)
+
+    def __iter__(self):
+        for y in range(len(self.rows)):
+            yield _BitRow(self, y)
+
+
+class _BitRow:
+    """View of a single packed row supporting ``row[x]`` reads and writes."""
+
+    def __init__(self, grid: BitGrid, y: int):
+        self._grid = grid
+        self._y = y
+
+    def __len__(self):
+        return self._grid.width
+
+    def __getitem__(self, x: int) -> bool:
+        return bool(self._grid.rows[self._y] >> x & 1)
+
+    def __setitem__(self, x: int, alive):
+        if alive:
+            self._grid.rows[self._y] |= 1 << x
+        else:
+            self._grid.rows[self._y] &= ~(1 << x)
+
+    def __iter__(self):
+        value = self._grid.rows[self._y]
+        for x in range(self._grid.width):
+            yield bool(value >> x & 1)
+
+
+class BitboardGameOfLife(GameOfLife):
+    """
+    Drop-in replacement for GameOfLife that keeps every row as a packed integer.
+
+    The grid uses one bit per cell, which is roughly 8 times less memory than a NumPy
+    boolean array and over 30 times less than a list of Python bools.
+    ``grid[y][x]`` reads and writes still work through lightweight row views.
+
+    Args:
+        width (int): Width of the grid in cells.
+        height (int): Height of the grid in cells.
+        wrap (bool): Whether the grid wraps around the edges.
+    """
+
+    def __init__(self, width: int, height: int, wrap: bool = False):
+        super().__init__(width, height, wrap)
+        self._mask = (1 << width) - 1
+
+    def _empty_grid(self) -> BitGrid:
+        """
+        Create a grid of the current size with all cells dead.
+
+        Returns:
+            (BitGrid) Packed grid with every row set to zero.
+        """
+        return BitGrid(self.width, self.height)
+
+    def toggle_cell(self, x: int, y: int):
+        """
+        Toggle the alive/dead state of a cell.
+
+        Args:
+            x (int): X-coordinate of the cell.
+            y (int): Y-coordinate of the cell.
+        """
+        self.grid.rows[y] ^= 1 << x
+
+    def set_cells(self, cells, alive: bool = True):
+        """
+        Set the state of many cells, applying one mask per touched row. Cells outside the grid are skipped.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+            alive (bool): New state of the cells.
+        """
+        rows = self.grid.rows
+        for y, mask in self._row_masks(cells).items():
+            if alive:
+                rows[y] |= mask
+            else:
+                rows[y] &= ~mask
+
+    def toggle_cells(self, cells):
+        """
+        Toggle the state of many cells, each distinct cell once. Cells outside the grid are skipped.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+        """
+        rows = self.grid.rows
+        for y, mask in self._row_masks(cells).items():
+            rows[y] ^= mask
+
+    def set_rows(self, rows):
+        """
+        Make cells alive from packed rows, each merged into its grid row with a single OR.
+        Cells outside the grid are skipped.
+
+        Args:
+            rows: Iterable of (x, y, bits) tuples, where bit i of bits is the cell at (x + i, y).
+        """
+        grid_rows = self.grid.rows
+        for x, y, bits in rows:
+            if 0 <= y < self.height:
+                grid_rows[y] |= (bits << x if x >= 0 else bits >> -x) & self._mask
+
+    def fill_rect(self, left: int, top: int, right: int, bottom: int, alive: bool = True):
+        """
+        Set the state of every cell with left <= x < right and top <= y < bottom.
+        The rectangle is clipped to the grid.
+        """
+        rect = self._clip_rect(left, top, right, bottom)
+        if rect is None:
+            return
+        left, top, right, bottom = rect
+        mask = ((1 << (right - left)) - 1) << left
+        rows = self.grid.rows
+        for y in range(top, bottom):
+            rows[y] = rows[y] | mask if alive else rows[y] & ~mask
+
+    def _row_masks(self, cells):
+        """
+        Group cells inside the grid by row.
+
+        Returns:
+            (dict) Packed mask of the cells of each row, keyed by row index.
+        """
+        masks = {}
+        for x, y in self._cells_inside(cells):
+            masks[y] = masks.get(y, 0) | 1 << x
+        return masks
+
+    @property
+    def population(self) -> int:
+        """
+        Returns the number of alive cells.
+        """
+        return sum(bin(row).count("1") for row in self.grid.rows)
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty.
+        """
+        rows = self.grid.rows
+        occupied = [y for y, row in enumerate(rows) if row]
+        if not occupied:
+            return None
+        combined = 0
+        for row in rows:
+            combined |= row
+        # the lowest set bit is the leftmost column
+        return (combined & -combined).bit_length() - 1, occupied[0], combined.bit_length(), occupied[-1] + 1
+
+    def cell_bytes(self):
+        """
+        Returns the grid as one byte per cell (1 alive, 0 dead), row by row.
+
+        Returns:
+            (bytes) width * height bytes.
+        """
+        row_format = f"0{self.width}b"
+        # binary strings put the highest bit (last column) first, so they are reversed
+        return "".join(format(row, row_format)[::-1] for row in self.grid.rows).encode().translate(_BIT_BYTES)
+
+    def _state_key(self):
+        """
+        Hash the packed rows for cycle detection.
+
+        Returns:
+            (tuple) Hash of the grid and its offset (always None on a fixed grid).
+        """
+        return hash(tuple(self.grid.rows)), None
+
+    def _advance(self):
+        """
+        Compute the next generation row by row using the current rule.
+        """
+        survive, birth = self.rule.survival, self.rule.birth
+        rows = self.grid.rows
+        mask = self._mask
+        last = self.width - 1
+
+        if self.wrap:
+            def shift_left(value):
+                return ((value << 1) | (value >> last)) & mask
+
+            def shift_right(value):
+                return (value >> 1) | ((value & 1) << last)
+
+            padded = [rows[-1]] + rows + [rows[0]]
+        else:
+            def shift_left(value):
+                return (value << 1) & mask
+
+            def shift_right(value):
+                return value >> 1
+
+            padded = [0] + rows + [0]
+
+        with phase(NEIGHBORS):
+            planes = [neighbor_planes(padded[y], padded[y + 1], padded[y + 2], shift_left, shift_right)
+                      for y in range(self.height)]
+        new_grid = self._empty_grid()
+        with phase(RULE):
+            new_grid.rows = [apply_rule(row, row_planes, mask, survive, birth)
+                             for row, row_planes in zip(rows, planes)]
+
+        old_rows = rows
+        with phase(SWAP):
+            self.grid = new_grid
+            self.generation += 1
+        return ChangeSet(lambda: (_row_cells(new_grid.rows, old_rows), _row_cells(old_rows, new_grid.rows)),
+                         lambda: sum(bin(old ^ new).count("1") for old, new in zip(old_rows, new_grid.rows)),
+                         lambda: (sum(bin(new & ~old).count("1") for old, new in zip(old_rows, new_grid.rows)),
+                                  sum(bin(old & ~new).count("1") for old, new in zip(old_rows, new_grid.rows))))
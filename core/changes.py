@@ -0,0 +1,80 @@
+"""
+
+This module defines the change set returned by ``next_generation`` of every engine:
+the cells that were born and the cells that died in that generation.
+
+Version: 1.1
+"""
+
+
+class ChangeSet:
+    """
+    Births and deaths of one generation, computed only when first asked for.
+
+    Engines keep references to their state before and after the generation instead of
+    building coordinate sets they may never need, so a change set is only valid until
+    the game is edited or advanced again.
+
+    Args:
+        compute (callable): Function returning (births, deaths), each an iterable of (x, y) tuples.
+        count (callable, optional): Cheap function returning the number of changed cells,
+            used by ``len`` before the cells themselves are needed.
+        counts (callable, optional): Cheap function returning the numbers of births and deaths,
+            used by ``counts`` before the cells themselves are needed.
+    """
+    __slots__ = ('_compute', '_count', '_counts', '_births', '_deaths')
+
+    def __init__(self, compute, count=None, counts=None):
+        self._compute = compute
+        self._count = count
+        self._counts = counts
+        self._births = None
+        self._deaths = None
+
+    def _resolve(self):
+        """Compute births and deaths on first use."""
+        if self._births is None:
+            births, deaths = self._compute()
+            self._births = frozenset(births)
+            self._deaths = frozenset(deaths)
+
+    @property
+    def births(self) -> frozenset:
+        """Cells that became alive."""
+        self._resolve()
+        return self._births
+
+    @property
+    def deaths(self) -> frozenset:
+        """Cells that died."""
+        self._resolve()
+        return self._deaths
+
+    def cells(self) -> frozenset:
+        """
+        Returns all cells whose state changed.
+        """
+        return self.births | self.deaths
+
+    def counts(self) -> tuple:
+        """
+        Returns the numbers of births and deaths, without building the cell sets when the engine can count them.
+        """
+        if self._births is None and self._counts is not None:
+            return self._counts()
+        return len(self.births), len(self.deaths)
+
+    def __len__(self):
+        if self._births is None and self._count is not None:
+            return self._count()
+        return len(self.births) + len(self.deaths)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        return f"ChangeSet(births={set(self.births)!r}, deaths={set(self.deaths)!r})"
+
+
+# returned when nothing can change, e.g. by infinite engines with an empty board
+NO_CHANGES = ChangeSet(lambda: ((), ()), lambda: 0, lambda: (0, 0))
@@ -0,0 +1,328 @@
+"""
+
+This module defines a compact binary checkpoint format for Game of Life boards,
+so long simulations can be saved and resumed exactly where they stopped.
+
+Layout (all integers little-endian)::
+
+    header      magic "GOLCKPT\\0", format version (u16), kind (u8: 0 fixed, 1 infinite),
+                flags (u8: bit 0 wrap), width (u32), height (u32), population (u64), count (u64)
+    strings     engine name, rule and generation (decimal), each a u16 length followed by ASCII
+    payload     fixed grids: ``height`` rows of ``(width + 7) // 8`` bytes, bit x of a row is cell x
+                infinite grids: ``count`` runs of live cells sorted by (y, x), stored as three int32
+                arrays: y deltas, start x deltas (both from the previous run) and run lengths
+
+Files are written to a temporary file and renamed over the target, so a crash never leaves
+a half-written checkpoint. They are read through ``mmap``: rows and run arrays are decoded
+by ``int.from_bytes`` and ``array`` in C, never byte by byte in Python.
+
+Version: 1.1
+"""
+
+import io
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from itertools import accumulate
+
+from core.engines import ENGINES, create_game, is_fixed
+from core.pattern_io import live_runs
+from core.stepping import RUNNING, StepReport
+
+MAGIC = b"GOLCKPT\0"
+VERSION = 1
+FIXED = 0
+INFINITE = 1
+_WRAP = 1
+
+_HEADER = struct.Struct("<8sHBBIIQQ")
+_LENGTH = struct.Struct("<H")
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class CheckpointInfo:
+    """
+    Header of a checkpoint file.
+
+    Attributes:
+        engine (str): Name of the engine that wrote the checkpoint (see core.engines).
+        fixed (bool): Whether the board is a fixed-size grid.
+        wrap (bool): Whether the fixed grid wraps around its edges.
+        width (int): Width of the fixed grid (0 on the infinite grid).
+        height (int): Height of the fixed grid (0 on the infinite grid).
+        rule (str): Rule in B/S notation.
+        generation (int): Generation of the board.
+        population (int): Number of live cells.
+        count (int): Number of runs stored for an infinite grid.
+        offset (int): Position of the payload in the file.
+    """
+
+    def __init__(self, engine, fixed, wrap, width, height, rule, generation, population, count, offset=0):
+        self.engine = engine
+        self.fixed = fixed
+        self.wrap = wrap
+        self.width = width
+        self.height = height
+        self.rule = rule
+        self.generation = generation
+        self.population = population
+        self.count = count
+        self.offset = offset
+
+
+def engine_name(game) -> str:
+    """
+    Returns the name a game's engine is registered under in core.engines.
+    """
+    for name, engine in ENGINES.items():
+        if type(game) is engine:
+            return name
+    return "fixed" if is_fixed(game) else "infinite"
+
+
+def save_checkpoint(game, path: str):
+    """
+    Write a game to a checkpoint file atomically.
+
+    Args:
+        game: Game to save.
+        path (str): Path of the checkpoint file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix=".checkpoint-", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as stream:
+            _write(game, stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _write(game, stream):
+    """Write the header and payload of a checkpoint to a binary stream."""
+    fixed = is_fixed(game)
+    if fixed:
+        width, height, count = game.width, game.height, 0
+        flags = _WRAP if game.wrap else 0
+    else:
+        width = height = flags = 0
+        starts, lengths, ys = array("i"), array("i"), array("i")
+        try:
+            for y, runs in live_runs(game):
+                for start, end in runs:
+                    ys.append(y)
+                    starts.append(start)
+                    lengths.append(end - start)
+            # the deltas must fit as well; they are computed before anything is written,
+            # so a board that cannot be stored leaves no partial checkpoint behind
+            columns = (_deltas(ys), _deltas(starts), lengths)
+        except OverflowError:
+            raise ValueError("Checkpoints only store coordinates that fit in 32 bits") from None
+        count = len(lengths)
+
+    stream.write(_HEADER.pack(MAGIC, VERSION, FIXED if fixed else INFINITE, flags,
+                              width, height, game.population, count))
+    for text in (engine_name(game), str(game.rule), str(game.generation)):
+        data = text.encode("ascii")
+        stream.write(_LENGTH.pack(len(data)) + data)
+
+    if fixed:
+        row_bytes = (width + 7) // 8
+        cells = memoryview(game.cell_bytes())
+        for y in range(height):
+            # one byte per cell becomes a binary number with column 0 as its lowest bit
+            digits = bytes(cells[y * width:(y + 1) * width])[::-1].translate(_TO_DIGITS)
+            stream.write(int(digits or b"0", 2).to_bytes(row_bytes, "little"))
+    else:
+        for values in columns:
+            if sys.byteorder == "big":
+                values.byteswap()
+            stream.write(values.tobytes())
+
+
+def _deltas(values: array) -> array:
+    """Returns the differences between consecutive values (the first value is kept as is)."""
+    return array("i", [value - previous for previous, value in zip([0] + values.tolist(), values)])
+
+
+def read_info(path: str) -> CheckpointInfo:
+    """
+    Read the header of a checkpoint file.
+
+    Returns:
+        (CheckpointInfo) Header of the file.
+    """
+    with open(path, "rb") as stream:
+        return _read_info(stream.read(_HEADER.size + 3 * (_LENGTH.size + 0xFFFF)))
+
+
+def _read_info(data) -> CheckpointInfo:
+    """Parse the header at the start of a buffer."""
+    try:
+        magic, version, kind, flags, width, height, population, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a Game of Life checkpoint")
+        if version != VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version}")
+
+        offset = _HEADER.size
+        strings = []
+        for _ in range(3):
+            length, = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            strings.append(bytes(data[offset:offset + length]).decode("ascii"))
+            offset += length
+    except struct.error:
+        raise ValueError("Truncated checkpoint") from None
+
+    engine, rule, generation = strings
+    return CheckpointInfo(engine, kind == FIXED, bool(flags & _WRAP), width, height, rule,
+                          int(generation), population, count, offset)
+
+
+def load_checkpoint(game, path: str) -> CheckpointInfo:
+    """
+    Replace the state of a game with a checkpoint file.
+
+    The game must be of the same kind (fixed or infinite) and, for fixed grids, of the same size.
+
+    Args:
+        game: Game to restore into.
+        path (str): Path of the checkpoint file.
+
+    Returns:
+        (CheckpointInfo) Header of the file.
+    """
+    with open(path, "rb") as stream:
+        if os.fstat(stream.fileno()).st_size == 0:
+            raise ValueError("Empty checkpoint file")
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return load_checkpoint_bytes(game, data)
+
+
+def checkpoint_bytes(game) -> bytes:
+    """
+    Returns a game encoded in the checkpoint format, e.g. to keep it in memory.
+    """
+    stream = io.BytesIO()
+    _write(game, stream)
+    return stream.getvalue()
+
+
+def load_checkpoint_bytes(game, data) -> CheckpointInfo:
+    """
+    Replace the state of a game with a checkpoint held in a buffer (bytes, mmap or memoryview).
+
+    Returns:
+        (CheckpointInfo) Header of the checkpoint.
+    """
+    info = _read_info(data)
+    if info.fixed != is_fixed(game):
+        kinds = ("an infinite", "a fixed")
+        raise ValueError(f"Checkpoint holds {kinds[info.fixed]} grid, the game has {kinds[is_fixed(game)]} grid")
+    if info.fixed and (info.width, info.height) != (game.width, game.height):
+        raise ValueError(f"Checkpoint grid is {info.width}x{info.height}, "
+                         f"the game grid is {game.width}x{game.height}")
+
+    game.clear()
+    game.set_rule(info.rule)
+    if info.fixed:
+        game.wrap = info.wrap
+        game.set_rows(_fixed_rows(data, info))
+    else:
+        game.set_rows(_infinite_rows(data, info))
+    game.generation = info.generation
+    return info
+
+
+def _fixed_rows(data, info):
+    """Yield the packed rows of a fixed grid payload as (x, y, bits)."""
+    row_bytes = (info.width + 7) // 8
+    end = info.offset + row_bytes * info.height
+    if len(data) < end:
+        raise ValueError("Truncated checkpoint")
+    for y in range(info.height):
+        start = info.offset + y * row_bytes
+        yield 0, y, int.from_bytes(data[start:start + row_bytes], "little")
+
+
+def _infinite_rows(data, info):
+    """Returns the runs of an infinite grid payload as (x, y, bits) rows."""
+    size = 4 * info.count
+    if len(data) < info.offset + 3 * size:
+        raise ValueError("Truncated checkpoint")
+    columns = []
+    for i in range(3):
+        values = array("i")
+        start = info.offset + i * size
+        values.frombytes(data[start:start + size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        columns.append(values)
+    y_deltas, start_deltas, lengths = columns
+    return zip(accumulate(start_deltas), accumulate(y_deltas), map(_run_bits, lengths))
+
+
+def _run_bits(length):
+    """Packed row of a run of live cells."""
+    return (1 << length) - 1
+
+
+def restore(path: str):
+    """
+    Create a game of the engine that wrote a checkpoint and load the checkpoint into it.
+
+    Args:
+        path (str): Path of the checkpoint file.
+
+    Returns:
+        Restored game.
+    """
+    info = read_info(path)
+    engine = info.engine if info.engine in ENGINES else ("fixed" if info.fixed else "infinite")
+    game = create_game(engine, info.width, info.height, info.wrap)
+    load_checkpoint(game, path)
+    return game
+
+
+class AutoCheckpoint:
+    """
+    Runs a game in chunks of generations and saves a checkpoint after each chunk.
+
+    Args:
+        path (str): Path of the checkpoint file, overwritten every time.
+        interval (int): Generations between checkpoints.
+    """
+
+    def __init__(self, path: str, interval: int):
+        if interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1 generation")
+        self.path = path
+        self.interval = interval
+        self.saved = 0
+
+    def run(self, game, generations: int, detect_cycles: bool = False, step=None) -> StepReport:
+        """
+        Advance a game by up to the given number of generations, checkpointing along the way.
+
+        Cycles are detected within each chunk, so only periods shorter than the interval are found.
+        ``step`` replaces ``game.step`` for advancing each chunk, e.g. to record statistics.
+
+        Returns:
+            (StepReport) Combined report of all chunks.
+        """
+        step = step or game.step
+        advanced = 0
+        report = StepReport(0, game.generation, RUNNING)
+        while advanced < generations and not report.stabilized:
+            report = step(min(self.interval, generations - advanced), detect_cycles=detect_cycles)
+            advanced += report.generations
+            save_checkpoint(game, self.path)
+            self.saved += 1
+        return StepReport(advanced, game.generation, report.status, report.period, report.displacement)
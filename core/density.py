@@ -0,0 +1,100 @@
+"""
+
+This module provides population counts of square blocks of cells at several resolutions,
+used to draw a density map of the plane when it is zoomed out below one pixel per cell.
+
+Level ``k`` splits the plane into blocks of 2**k by 2**k cells; block (bx, by)
+covers cells with ``x >> k == bx`` and ``y >> k == by``.
+
+Version: 1.0
+"""
+
+from collections import Counter
+
+
+def count_blocks(cells, level: int) -> Counter:
+    """
+    Count live cells per block of the given level.
+
+    Args:
+        cells: Iterable of (x, y) coordinates of live cells.
+        level (int): Block level, blocks are 2**level cells wide.
+
+    Returns:
+        (Counter) Number of live cells keyed by block coordinates.
+    """
+    return Counter((x >> level, y >> level) for x, y in cells)
+
+
+class PopulationPyramid:
+    """
+    Block populations of every level above a base level, computed lazily and cached.
+
+    Each level is derived from the closest level already computed below it by adding up
+    the blocks that fall into the same parent, so a pyramid is built at most once per pattern
+    and every further level costs less than the previous one.
+
+    Args:
+        base_level (int): Lowest level of the pyramid.
+        base_counts (callable): Function returning the block populations of the base level.
+    """
+
+    def __init__(self, base_level: int, base_counts):
+        self.base_level = base_level
+        self._base_counts = base_counts
+        self._levels = {}
+
+    def counts(self, level: int) -> dict:
+        """
+        Returns the block populations of a level (not lower than the base level).
+        """
+        if level < self.base_level:
+            raise ValueError(f"Level {level} is below the base level {self.base_level}")
+        if level not in self._levels:
+            if level == self.base_level:
+                self._levels[level] = self._base_counts()
+            else:
+                lower = max((known for known in self._levels if known < level), default=self.base_level)
+                shift = level - lower
+                counts = Counter()
+                for (bx, by), population in self.counts(lower).items():
+                    counts[bx >> shift, by >> shift] += population
+                self._levels[level] = counts
+        return self._levels[level]
+
+
+def density_bytes(counts, left: int, top: int, cols: int, rows: int, level: int) -> bytearray:
+    """
+    Convert block populations into one byte per block for a rectangle of blocks.
+
+    Each byte is the live fraction of its block scaled to 0-255; blocks with at least
+    one live cell never map to 0, so a lone cell stays visible at any zoom level.
+
+    Args:
+        counts (dict): Block populations keyed by block coordinates.
+        left (int): Block x-coordinate of the first column.
+        top (int): Block y-coordinate of the first row.
+        cols (int): Number of block columns.
+        rows (int): Number of block rows.
+        level (int): Block level.
+
+    Returns:
+        (bytearray) cols * rows bytes, row by row.
+    """
+    pixels = bytearray(cols * rows)
+    area = 1 << (2 * level)
+
+    if len(counts) < cols * rows:
+        for (bx, by), population in counts.items():
+            x, y = bx - left, by - top
+            if population and 0 <= x < cols and 0 <= y < rows:
+                pixels[y * cols + x] = population * 255 // area or 1
+    else:
+        get = counts.get
+        for y in range(rows):
+            row = y * cols
+            for x in range(cols):
+                population = get((left + x, top + y))
+                if population:
+                    pixels[row + x] = population * 255 // area or 1
+    return pixels
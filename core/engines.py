@@ -0,0 +1,71 @@
+"""
+
+This module maps engine names to Game of Life implementations,
+so headless tools can pick an engine from the command line.
+
+Optional engines (NumPy based ones) are only listed when their dependencies are installed.
+
+Version: 1.0
+"""
+
+from core.bitboard_game import BitboardGameOfLife
+from core.game_of_life import GameOfLife
+from core.hashlife import HashLifeGameOfLife
+from core.infinite_game import InfiniteGameOfLife
+from core.tiled_game import TiledGameOfLife
+
+FIXED_ENGINES = {
+    "fixed": GameOfLife,
+    "bitboard": BitboardGameOfLife,
+}
+
+INFINITE_ENGINES = {
+    "infinite": InfiniteGameOfLife,
+    "tiled": TiledGameOfLife,
+    "hashlife": HashLifeGameOfLife,
+}
+
+try:
+    from core.numpy_game import NumpyGameOfLife
+    from core.parallel_game import ParallelGameOfLife
+except ImportError:
+    pass
+else:
+    FIXED_ENGINES["numpy"] = NumpyGameOfLife
+    FIXED_ENGINES["parallel"] = ParallelGameOfLife
+
+ENGINES = {**FIXED_ENGINES, **INFINITE_ENGINES}
+
+
+def create_game(engine: str, width: int = None, height: int = None, wrap: bool = False):
+    """
+    Create a game with the given engine.
+
+    Args:
+        engine (str): Name of the engine, one of ``ENGINES``.
+        width (int, optional): Width of the grid (fixed engines only).
+        height (int, optional): Height of the grid (fixed engines only).
+        wrap (bool): Whether the grid wraps around the edges (fixed engines only).
+
+    Returns:
+        GameOfLife or InfiniteGameOfLife instance.
+    """
+    if engine in FIXED_ENGINES:
+        if width is None or height is None:
+            raise ValueError(f"Engine {engine!r} needs a width and height")
+        return FIXED_ENGINES[engine](width, height, wrap)
+    if engine in INFINITE_ENGINES:
+        return INFINITE_ENGINES[engine]()
+    raise ValueError(f"Unknown engine {engine!r}, available: {', '.join(ENGINES)}")
+
+
+def is_fixed(game) -> bool:
+    """Whether a game has a fixed-size grid."""
+    return isinstance(game, GameOfLife)
+
+
+def close_game(game):
+    """Release resources held by engines that need it (worker processes, shared memory)."""
+    close = getattr(game, "close", None)
+    if close is not None:
+        close()
@@ -4,14 +4,30 @@ This module defines the core logic for customizable version of Conway's Game of
 It provides grid state management and rules for updating generations.
 
 Author: Shehabeldin Mohamed
-Version: 1.0
+Version: 1.3
 """
 
+from core.changes import ChangeSet
+from core.patterns import PASTE_OR, bit_runs, paste_cells, randomize_cells
+from core.profiling import RULE, SWAP, phase
+from core.rules import CONWAY, Rule, as_rule
+from core.snapshot import Snapshot
+from core.stepping import DEFAULT_MAX_PERIOD, StepReport, run_steps
+
+_DIRECTIONS = ((-1, -1), (-1, 0), (-1, 1),
+               (0, -1), (0, 1),
+               (1, -1), (1, 0), (1, 1))
+_NEIGHBORHOOD = _DIRECTIONS + ((0, 0),)
+
+
 class GameOfLife:
     """
-    Supports wraparound edges and configurable rules as follows:
-    A live cell survives if alive neighbors are within under/overpopulation limits.
-    A dead cell becomes alive if it has exactly `custom_reproduction_number` neighbors.
+    Supports wraparound edges and configurable rules.
+    The rule is a `Rule` object (B3/S23 by default) whose transition table
+    gives the next state of a cell from its state and number of alive neighbors.
+
+    Only cells next to those that changed in the previous generation are re-evaluated,
+    so the cost of a generation follows the activity on the board rather than its area.
 
     Args:
         width (int): Width of the grid in cells.
@@ -24,10 +40,23 @@ class GameOfLife:
         self.height = height
         self.wrap = wrap
         self.generation = 0
-        self.grid = [[False for _ in range(width)] for _ in range(height)]
-        self.custom_overpopulation_limit = 7
-        self.custom_underpopulation_limit = 1
-        self.custom_reproduction_number = 4
+        self.grid = self._empty_grid()
+        # cells flipped by the last generation, None when a full sweep is needed
+        self._changed_cells = None
+        self._tracked_grid = None
+        self._swept_rule = None
+        self.rule = CONWAY
+        # generation history for rewind and seek, see enable_history
+        self.history = None
+
+    def _empty_grid(self):
+        """
+        Create a grid of the current size with all cells dead.
+
+        Returns:
+            (list) Rows of cell states, indexed as grid[y][x].
+        """
+        return [[False for _ in range(self.width)] for _ in range(self.height)]
 
     def toggle_cell(self, x: int, y: int):
         """
@@ -38,48 +67,308 @@ class GameOfLife:
             y (int): Y-coordinate of the cell.
         """
         self.grid[y][x] = not self.grid[y][x]
+        self._changed_cells = None
 
-    def next_generation(self):
+    def set_cell(self, x: int, y: int, alive: bool = True):
         """
-        Advance the simulation by one generation using standard Game of Life rules.
+        Set the alive/dead state of a cell.
+
+        Args:
+            x (int): X-coordinate of the cell.
+            y (int): Y-coordinate of the cell.
+            alive (bool): New state of the cell.
         """
-        new_grid = [[False for _ in range(self.width)] for _ in range(self.height)]
+        self.grid[y][x] = bool(alive)
+        self._changed_cells = None
 
-        for y in range(self.height):
-            for x in range(self.width):
-                alive_neighbors = self.count_alive_neighbors(x, y)
-                cell_alive = self.grid[y][x]
+    def set_cells(self, cells, alive: bool = True):
+        """
+        Set the state of many cells in one call. Cells outside the grid are skipped.
 
-                if cell_alive:
-                    if alive_neighbors in (2, 3):
-                        new_grid[y][x] = True
-                else:
-                    if alive_neighbors == 3:
-                        new_grid[y][x] = True
+        Unlike single-cell edits, bulk edits keep the change tracking of the incremental sweep:
+        only the neighborhoods of the edited cells are added to the next generation's candidates.
 
-        self.grid = new_grid
-        self.generation += 1
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+            alive (bool): New state of the cells.
+        """
+        alive = bool(alive)
+        grid = self.grid
+        cells = self._cells_inside(cells)
+        for x, y in cells:
+            grid[y][x] = alive
+        self._mark_edited(cells)
+
+    def toggle_cells(self, cells):
+        """
+        Toggle the state of many cells in one call, each distinct cell once. Cells outside the grid are skipped.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+        """
+        grid = self.grid
+        cells = list(dict.fromkeys(self._cells_inside(cells)))
+        for x, y in cells:
+            grid[y][x] = not grid[y][x]
+        self._mark_edited(cells)
+
+    def set_rows(self, rows):
+        """
+        Make cells alive from packed rows, the fastest way to load large patterns.
+        Cells outside the grid are skipped.
+
+        Args:
+            rows: Iterable of (x, y, bits) tuples, where bit i of bits is the cell at (x + i, y).
+        """
+        for x, y, bits in rows:
+            if not 0 <= y < self.height:
+                continue
+            row = self.grid[y]
+            for start, end in bit_runs(bits):
+                start, end = max(x + start, 0), min(x + end, self.width)
+                if start < end:
+                    row[start:end] = [True] * (end - start)
+        self._changed_cells = None
+
+    def fill_rect(self, left: int, top: int, right: int, bottom: int, alive: bool = True):
+        """
+        Set the state of every cell with left <= x < right and top <= y < bottom.
+        The rectangle is clipped to the grid.
+
+        Args:
+            left (int): Smallest x-coordinate (inclusive).
+            top (int): Smallest y-coordinate (inclusive).
+            right (int): Largest x-coordinate (exclusive).
+            bottom (int): Largest y-coordinate (exclusive).
+            alive (bool): New state of the cells.
+        """
+        rect = self._clip_rect(left, top, right, bottom)
+        if rect is None:
+            return
+        left, top, right, bottom = rect
+        cells = [bool(alive)] * (right - left)
+        for y in range(top, bottom):
+            self.grid[y][left:right] = cells
+        self._changed_cells = None
+
+    def clear_rect(self, left: int, top: int, right: int, bottom: int):
+        """
+        Kill every cell with left <= x < right and top <= y < bottom.
+        """
+        self.fill_rect(left, top, right, bottom, False)
+
+    def paste_pattern(self, pattern, x: int = 0, y: int = 0, mode: str = PASTE_OR):
+        """
+        Paste a pattern with its top-left corner at (x, y). Cells outside the grid are skipped.
+
+        Args:
+            pattern: Iterable of (x, y) coordinates of live cells relative to the pattern's top-left corner.
+            x (int): X-coordinate of the pattern's top-left corner.
+            y (int): Y-coordinate of the pattern's top-left corner.
+            mode (str): "or" adds the pattern, "xor" toggles its cells,
+                "replace" also kills the other cells of its bounding box.
+        """
+        paste_cells(self, pattern, x, y, mode)
+
+    def randomize(self, density: float = 0.5, seed=None, region=None):
+        """
+        Replace the cells of the grid, or of a region of it, with a random soup.
+
+        The soup is generated as packed rows and loaded in bulk; the same seed always gives the same soup.
+
+        Args:
+            density (float): Probability of each cell being alive, between 0 and 1.
+            seed: Seed for the random generator, None for a different soup every time.
+            region (tuple, optional): (left, top, right, bottom) of the area to fill, right and bottom
+                exclusive, clipped to the grid. The whole grid by default.
+        """
+        region = self._clip_rect(*region) if region is not None else (0, 0, self.width, self.height)
+        if region is not None:
+            randomize_cells(self, density, seed, region)
+
+    def _cells_inside(self, cells):
+        """
+        Returns the given cells that lie inside the grid.
+
+        Returns:
+            (list) (x, y) tuples.
+        """
+        width, height = self.width, self.height
+        return [(int(x), int(y)) for x, y in cells if 0 <= x < width and 0 <= y < height]
+
+    def _clip_rect(self, left, top, right, bottom):
+        """
+        Clip a rectangle to the grid.
+
+        Returns:
+            (tuple) (left, top, right, bottom) of the clipped rectangle, or None if it is empty.
+        """
+        left, top = max(left, 0), max(top, 0)
+        right, bottom = min(right, self.width), min(bottom, self.height)
+        if left >= right or top >= bottom:
+            return None
+        return left, top, right, bottom
+
+    def _mark_edited(self, cells):
+        """
+        Add edited cells to the cells the next generation re-evaluates the neighborhoods of.
+
+        Args:
+            cells (list): (x, y) coordinates of the edited cells.
+        """
+        if self._changed_cells is not None:
+            self._changed_cells = list(self._changed_cells) + cells
+
+    def next_generation(self) -> ChangeSet:
+        """
+        Advance the simulation by one generation using the current rule.
 
-    def next_generation_custom(self):
+        Returns:
+            (ChangeSet) Cells born and died in this generation.
         """
-        Advance the simulation by one generation using custom rules.
+        return self._advance()
+
+    def next_generation_custom(self) -> ChangeSet:
         """
-        new_grid = [[False for _ in range(self.width)] for _ in range(self.height)]
+        Advance the simulation by one generation.
 
-        for y in range(self.height):
-            for x in range(self.width):
-                alive_neighbors = self.count_alive_neighbors(x, y)
-                cell_alive = self.grid[y][x]
+        Kept for compatibility, custom rules are part of `rule` and used by `next_generation`.
+        """
+        return self._advance()
+
+    def step(self, n: int = 1, detect_cycles: bool = False, max_period: int = DEFAULT_MAX_PERIOD) -> StepReport:
+        """
+        Advance the simulation by up to n generations.
 
-                if cell_alive:
-                    if self.custom_underpopulation_limit <= alive_neighbors <= self.custom_overpopulation_limit:
-                        new_grid[y][x] = True
-                else:
-                    if alive_neighbors == self.custom_reproduction_number:
-                        new_grid[y][x] = True
+        Args:
+            n (int): Maximum number of generations to advance.
+            detect_cycles (bool): Stop early when the grid dies out or repeats an earlier state.
+            max_period (int): Longest oscillator period that can be detected.
+
+        Returns:
+            (StepReport) Number of generations advanced and the detected behavior.
+        """
+        return run_steps(self, n, detect_cycles, max_period)
 
-        self.grid = new_grid
+    @property
+    def population(self) -> int:
+        """
+        Returns the number of alive cells.
+        """
+        return sum(sum(row) for row in self.grid)
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty.
+
+        Rows are searched with bytes.find on ``cell_bytes``, so no Python code runs per cell.
+        """
+        cells = bytes(self.cell_bytes())
+        first, last = cells.find(1), cells.rfind(1)
+        if first < 0:
+            return None
+        width = self.width
+        top, bottom = first // width, last // width + 1
+        left, right = width, 0
+        for start in range(top * width, bottom * width, width):
+            row = cells[start:start + width]
+            column = row.find(1)
+            if column >= 0:
+                left = min(left, column)
+                right = max(right, row.rfind(1) + 1)
+        return left, top, right, bottom
+
+    def cell_bytes(self):
+        """
+        Returns the grid as one byte per cell (1 alive, 0 dead), row by row.
+
+        Used by the GUI to turn the grid into an image in a single step.
+
+        Returns:
+            (bytes) width * height bytes.
+        """
+        return bytes(cell for row in self.grid for cell in row)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Returns a read-only copy of the current state that other threads can draw.
+
+        Returns:
+            (Snapshot) Snapshot of the grid.
+        """
+        return Snapshot(self.generation, self.population, self.width, self.height, bytes(self.cell_bytes()))
+
+    def _step_many(self, n: int):
+        """
+        Advance n generations without any per-generation bookkeeping.
+        """
+        for _ in range(n):
+            self._advance()
+
+    def _state_key(self):
+        """
+        Hash the current grid for cycle detection.
+
+        Returns:
+            (tuple) Hash of the grid and its offset (always None on a fixed grid).
+        """
+        return hash(tuple(tuple(row) for row in self.grid)), None
+
+    def _advance(self):
+        """
+        Advance the simulation by one generation, re-evaluating only cells next to last generation's changes.
+
+        A full sweep over the grid is done when no change set is available
+        (first generation, after clear, edits or a rule change).
+        """
+        if self._changed_cells is None or self.rule != self._swept_rule or self.grid is not self._tracked_grid:
+            candidates = ((x, y) for y in range(self.height) for x in range(self.width))
+        else:
+            candidates = self._neighborhoods(self._changed_cells)
+
+        grid = self.grid
+        table = self.rule.table
+        flipped = []
+        # neighbors are counted cell by cell while the rule is applied, both are timed as one phase
+        with phase(RULE):
+            for x, y in candidates:
+                alive = grid[y][x]
+                if table[alive * 9 + self.count_alive_neighbors(x, y)] != alive:
+                    flipped.append((x, y))
+
+        # apply only after all cells were evaluated against the previous generation
+        births, deaths = [], []
+        with phase(SWAP):
+            for x, y in flipped:
+                alive = not grid[y][x]
+                grid[y][x] = alive
+                (births if alive else deaths).append((x, y))
+
+        self._changed_cells = flipped
+        self._tracked_grid = grid
+        self._swept_rule = self.rule
         self.generation += 1
+        return ChangeSet(lambda: (births, deaths), flipped.__len__, lambda: (len(births), len(deaths)))
+
+    def _neighborhoods(self, cells):
+        """
+        Collect the given cells together with all their neighbors inside the grid.
+
+        Args:
+            cells: Iterable of (x, y) coordinates.
+
+        Returns:
+            (set) Coordinates of cells whose state may change next generation.
+        """
+        result = set()
+        for x, y in cells:
+            for dx, dy in _NEIGHBORHOOD:
+                nx, ny = x + dx, y + dy
+                if self.wrap:
+                    result.add((nx % self.width, ny % self.height))
+                elif 0 <= nx < self.width and 0 <= ny < self.height:
+                    result.add((nx, ny))
+        return result
 
     def count_alive_neighbors(self, x: int, y: int) -> int:
         """
@@ -92,12 +381,9 @@ class GameOfLife:
         Returns:
             (int) Number of alive neighboring cells.
         """
-        directions = [(-1, -1), (-1, 0), (-1, 1),
-                      (0, -1), (0, 1),
-                      (1, -1), (1, 0), (1, 1)]
         count = 0
 
-        for dx, dy in directions:
+        for dx, dy in _DIRECTIONS:
             nx, ny = x + dx, y + dy
 
             if self.wrap:
@@ -109,6 +395,15 @@ class GameOfLife:
 
         return count
 
+    def set_rule(self, rule):
+        """
+        Set the rule used for following generations.
+
+        Args:
+            rule (Rule | str): Rule object or rulestring in B/S notation, e.g. "B36/S23".
+        """
+        self.rule = as_rule(rule)
+
     def set_custom_rules(self, overpop: int, underpop: int, repro: int):
         """
         Set custom rules for cell survival and reproduction.
@@ -118,25 +413,81 @@ class GameOfLife:
             underpop (int): Minimum neighbors for a live cell to survive.
             repro (int): Exact number of neighbors required for a dead cell to reproduce.
         """
-        self.custom_overpopulation_limit = overpop
-        self.custom_underpopulation_limit = underpop
-        self.custom_reproduction_number = repro
+        self.rule = Rule.from_limits(underpop, overpop, repro)
 
     def reset_custom_rules(self):
         """
         Reset the rules to standard Game of Life rules
         """
-        self.custom_overpopulation_limit = 3
-        self.custom_underpopulation_limit = 2
-        self.custom_reproduction_number = 3
+        self.rule = CONWAY
 
     def clear(self):
         """
         Reset the grid to all dead cells and reset generation count.
         """
-        self.grid = [[False for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = self._empty_grid()
+        self._changed_cells = None
         self.generation = 0
 
+    def save(self, path: str):
+        """
+        Write the board, rule and generation to a binary checkpoint file (see core.checkpoint).
+
+        Args:
+            path (str): Path of the checkpoint file, replaced atomically.
+        """
+        # imported here: the checkpoint module depends on every engine
+        from core.checkpoint import save_checkpoint
+        save_checkpoint(self, path)
+
+    def load(self, path: str):
+        """
+        Restore the board, rule and generation from a checkpoint file of a grid of the same size.
+
+        Args:
+            path (str): Path of the checkpoint file.
+        """
+        from core.checkpoint import load_checkpoint
+        load_checkpoint(self, path)
+
+    def enable_history(self, keyframe_interval: int = None, budget: int = None):
+        """
+        Start recording generations so that the game can be rewound (see core.history).
+
+        Args:
+            keyframe_interval (int, optional): Generations between keyframes of the whole grid.
+            budget (int, optional): Memory budget of the history in bytes.
+
+        Returns:
+            (History) The new history, starting at the current generation.
+        """
+        from core.history import DEFAULT_BUDGET, DEFAULT_KEYFRAME_INTERVAL, History
+        self.history = History(keyframe_interval or DEFAULT_KEYFRAME_INTERVAL, budget or DEFAULT_BUDGET)
+        self.history.edited(self)
+        return self.history
+
+    def rewind(self, n: int = 1) -> int:
+        """
+        Go back n generations, or to the oldest generation still in the history.
+
+        Returns:
+            (int) Generation the grid was restored to.
+        """
+        if self.history is None:
+            raise ValueError("History is not enabled, call enable_history first")
+        return self.history.rewind(self, n)
+
+    def seek(self, generation: int):
+        """
+        Restore the grid to a generation recorded in the history.
+
+        Args:
+            generation (int): Generation between ``history.first`` and ``history.last``.
+        """
+        if self.history is None:
+            raise ValueError("History is not enabled, call enable_history first")
+        self.history.seek(self, generation)
+
     def get_generation(self) -> int:
         """
         Returns the current generation number.
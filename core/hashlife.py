@@ -0,0 +1,489 @@
+"""
+
+This module defines a Hashlife engine for the infinite Game of Life grid.
+The plane is stored as a quadtree of canonical (hash-consed) nodes, and the result of
+advancing every node is memoized, so repeating structures are only ever computed once
+and a pattern can jump forward by millions of generations in a single call.
+
+Version: 1.0
+"""
+
+from core.changes import NO_CHANGES, ChangeSet
+from core.infinite_game import (FrozenCells, InfiniteGameOfLife, cells_bounding_box, cells_in_rect, pack_cell,
+                                 translation_key, unpack_cell)
+from core.profiling import RULE, SWAP, phase
+from core.snapshot import CellStore, Snapshot
+
+
+class _Node:
+    """
+    Quadtree node covering a square of 2**level by 2**level cells.
+
+    Nodes are immutable and canonical: two nodes with the same children are the same object,
+    so identity comparison and the default identity hash are enough for memoization.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, population=0):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+# level 0 leaves are shared by every engine, they do not depend on the rules
+_DEAD = _Node(0)
+_ALIVE = _Node(0, population=1)
+
+
+def _walk_rect(node, x, y, left, top, right, bottom):
+    """Yield live cells of a node whose top-left corner is (x, y) that lie inside a rectangle."""
+    size = 1 << node.level
+    if node.population == 0 or x >= right or y >= bottom or x + size <= left or y + size <= top:
+        return
+    if node.level == 0:
+        yield x, y
+        return
+    half = size >> 1
+    yield from _walk_rect(node.nw, x, y, left, top, right, bottom)
+    yield from _walk_rect(node.ne, x + half, y, left, top, right, bottom)
+    yield from _walk_rect(node.sw, x, y + half, left, top, right, bottom)
+    yield from _walk_rect(node.se, x + half, y + half, left, top, right, bottom)
+
+
+def _block_counts(node, x, y, level, left, top, right, bottom, counts):
+    """
+    Add the populations of 2**level blocks covered by a node whose top-left corner is (x, y) to a dict.
+
+    A node lying within a single block adds its stored population at once, so only nodes crossing
+    block borders are visited below the block level. The rectangle is in cells and block-aligned.
+    """
+    size = 1 << node.level
+    if node.population == 0 or x >= right or y >= bottom or x + size <= left or y + size <= top:
+        return
+    bx, by = x >> level, y >> level
+    if bx == (x + size - 1) >> level and by == (y + size - 1) >> level:
+        counts[bx, by] = counts.get((bx, by), 0) + node.population
+        return
+    half = size >> 1
+    _block_counts(node.nw, x, y, level, left, top, right, bottom, counts)
+    _block_counts(node.ne, x + half, y, level, left, top, right, bottom, counts)
+    _block_counts(node.sw, x, y + half, level, left, top, right, bottom, counts)
+    _block_counts(node.se, x + half, y + half, level, left, top, right, bottom, counts)
+
+
+def _node_bounds(node, cache):
+    """
+    Returns the bounding box of a node's live cells relative to its top-left corner, or None if empty.
+
+    Results are cached per node, so shared subtrees are only measured once.
+    """
+    if node.population == 0:
+        return None
+    if node.level == 0:
+        return 0, 0, 1, 1
+    bounds = cache.get(node)
+    if bounds is None:
+        half = 1 << (node.level - 1)
+        boxes = []
+        for child, dx, dy in ((node.nw, 0, 0), (node.ne, half, 0), (node.sw, 0, half), (node.se, half, half)):
+            box = _node_bounds(child, cache)
+            if box is not None:
+                boxes.append((box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy))
+        bounds = (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                  max(box[2] for box in boxes), max(box[3] for box in boxes))
+        cache[node] = bounds
+    return bounds
+
+
+class FrozenTree(CellStore):
+    """
+    Quadtree root of a HashLifeGameOfLife, kept by its snapshots (nodes are immutable).
+
+    Block populations are read from the populations stored in the nodes.
+
+    Args:
+        root (_Node): Root node.
+        x (int): X-coordinate of the root's top-left corner.
+        y (int): Y-coordinate of the root's top-left corner.
+    """
+
+    def __init__(self, root, x, y):
+        self.root = root
+        self.x = x
+        self.y = y
+
+    def cells_in_rect(self, left, top, right, bottom):
+        return _walk_rect(self.root, self.x, self.y, left, top, right, bottom)
+
+    def block_counts(self, level, left, top, right, bottom):
+        counts = {}
+        _block_counts(self.root, self.x, self.y, level,
+                      left << level, top << level, right << level, bottom << level, counts)
+        return counts
+
+    def bounding_box(self):
+        bounds = _node_bounds(self.root, {})
+        if bounds is None:
+            return None
+        left, top, right, bottom = bounds
+        return self.x + left, self.y + top, self.x + right, self.y + bottom
+
+
+class HashLifeGameOfLife(InfiniteGameOfLife):
+    """
+    Infinite Game of Life using the Hashlife algorithm.
+
+    Exposes the same interface as InfiniteGameOfLife (``live_cells``, ``toggle_cell``,
+    ``next_generation``, ``set_custom_rules``, ``clear``) and adds ``step(n)`` and
+    ``advance_to(generation)``, which run in time roughly logarithmic in ``n`` for regular patterns.
+
+    The quadtree is rebuilt from ``packed_cells`` whenever the set has been handed out
+    to a caller (who may have edited it), and the set is rebuilt lazily from the tree
+    after a step, so long headless runs never touch individual cells.
+
+    Args:
+        max_nodes (int): Size of the node cache. Once exceeded, memoized results are dropped
+            and nodes that are no longer reachable from the current pattern are released.
+    """
+
+    def __init__(self, max_nodes: int = 500_000):
+        self.max_nodes = max_nodes
+        self._nodes = {}
+        self._results = {}
+        self._empty_nodes = [_DEAD]
+        self._results_rule = None
+        self._root = None
+        self._origin = (0, 0)
+        self._cells = set()
+        self._cells_exposed = False
+        super().__init__()
+
+    @property
+    def packed_cells(self):
+        """Set of packed live cell keys, rebuilt from the quadtree if needed."""
+        if self._cells is None:
+            self._cells = set()
+            self._collect(self._root, *self._origin, self._cells)
+        self._cells_exposed = True
+        return self._cells
+
+    @packed_cells.setter
+    def packed_cells(self, cells):
+        self._cells = cells
+        self._cells_exposed = True
+
+    @property
+    def population(self) -> int:
+        """Number of live cells."""
+        if self._cells is not None:
+            return len(self._cells)
+        return self._root.population
+
+    def cells_in_rect(self, left, top, right, bottom):
+        """
+        Yield live cells with left <= x < right and top <= y < bottom as (x, y) tuples.
+
+        After a step the quadtree is walked directly, skipping every node that is empty
+        or lies outside the rectangle, so the cell set does not have to be rebuilt.
+        """
+        if self._cells is not None:
+            return cells_in_rect(self._cells, left, top, right, bottom)
+        return _walk_rect(self._root, *self._origin, left, top, right, bottom)
+
+    def snapshot(self):
+        """
+        Returns a read-only copy of the current state that other threads can draw.
+
+        Quadtree nodes are immutable, so after a step the snapshot simply keeps the root.
+        """
+        if self._cells is not None:
+            cells = frozenset(self._cells)
+            return Snapshot(self.generation, len(cells), cells=FrozenCells(cells))
+        return Snapshot(self.generation, self._root.population, cells=FrozenTree(self._root, *self._origin))
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty.
+
+        After a step the box is measured on the quadtree without rebuilding the cell set.
+        """
+        if self._cells is not None:
+            return cells_bounding_box(self._cells)
+        return FrozenTree(self._root, *self._origin).bounding_box()
+
+    def next_generation(self):
+        """
+        Calculate the next generation of cells.
+
+        Returns:
+            (ChangeSet) Cells born and died in this generation, found by comparing the quadtrees
+            before and after (nodes are immutable, so both stay valid).
+        """
+        if not self.population:
+            return NO_CHANGES
+        old_root, old_origin = self._tree()
+        # not self.step: the caller reports the generation to the history together with this change set
+        self._step_many(1)
+        new_root, new_origin = self._root, self._origin
+
+        def compute():
+            old_cells, new_cells = set(), set()
+            self._collect(old_root, *old_origin, old_cells)
+            self._collect(new_root, *new_origin, new_cells)
+            return map(unpack_cell, new_cells - old_cells), map(unpack_cell, old_cells - new_cells)
+        return ChangeSet(compute)
+
+    def _step_many(self, n: int):
+        """
+        Advance the simulation by ``n`` generations in O(log n) quadtree steps.
+
+        Args:
+            n (int): Number of generations to advance.
+        """
+        if self.population:
+            root, (x, y) = self._tree()
+            power = 0
+            # the quadtree computes neighbors and the rule in one recursion
+            with phase(RULE):
+                while n >> power:
+                    if n >> power & 1:
+                        root, x, y = self._advance_power_of_two(root, x, y, power)
+                        self._collect_garbage(root)
+                    power += 1
+
+            with phase(SWAP):
+                self._root, self._origin = self._crop(root, x, y)
+                self._cells = None
+                self._cells_exposed = False
+
+        self.generation += n
+
+    def advance_to(self, generation: int):
+        """
+        Advance the simulation until the given generation is reached.
+
+        Args:
+            generation (int): Target generation, must not be lower than the current one.
+        """
+        if generation < self.generation:
+            raise ValueError(f"Generation {generation} is in the past (current: {self.generation})")
+        self.step(generation - self.generation)
+
+    def _state_key(self):
+        """Hash the pattern for cycle detection without handing the cell set out for editing."""
+        if self._cells is None:
+            self._cells = set()
+            self._collect(self._root, *self._origin, self._cells)
+        return translation_key(self._cells)
+
+    def clear(self):
+        """Clear the grid and reset generation counter."""
+        self._cells = set()
+        self._root = None
+        self._cells_exposed = False
+        self.generation = 0
+
+    def _tree(self):
+        """Return the current quadtree and its origin, rebuilding it from live cells if they may have changed."""
+        if self._root is None or self._cells_exposed:
+            self._root, self._origin = self._build(self._cells)
+            self._cells_exposed = False
+        return self._root, self._origin
+
+    def _check_rules(self):
+        """Drop memoized results if the rules changed since they were computed."""
+        if self.rule != self._results_rule:
+            self._results.clear()
+            self._results_rule = self.rule
+
+    def _join(self, nw, ne, sw, se):
+        """Return the canonical node with the given four children."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(nw.level + 1, nw, ne, sw, se,
+                         nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def _empty(self, level):
+        """Return the canonical empty node of the given level."""
+        while len(self._empty_nodes) <= level:
+            child = self._empty_nodes[-1]
+            self._empty_nodes.append(self._join(child, child, child, child))
+        return self._empty_nodes[level]
+
+    def _build(self, cells):
+        """
+        Build a quadtree bottom-up from a collection of packed cell keys.
+
+        Returns:
+            (tuple) Root node and the (x, y) coordinates of its top-left corner.
+        """
+        if not cells:
+            return self._empty(3), (0, 0)
+
+        coordinates = [unpack_cell(key) for key in cells]
+        origin_x = min(x for x, _ in coordinates)
+        origin_y = min(y for _, y in coordinates)
+        blocks = {(x - origin_x, y - origin_y): _ALIVE for x, y in coordinates}
+        level = 0
+
+        while level < 3 or len(blocks) > 1 or (0, 0) not in blocks:
+            empty = self._empty(level)
+            parents = {}
+            for bx, by in blocks:
+                parents.setdefault((bx >> 1, by >> 1), None)
+            blocks = {
+                (px, py): self._join(blocks.get((2 * px, 2 * py), empty),
+                                     blocks.get((2 * px + 1, 2 * py), empty),
+                                     blocks.get((2 * px, 2 * py + 1), empty),
+                                     blocks.get((2 * px + 1, 2 * py + 1), empty))
+                for px, py in parents
+            }
+            level += 1
+
+        return blocks[(0, 0)], (origin_x, origin_y)
+
+    def _collect(self, node, x, y, cells):
+        """Add the packed keys of live cells of a node whose top-left corner is (x, y) to a set."""
+        if node is None or node.population == 0:
+            return
+        if node.level == 0:
+            cells.add(pack_cell(x, y))
+            return
+        half = 1 << (node.level - 1)
+        self._collect(node.nw, x, y, cells)
+        self._collect(node.ne, x + half, y, cells)
+        self._collect(node.sw, x, y + half, cells)
+        self._collect(node.se, x + half, y + half, cells)
+
+    def _expand(self, node, x, y):
+        """Surround a node with empty space, returning a node one level up and its new origin."""
+        empty = self._empty(node.level - 1)
+        expanded = self._join(self._join(empty, empty, empty, node.nw),
+                              self._join(empty, empty, node.ne, empty),
+                              self._join(empty, node.sw, empty, empty),
+                              self._join(node.se, empty, empty, empty))
+        half = 1 << (node.level - 1)
+        return expanded, x - half, y - half
+
+    @staticmethod
+    def _is_padded(node):
+        """Whether all live cells of a node lie within its central half."""
+        return (node.nw.population == node.nw.se.population
+                and node.ne.population == node.ne.sw.population
+                and node.sw.population == node.sw.ne.population
+                and node.se.population == node.se.nw.population)
+
+    def _crop(self, node, x, y):
+        """Remove empty borders from a node while keeping it at least 8x8."""
+        while node.level > 3 and self._is_padded(node):
+            quarter = 1 << (node.level - 2)
+            node = self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+            x, y = x + quarter, y + quarter
+        return node, (x, y)
+
+    def _advance_power_of_two(self, node, x, y, power):
+        """
+        Advance a pattern by 2**power generations.
+
+        The node is first padded so that the pattern cannot grow past the
+        central region returned by ``_successor``.
+        """
+        self._check_rules()
+        while node.level < power + 2 or not self._is_padded(node):
+            node, x, y = self._expand(node, x, y)
+        node, x, y = self._expand(node, x, y)
+
+        quarter = 1 << (node.level - 2)
+        return self._successor(node, power), x + quarter, y + quarter
+
+    def _successor(self, node, power):
+        """
+        Return the central half of a node advanced by 2**power generations.
+
+        Args:
+            node (_Node): Node of level k >= 2.
+            power (int): Generations exponent, capped at k - 2.
+
+        Returns:
+            (_Node) Node of level k - 1.
+        """
+        power = min(power, node.level - 2)
+        key = (node, power)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.population == 0:
+            result = node.nw
+        elif node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self._join
+            c1 = self._successor(nw, power)
+            c2 = self._successor(join(nw.ne, ne.nw, nw.se, ne.sw), power)
+            c3 = self._successor(ne, power)
+            c4 = self._successor(join(nw.sw, nw.se, sw.nw, sw.ne), power)
+            c5 = self._successor(join(nw.se, ne.sw, sw.ne, se.nw), power)
+            c6 = self._successor(join(ne.sw, ne.se, se.nw, se.ne), power)
+            c7 = self._successor(sw, power)
+            c8 = self._successor(join(sw.ne, se.nw, sw.se, se.sw), power)
+            c9 = self._successor(se, power)
+
+            if power < node.level - 2:
+                # the nine pieces are already far enough in time, just take their centers
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                              join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw),
+                              join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                result = join(self._successor(join(c1, c2, c4, c5), power),
+                              self._successor(join(c2, c3, c5, c6), power),
+                              self._successor(join(c4, c5, c7, c8), power),
+                              self._successor(join(c5, c6, c8, c9), power))
+
+        self._results[key] = result
+        return result
+
+    def _life_4x4(self, node):
+        """Compute the central 2x2 cells of a 4x4 node after one generation."""
+        cells = [[0] * 4 for _ in range(4)]
+        for quadrant, (qx, qy) in ((node.nw, (0, 0)), (node.ne, (2, 0)),
+                                   (node.sw, (0, 2)), (node.se, (2, 2))):
+            cells[qy][qx] = quadrant.nw.population
+            cells[qy][qx + 1] = quadrant.ne.population
+            cells[qy + 1][qx] = quadrant.sw.population
+            cells[qy + 1][qx + 1] = quadrant.se.population
+
+        table = self.rule.table
+
+        def next_state(x, y):
+            neighbors = sum(cells[y + dy][x + dx]
+                            for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+            return _ALIVE if table[cells[y][x] * 9 + neighbors] else _DEAD
+
+        return self._join(next_state(1, 1), next_state(2, 1), next_state(1, 2), next_state(2, 2))
+
+    def _collect_garbage(self, root):
+        """Release memoized results and unreachable nodes once the node cache is full."""
+        if len(self._nodes) <= self.max_nodes:
+            return
+
+        self._results.clear()
+        reachable = {}
+        pending = [root] + self._empty_nodes[1:]
+        while pending:
+            node = pending.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in reachable:
+                reachable[key] = node
+                pending.extend(key)
+        self._nodes = reachable
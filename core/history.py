@@ -0,0 +1,236 @@
+"""
+
+This module implements the generation history behind ``rewind`` and ``seek`` of the engines.
+The history keeps a keyframe (the whole board in the checkpoint format) every few generations
+and, between keyframes, the births and deaths of each generation when they are known.
+Any recorded generation is rebuilt from the nearest keyframe at or before it: the deltas after
+the keyframe are applied, and generations without deltas are recomputed by the engine.
+
+Version: 1.0
+"""
+
+from array import array
+from bisect import bisect_right
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+DEFAULT_BUDGET = 64 * 1024 * 1024
+# larger deltas are not stored: recomputing a busy generation is faster than applying its changes
+DEFAULT_MAX_DELTA_CELLS = 4096
+# rough bookkeeping cost of a frame, on top of its keyframe or delta data
+_FRAME_OVERHEAD = 100
+
+
+class Frame:
+    """
+    State of the board at one recorded generation.
+
+    Attributes:
+        generation (int): Generation of the frame.
+        keyframe (bytes): Whole board in the checkpoint format, None for a delta frame.
+        births (array): Cells born since the previous generation as flat x, y pairs (delta frames).
+        deaths (array): Cells that died since the previous generation as flat x, y pairs (delta frames).
+    """
+    __slots__ = ('generation', 'keyframe', 'births', 'deaths')
+
+    def __init__(self, generation, keyframe=None, births=None, deaths=None):
+        self.generation = generation
+        self.keyframe = keyframe
+        self.births = births
+        self.deaths = deaths
+
+    @property
+    def size(self) -> int:
+        """Approximate memory used by the frame in bytes."""
+        if self.keyframe is not None:
+            return len(self.keyframe) + _FRAME_OVERHEAD
+        return (len(self.births) + len(self.deaths)) * self.births.itemsize + _FRAME_OVERHEAD
+
+
+class History:
+    """
+    Bounded history of the generations of one game.
+
+    ``step`` of every engine reports to the history on its own. Code that advances a game
+    with ``next_generation`` passes the returned change set to ``advanced``, so the generation
+    is stored as a cheap delta when it changed few cells; code that edits the board in any other way (cells, rule, clear,
+    loading) calls ``edited``, which stores a keyframe and forgets the generations after it.
+
+    When the frames take more than the memory budget, the oldest keyframe is evicted together
+    with its deltas; the latest keyframe and its deltas are always kept.
+
+    Args:
+        keyframe_interval (int): Generations between keyframes.
+        budget (int): Memory budget of the frames in bytes.
+        max_delta_cells (int): Largest number of changed cells stored as a delta.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL, budget: int = DEFAULT_BUDGET,
+                 max_delta_cells: int = DEFAULT_MAX_DELTA_CELLS):
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1 generation")
+        self.keyframe_interval = keyframe_interval
+        self.budget = budget
+        self.max_delta_cells = max_delta_cells
+        self._frames = []
+        # generation of each frame, for bisecting
+        self._generations = []
+        self._size = 0
+        # latest recorded generation, generations after the last frame are recomputed when seeking
+        self._last = None
+        self._last_keyframe = None
+
+    @property
+    def first(self):
+        """Oldest generation that can be restored, None if nothing was recorded."""
+        return self._generations[0] if self._generations else None
+
+    @property
+    def last(self):
+        """Latest recorded generation, None if nothing was recorded."""
+        return self._last
+
+    @property
+    def size(self) -> int:
+        """Approximate memory used by the frames in bytes."""
+        return self._size
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __contains__(self, generation):
+        return self._last is not None and self.first <= generation <= self._last
+
+    def advanced(self, game, changes=None):
+        """
+        Record that a game advanced by one or more generations.
+
+        Args:
+            game: Game that advanced.
+            changes (ChangeSet, optional): Births and deaths of its latest generation, if it advanced by one.
+        """
+        generation = game.generation
+        if self._last is None:
+            self._add_keyframe(game)
+            return
+        if generation <= self._last:
+            # stepping through generations that were already recorded
+            return
+
+        if generation - self._last_keyframe >= self.keyframe_interval:
+            self._add_keyframe(game)
+        elif changes is not None and generation == self._last + 1 == self._frames[-1].generation + 1:
+            # deltas cost 8 bytes per cell, they are not kept when the board is cheaper to store
+            count = len(changes)
+            if count <= self.max_delta_cells and count * 8 < len(self._frames[self._keyframe_index()].keyframe):
+                self._append(Frame(generation, births=_flatten(changes.births), deaths=_flatten(changes.deaths)))
+        self._last = generation
+
+    def edited(self, game):
+        """
+        Record that a game was changed without advancing it.
+
+        Frames of the current and later generations are replaced by a keyframe of the board.
+        """
+        index = bisect_right(self._generations, game.generation - 1)
+        for frame in self._frames[index:]:
+            self._size -= frame.size
+        del self._frames[index:]
+        del self._generations[index:]
+        self._add_keyframe(game)
+
+    def clear(self):
+        """Forget all recorded generations."""
+        self._frames.clear()
+        self._generations.clear()
+        self._size = 0
+        self._last = None
+        self._last_keyframe = None
+
+    def seek(self, game, generation: int):
+        """
+        Restore a game to a recorded generation.
+
+        The board is loaded from the nearest keyframe at or before the generation, then moved
+        forward with the recorded deltas and, past them, by computing the missing generations.
+
+        Args:
+            game: Game the history was recorded from.
+            generation (int): Generation to restore, between ``first`` and ``last``.
+        """
+        if generation not in self:
+            raise ValueError(f"Generation {generation} is not in the history "
+                             f"({self.first} to {self.last})" if self._frames else "The history is empty")
+        if generation == game.generation:
+            return
+
+        # deferred: the checkpoint module depends on every engine
+        from core.checkpoint import load_checkpoint_bytes
+
+        index = bisect_right(self._generations, generation) - 1
+        start = self._keyframe_index(index)
+        load_checkpoint_bytes(game, self._frames[start].keyframe)
+        for frame in self._frames[start + 1:index + 1]:
+            game.set_cells(_pairs(frame.births), True)
+            game.set_cells(_pairs(frame.deaths), False)
+            game.generation = frame.generation
+        # engines advance without reporting back to the history here
+        game._step_many(generation - game.generation)
+
+    def rewind(self, game, n: int = 1) -> int:
+        """
+        Restore a game to n generations back, or to the oldest recorded generation.
+
+        Returns:
+            (int) Generation the game was restored to.
+        """
+        if n < 0:
+            raise ValueError("Cannot rewind a negative number of generations")
+        generation = max(self.first if self._frames else game.generation, game.generation - n)
+        self.seek(game, generation)
+        return generation
+
+    def _keyframe_index(self, index: int = -1) -> int:
+        """Returns the index of the last keyframe at or before a frame index."""
+        index %= len(self._frames)
+        while self._frames[index].keyframe is None:
+            index -= 1
+        return index
+
+    def _add_keyframe(self, game):
+        """Store the whole board as a keyframe of the current generation."""
+        from core.checkpoint import checkpoint_bytes
+
+        self._append(Frame(game.generation, keyframe=checkpoint_bytes(game)))
+        self._last = self._last_keyframe = game.generation
+
+    def _append(self, frame: Frame):
+        """Add a frame after the last one and evict old keyframes over the memory budget."""
+        self._frames.append(frame)
+        self._generations.append(frame.generation)
+        self._size += frame.size
+        while self._size > self.budget:
+            # the oldest keyframe goes together with the deltas that depend on it
+            end = 1
+            while end < len(self._frames) and self._frames[end].keyframe is None:
+                end += 1
+            if end == len(self._frames):
+                break
+            for evicted in self._frames[:end]:
+                self._size -= evicted.size
+            del self._frames[:end]
+            del self._generations[:end]
+
+
+def _flatten(cells) -> array:
+    """Returns (x, y) cells as a flat array of 32-bit coordinates (64-bit if they do not fit)."""
+    coordinates = [coordinate for cell in cells for coordinate in cell]
+    try:
+        return array("i", coordinates)
+    except OverflowError:
+        return array("q", coordinates)
+
+
+def _pairs(flat: array) -> list:
+    """Returns a flat array of coordinates as (x, y) pairs."""
+    coordinates = iter(flat)
+    return list(zip(coordinates, coordinates))
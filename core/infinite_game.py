@@ -1,82 +1,411 @@
+from collections import Counter
+from itertools import compress
+from collections.abc import MutableSet
+
+from core.rules import CONWAY, Rule, as_rule
+from core.changes import NO_CHANGES, ChangeSet
+from core.density import PopulationPyramid, count_blocks
+from core.patterns import PASTE_OR, paste_cells, randomize_cells
+from core.profiling import NEIGHBORS, RULE, SWAP, phase
+from core.snapshot import CellStore, Snapshot
+from core.stepping import DEFAULT_MAX_PERIOD, run_steps
+
+# cells are stored as single integers x * _STRIDE + y, which hash and add much faster than tuples
+_STRIDE = 1 << 32
+_HALF_STRIDE = _STRIDE >> 1
+_BIT_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+_NEIGHBOR_OFFSETS = tuple(dx * _STRIDE + dy
+                          for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                          if dx or dy)
+
+
+def pack_cell(x, y):
+    """Pack cell coordinates into a single integer key (y must fit in a signed 32-bit integer)."""
+    return x * _STRIDE + y
+
+
+def unpack_cell(key):
+    """Unpack an integer key created by pack_cell back into (x, y) coordinates."""
+    x = (key + _HALF_STRIDE) // _STRIDE
+    return x, key - x * _STRIDE
+
+
+def translation_key(cells):
+    """
+    Hash a non-empty set of packed cells independently of its position.
+
+    Packed keys preserve the (x, y) ordering, so subtracting the smallest key moves
+    the pattern to a canonical position; the smallest key is returned as the offset.
+    """
+    origin = min(cells)
+    return hash(frozenset(cell - origin for cell in cells)), origin
+
+
+def cells_in_rect(cells, left, top, right, bottom):
+    """
+    Yield the (x, y) coordinates of packed cells inside a rectangle.
+
+    Probes every position of the rectangle when it is smaller than the set,
+    otherwise filters the set, so the cost is bounded by the smaller of the two.
+
+    Args:
+        cells (set): Packed cell keys.
+        left (int): Smallest x-coordinate (inclusive).
+        top (int): Smallest y-coordinate (inclusive).
+        right (int): Largest x-coordinate (exclusive).
+        bottom (int): Largest y-coordinate (exclusive).
+    """
+    if right <= left or bottom <= top:
+        return
+    if (right - left) * (bottom - top) < len(cells):
+        for x in range(left, right):
+            column = x * _STRIDE
+            for y in range(top, bottom):
+                if column + y in cells:
+                    yield x, y
+        return
+    for key in cells:
+        x = (key + _HALF_STRIDE) // _STRIDE
+        y = key - x * _STRIDE
+        if left <= x < right and top <= y < bottom:
+            yield x, y
+
+
+def as_pairs(cells):
+    """
+    Returns cells given as an iterable of (x, y) pairs or an integer array of shape (n, 2)
+    as an iterable of pairs of Python integers (packing NumPy integers would overflow).
+    """
+    return cells.tolist() if hasattr(cells, "tolist") else cells
+
+
+def cells_bounding_box(cells):
+    """
+    Returns (left, top, right, bottom) of a set of packed cells, right and bottom exclusive, or None if empty.
+    """
+    if not cells:
+        return None
+    # packed keys are ordered by x first, so the smallest and largest key give the x range
+    left, _ = unpack_cell(min(cells))
+    right, _ = unpack_cell(max(cells))
+    ys = [key - ((key + _HALF_STRIDE) // _STRIDE) * _STRIDE for key in cells]
+    return left, min(ys), right + 1, max(ys) + 1
+
+
+def _change_counts(cells, new_cells):
+    """Returns the numbers of births and deaths between two sets of packed cells."""
+    births = len(new_cells - cells)
+    # the population changes by births - deaths
+    return births, births - len(new_cells) + len(cells)
+
+
+class FrozenCells(CellStore):
+    """
+    Read-only copy of a set of packed cells, kept by snapshots of InfiniteGameOfLife.
+
+    Args:
+        cells (frozenset): Packed cell keys.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.pyramid = PopulationPyramid(1, lambda: count_blocks(map(unpack_cell, cells), 1))
+
+    def cells_in_rect(self, left, top, right, bottom):
+        return cells_in_rect(self.cells, left, top, right, bottom)
+
+    def bounding_box(self):
+        return cells_bounding_box(self.cells)
+
+
+class LiveCellsView(MutableSet):
+    """
+    Set-like view of the live cells of an InfiniteGameOfLife as (x, y) tuples.
+
+    Supports membership tests, iteration, ``add``, ``discard`` and the rest of the
+    standard set interface while the engine itself works with packed integer keys.
+    """
+
+    def __init__(self, game):
+        self._game = game
+
+    def __contains__(self, cell):
+        x, y = cell
+        return x * _STRIDE + y in self._game.packed_cells
+
+    def __iter__(self):
+        for key in self._game.packed_cells:
+            x = (key + _HALF_STRIDE) // _STRIDE
+            yield x, key - x * _STRIDE
+
+    def __len__(self):
+        return len(self._game.packed_cells)
+
+    def add(self, cell):
+        x, y = cell
+        self._game.packed_cells.add(x * _STRIDE + y)
+
+    def discard(self, cell):
+        x, y = cell
+        self._game.packed_cells.discard(x * _STRIDE + y)
+
+    def __repr__(self):
+        return f"LiveCellsView({set(self)!r})"
+
+
 class InfiniteGameOfLife:
     """
     Implementation of Conway's Game of Life with infinite grid.
-    Uses dictionary to store only live cells, allowing for infinite expansion.
+    Stores only live cells, allowing for infinite expansion.
     Coordinates can be any integer (positive or negative).
 
+    Live cells are kept in a set of packed integer keys (see ``pack_cell``);
+    ``live_cells`` exposes them as a set of (x, y) tuples.
+
     Author: Darya Sharnevich
-    Version: 1.0
+    Version: 1.4
     """
     def __init__(self):
         """Initialize empty infinite grid."""
-        # format: {(x, y): 1}
-        self.live_cells = {}
+        self.packed_cells = set()
         self.generation = 0
 
         # default rules
-        self.underpopulation_limit = 2
-        self.overpopulation_limit = 3
-        self.reproduction_number = 3
+        self.rule = CONWAY
+        # generation history for rewind and seek, see enable_history
+        self.history = None
+
+    @property
+    def live_cells(self):
+        """Set-like view of live cells as (x, y) tuples."""
+        return LiveCellsView(self)
+
+    @live_cells.setter
+    def live_cells(self, cells):
+        self.packed_cells = {x * _STRIDE + y for x, y in cells}
 
     def toggle_cell(self, x, y):
         """Toggle cell state at given coordinates."""
-        if (x, y) in self.live_cells:
-            del self.live_cells[(x, y)]
+        self.packed_cells ^= {x * _STRIDE + y}
+
+    def set_cell(self, x, y, alive=True):
+        """Set cell state at given coordinates."""
+        if alive:
+            self.packed_cells.add(x * _STRIDE + y)
+        else:
+            self.packed_cells.discard(x * _STRIDE + y)
+
+    def set_cells(self, cells, alive=True):
+        """
+        Set the state of many cells in one call.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+            alive (bool): New state of the cells.
+        """
+        keys = {x * _STRIDE + y for x, y in as_pairs(cells)}
+        if alive:
+            self.packed_cells.update(keys)
         else:
-            self.live_cells[(x, y)] = 1
-
-    def _count_neighbors(self, x, y):
-        """Count live neighbors for a cell. Returns number of live neighbors"""
-        count = 0
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                if (x + dx, y + dy) in self.live_cells:
-                    count += 1
-        return count
-
-    def _get_cells_to_check(self):
-        """Get set of all cells that need to be checked for the next generation."""
-        cells_to_check = set()
-        
-        # add all live cells and their neighbors
-        for x, y in self.live_cells:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    cells_to_check.add((x + dx, y + dy))
-                    
-        return cells_to_check
+            self.packed_cells.difference_update(keys)
+
+    def toggle_cells(self, cells):
+        """
+        Toggle the state of many cells in one call, each distinct cell once.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+        """
+        self.packed_cells.symmetric_difference_update({x * _STRIDE + y for x, y in as_pairs(cells)})
+
+    def set_rows(self, rows):
+        """
+        Make cells alive from packed rows, the fastest way to load large patterns.
+
+        Args:
+            rows: Iterable of (x, y, bits) tuples, where bit i of bits is the cell at (x + i, y).
+        """
+        cells = self.packed_cells
+        for x, y, bits in rows:
+            # one byte per column (0 or 1) selects the live keys of the row, consecutive keys being _STRIDE apart
+            selectors = format(bits, "b")[::-1].encode().translate(_BIT_BYTES)
+            cells.update(compress(range(x * _STRIDE + y, (x + len(selectors)) * _STRIDE + y, _STRIDE), selectors))
+
+    def fill_rect(self, left, top, right, bottom, alive=True):
+        """
+        Set the state of every cell with left <= x < right and top <= y < bottom.
+
+        Clearing only visits the live cells inside the rectangle, so it is cheap for any size.
+        """
+        if alive:
+            self.packed_cells.update(x * _STRIDE + y for x in range(left, right) for y in range(top, bottom))
+        else:
+            self.packed_cells.difference_update([x * _STRIDE + y for x, y in self.cells_in_rect(left, top, right, bottom)])
+
+    def clear_rect(self, left, top, right, bottom):
+        """Kill every cell with left <= x < right and top <= y < bottom."""
+        self.fill_rect(left, top, right, bottom, False)
+
+    def paste_pattern(self, pattern, x=0, y=0, mode=PASTE_OR):
+        """
+        Paste a pattern with its top-left corner at (x, y).
+
+        Args:
+            pattern: Iterable of (x, y) coordinates of live cells relative to the pattern's top-left corner.
+            x (int): X-coordinate of the pattern's top-left corner.
+            y (int): Y-coordinate of the pattern's top-left corner.
+            mode (str): "or" adds the pattern, "xor" toggles its cells,
+                "replace" also kills the other cells of its bounding box.
+        """
+        paste_cells(self, pattern, x, y, mode)
+
+    def randomize(self, density=0.5, seed=None, region=None):
+        """
+        Replace the cells of a region of the plane with a random soup.
+
+        The soup is generated as packed rows and loaded in bulk; the same seed always gives the same soup.
+
+        Args:
+            density (float): Probability of each cell being alive, between 0 and 1.
+            seed: Seed for the random generator, None for a different soup every time.
+            region (tuple): (left, top, right, bottom) of the area to fill, right and bottom exclusive.
+                Required, the plane has no natural bounds.
+        """
+        if region is None:
+            raise ValueError("The infinite grid needs a region to randomize")
+        randomize_cells(self, density, seed, region)
 
     def next_generation(self):
-        """Calculate the next generation of cells."""
-        if not self.live_cells:
-            return
+        """
+        Calculate the next generation of cells.
+
+        Every live cell adds one to the counter of each of its 8 neighbors in a single pass,
+        then the rules are applied to the resulting counts.
+
+        Returns:
+            (ChangeSet) Cells born and died in this generation.
+        """
+        cells = self.packed_cells
+        if not cells:
+            return NO_CHANGES
+
+        with phase(NEIGHBORS):
+            counts = Counter(cell + offset for cell in cells for offset in _NEIGHBOR_OFFSETS)
+
+        # transition table indexed by alive * 9 + neighbors
+        table = self.rule.table
+        with phase(RULE):
+            new_cells = {cell for cell, neighbors in counts.items()
+                         if table[neighbors + 9 * (cell in cells)]}
+
+            if table[9]:
+                # isolated live cells never receive a count but still survive
+                new_cells.update(cell for cell in cells if cell not in counts)
+
+        with phase(SWAP):
+            self.packed_cells = new_cells
+            self.generation += 1
+        return ChangeSet(lambda: (map(unpack_cell, new_cells - cells), map(unpack_cell, cells - new_cells)),
+                         counts=lambda: _change_counts(cells, new_cells))
+
+    def cells_in_rect(self, left, top, right, bottom):
+        """
+        Yield live cells with left <= x < right and top <= y < bottom as (x, y) tuples.
+
+        Used by the GUI to draw only the visible part of the plane.
+        """
+        return cells_in_rect(self.packed_cells, left, top, right, bottom)
+
+    def snapshot(self):
+        """Returns a read-only copy of the current state that other threads can draw."""
+        cells = frozenset(self.packed_cells)
+        return Snapshot(self.generation, len(cells), cells=FrozenCells(cells))
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty.
+        """
+        return cells_bounding_box(self.packed_cells)
 
-        new_cells = {}
-        cells_to_check = self._get_cells_to_check()
+    def step(self, n=1, detect_cycles=False, max_period=DEFAULT_MAX_PERIOD):
+        """
+        Advance the simulation by up to n generations.
 
-        for x, y in cells_to_check:
-            neighbors = self._count_neighbors(x, y)
+        With ``detect_cycles`` the run stops early once the pattern dies out, becomes
+        a still life or oscillator, or turns out to be a spaceship. Returns a StepReport.
+        """
+        return run_steps(self, n, detect_cycles, max_period)
 
-            # apply rules
-            if (x, y) in self.live_cells:
-                if self.underpopulation_limit <= neighbors <= self.overpopulation_limit:
-                    new_cells[(x, y)] = 1
-            else:
-                if neighbors == self.reproduction_number:
-                    new_cells[(x, y)] = 1
+    @property
+    def population(self):
+        """Number of live cells."""
+        return len(self.packed_cells)
 
-        self.live_cells = new_cells
-        self.generation += 1
+    def _step_many(self, n):
+        """Advance n generations without any per-generation bookkeeping."""
+        for _ in range(n):
+            self.next_generation()
 
-    def set_custom_rules(self, underpop, overpop, repro):
+    def _state_key(self):
+        """Hash the pattern relative to its first cell, returning the hash and that cell's key as offset."""
+        return translation_key(self.packed_cells)
+
+    @staticmethod
+    def _displacement(old_offset, new_offset):
+        """Translation (dx, dy) between two offsets returned by _state_key."""
+        return unpack_cell(new_offset - old_offset)
+
+    def set_rule(self, rule):
+        """
+        Set the rule used for following generations.
+
+        Accepts a Rule or a rulestring in B/S notation. Rules with birth on 0 neighbors
+        are rejected because they would fill the whole infinite plane.
+        """
+        rule = as_rule(rule)
+        if 0 in rule.birth:
+            raise ValueError("Rules with birth on 0 neighbors fill the infinite plane")
+        self.rule = rule
+
+    def set_custom_rules(self, overpop, underpop, repro):
         """Set custom rules for cell survival and reproduction."""
-        self.underpopulation_limit = underpop
-        self.overpopulation_limit = overpop
-        self.reproduction_number = repro
+        self.set_rule(Rule.from_limits(underpop, overpop, repro))
+
+    def reset_custom_rules(self):
+        """Reset the rules to standard Game of Life rules."""
+        self.rule = CONWAY
 
     def clear(self):
         """Clear the grid and reset generation counter."""
-        self.live_cells.clear()
-        self.generation = 0
\ No newline at end of file
+        self.packed_cells.clear()
+        self.generation = 0
+
+    def save(self, path):
+        """Write the live cells, rule and generation to a binary checkpoint file (see core.checkpoint)."""
+        # imported here: the checkpoint module depends on every engine
+        from core.checkpoint import save_checkpoint
+        save_checkpoint(self, path)
+
+    def load(self, path):
+        """Restore the live cells, rule and generation from a checkpoint file of an infinite grid."""
+        from core.checkpoint import load_checkpoint
+        load_checkpoint(self, path)
+
+    def enable_history(self, keyframe_interval=None, budget=None):
+        """Start recording generations so that the game can be rewound (see core.history). Returns the History."""
+        from core.history import DEFAULT_BUDGET, DEFAULT_KEYFRAME_INTERVAL, History
+        self.history = History(keyframe_interval or DEFAULT_KEYFRAME_INTERVAL, budget or DEFAULT_BUDGET)
+        self.history.edited(self)
+        return self.history
+
+    def rewind(self, n=1):
+        """Go back n generations, or to the oldest generation still in the history. Returns the generation."""
+        if self.history is None:
+            raise ValueError("History is not enabled, call enable_history first")
+        return self.history.rewind(self, n)
+
+    def seek(self, generation):
+        """Restore the grid to a generation recorded in the history."""
+        if self.history is None:
+            raise ValueError("History is not enabled, call enable_history first")
+        self.history.seek(self, generation)
@@ -0,0 +1,251 @@
+"""
+
+This module defines a NumPy-backed version of the fixed-size Game of Life grid.
+Neighbor counts are computed for the whole board at once with array shifts,
+so a generation costs a handful of vectorized operations instead of a Python loop per cell.
+
+NumPy is an optional dependency; importing this module without it raises ImportError.
+
+Version: 1.0
+"""
+
+import numpy as np
+
+from core.changes import ChangeSet
+from core.game_of_life import GameOfLife
+from core.profiling import NEIGHBORS, RULE, SWAP, phase
+
+
+def next_state(alive: np.ndarray, neighbors: np.ndarray, table) -> np.ndarray:
+    """
+    Apply a rule transition table to whole arrays of cells.
+
+    Args:
+        alive (np.ndarray): Current cell states (bool or 0/1).
+        neighbors (np.ndarray): Alive neighbor counts of the same shape.
+        table (tuple): 18-entry transition table indexed by alive * 9 + neighbors.
+
+    Returns:
+        (np.ndarray) Boolean next states.
+    """
+    alive = alive.astype(bool, copy=False)
+    result = np.zeros(alive.shape, dtype=bool)
+    # one comparison per neighbor count that can produce a live cell is cheaper than a gather
+    for count in range(9):
+        birth, survival = table[count], table[9 + count]
+        if birth and survival:
+            result |= neighbors == count
+        elif survival:
+            result |= (neighbors == count) & alive
+        elif birth:
+            result |= (neighbors == count) & ~alive
+    return result
+
+
+def _mask_cells(mask: np.ndarray):
+    """Returns the (x, y) coordinates of the True entries of a 2D array."""
+    ys, xs = np.nonzero(mask)
+    return zip(xs.tolist(), ys.tolist())
+
+
+def grid_changes(old: np.ndarray, new: np.ndarray) -> ChangeSet:
+    """
+    Returns the change set between two boolean grids.
+
+    The arrays are referenced, not copied, so neither may be modified while the change set is in use.
+    """
+    return ChangeSet(lambda: (_mask_cells(new & ~old), _mask_cells(old & ~new)),
+                     lambda: int(np.count_nonzero(old != new)),
+                     lambda: (int(np.count_nonzero(new & ~old)), int(np.count_nonzero(old & ~new))))
+
+
+class NumpyGameOfLife(GameOfLife):
+    """
+    Drop-in replacement for GameOfLife that stores the grid as a 2D boolean NumPy array.
+
+    The grid is indexed as ``grid[y][x]`` (or ``grid[y, x]``), exactly like the list-of-lists engine.
+    With ``wrap=True`` neighbors are taken from the opposite edge (toroidal roll),
+    otherwise cells outside the grid are treated as dead (zero-padded edges).
+
+    Args:
+        width (int): Width of the grid in cells.
+        height (int): Height of the grid in cells.
+        wrap (bool): Whether the grid wraps around the edges.
+    """
+
+    def _empty_grid(self) -> np.ndarray:
+        """
+        Create a grid of the current size with all cells dead.
+
+        Returns:
+            (np.ndarray) Boolean array of shape (height, width).
+        """
+        return np.zeros((self.height, self.width), dtype=bool)
+
+    def toggle_cell(self, x: int, y: int):
+        """
+        Toggle the alive/dead state of a cell.
+
+        Args:
+            x (int): X-coordinate of the cell.
+            y (int): Y-coordinate of the cell.
+        """
+        self.grid[y, x] = not self.grid[y, x]
+
+    def set_cells(self, cells, alive: bool = True):
+        """
+        Set the state of many cells with a single array assignment. Cells outside the grid are skipped.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+            alive (bool): New state of the cells.
+        """
+        xs, ys = self._coordinate_arrays(cells)
+        self.grid[ys, xs] = bool(alive)
+
+    def toggle_cells(self, cells):
+        """
+        Toggle the state of many cells, each distinct cell once. Cells outside the grid are skipped.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+        """
+        xs, ys = self._coordinate_arrays(cells)
+        indices = np.unique(ys * self.width + xs)
+        flat = self.grid.reshape(-1)
+        flat[indices] = ~flat[indices]
+
+    def set_rows(self, rows):
+        """
+        Make cells alive from packed rows, each unpacked into the grid with array operations.
+        Cells outside the grid are skipped.
+
+        Args:
+            rows: Iterable of (x, y, bits) tuples, where bit i of bits is the cell at (x + i, y).
+        """
+        for x, y, bits in rows:
+            if not 0 <= y < self.height:
+                continue
+            if x < 0:
+                bits >>= -x
+                x = 0
+            length = min(bits.bit_length(), self.width - x)
+            if length <= 0:
+                continue
+            packed = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+            self.grid[y, x:x + length] |= np.unpackbits(packed, bitorder="little")[:length].astype(bool)
+
+    def fill_rect(self, left: int, top: int, right: int, bottom: int, alive: bool = True):
+        """
+        Set the state of every cell with left <= x < right and top <= y < bottom.
+        The rectangle is clipped to the grid.
+        """
+        rect = self._clip_rect(left, top, right, bottom)
+        if rect is not None:
+            left, top, right, bottom = rect
+            self.grid[top:bottom, left:right] = bool(alive)
+
+    def _coordinate_arrays(self, cells):
+        """
+        Split cells into arrays of x and y coordinates, dropping cells outside the grid.
+
+        Returns:
+            (tuple) Two integer arrays (xs, ys).
+        """
+        if not isinstance(cells, np.ndarray):
+            cells = list(cells)
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        xs, ys = cells[:, 0], cells[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        return xs[inside], ys[inside]
+
+    def _advance(self):
+        """
+        Advance the simulation by one generation using the current rule.
+        """
+        old = self.grid
+        with phase(NEIGHBORS):
+            counts = self._neighbor_counts()
+        with phase(RULE):
+            new = next_state(old, counts, self.rule.table)
+        with phase(SWAP):
+            self.grid = new
+            self.generation += 1
+            return grid_changes(old, new)
+
+    @property
+    def population(self) -> int:
+        """
+        Returns the number of alive cells.
+        """
+        return int(np.count_nonzero(self.grid))
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty.
+        """
+        rows = np.flatnonzero(self.grid.any(axis=1))
+        if not rows.size:
+            return None
+        columns = np.flatnonzero(self.grid.any(axis=0))
+        return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+    def cell_bytes(self):
+        """
+        Returns the grid as one byte per cell (1 alive, 0 dead), row by row.
+
+        The boolean array already has this layout, so a contiguous grid is exposed without copying.
+
+        Returns:
+            (memoryview) width * height bytes.
+        """
+        return memoryview(np.ascontiguousarray(self.grid).view(np.uint8)).cast("B")
+
+    def _state_key(self):
+        """
+        Hash the bit-packed grid for cycle detection.
+
+        Returns:
+            (tuple) Hash of the grid and its offset (always None on a fixed grid).
+        """
+        return hash(np.packbits(self.grid).tobytes()), None
+
+    def _neighbor_counts(self) -> np.ndarray:
+        """
+        Count alive neighbors of every cell at once.
+
+        Returns:
+            (np.ndarray) Array of the grid's shape holding neighbor counts (0-8).
+        """
+        cells = self.grid.astype(np.uint8)
+
+        if self.wrap:
+            # sum the three rows first, then the three columns of that sum
+            rows = cells + np.roll(cells, 1, axis=0) + np.roll(cells, -1, axis=0)
+            total = rows + np.roll(rows, 1, axis=1) + np.roll(rows, -1, axis=1)
+        else:
+            padded = np.pad(cells, 1)
+            rows = padded[:-2, :] + padded[1:-1, :] + padded[2:, :]
+            total = rows[:, :-2] + rows[:, 1:-1] + rows[:, 2:]
+
+        return total - cells
+
+    def count_alive_neighbors(self, x: int, y: int) -> int:
+        """
+        Count the number of alive neighbors for the cell at (x, y).
+
+        Args:
+            x (int): X-coordinate of the cell.
+            y (int): Y-coordinate of the cell.
+
+        Returns:
+            (int) Number of alive neighboring cells.
+        """
+        if self.wrap:
+            rows = [(y + dy) % self.height for dy in (-1, 0, 1)]
+            cols = [(x + dx) % self.width for dx in (-1, 0, 1)]
+            block = self.grid[np.ix_(rows, cols)]
+        else:
+            block = self.grid[max(y - 1, 0):y + 2, max(x - 1, 0):x + 2]
+
+        return int(block.sum()) - int(self.grid[y, x])
@@ -0,0 +1,173 @@
+"""
+
+This module defines a multi-core version of the fixed-size Game of Life grid.
+The grid is split into horizontal stripes that are advanced by a pool of worker processes.
+Both generations live in ``multiprocessing.shared_memory`` blocks (double-buffered),
+so workers read their stripe plus one halo row above and below straight from the current buffer
+and write into the other one, and nothing but stripe bounds is pickled per generation.
+
+Requires NumPy.
+
+Version: 1.1
+"""
+
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.numpy_game import NumpyGameOfLife, grid_changes, next_state
+from core.profiling import RULE, SWAP, phase
+
+# buffers attached by each worker process, see _attach_buffers
+_worker_buffers = []
+
+
+def _attach_buffers(names, shape):
+    """Pool initializer: map both shared generation buffers into the worker process."""
+    for name in names:
+        block = shared_memory.SharedMemory(name=name)
+        _worker_buffers.append((block, np.ndarray(shape, dtype=np.uint8, buffer=block.buf)))
+
+
+def _step_stripe(task):
+    """
+    Advance rows ``start:stop`` from one shared buffer into the other.
+
+    Args:
+        task (tuple): Source buffer index, start row, stop row, wrap flag
+            and the rule transition table.
+    """
+    source, start, stop, wrap, table = task
+    src = _worker_buffers[source][1]
+    dst = _worker_buffers[1 - source][1]
+    height = src.shape[0]
+
+    if wrap:
+        above, below = src[(start - 1) % height], src[stop % height]
+    else:
+        empty = np.zeros(src.shape[1], dtype=np.uint8)
+        above = src[start - 1] if start > 0 else empty
+        below = src[stop] if stop < height else empty
+
+    block = np.vstack((above, src[start:stop], below))
+    dst[start:stop] = stripe_next_state(block, wrap, table)
+
+
+def stripe_next_state(block: np.ndarray, wrap: bool, table) -> np.ndarray:
+    """
+    Compute the next state of a stripe of rows.
+
+    Args:
+        block (np.ndarray): uint8 cells of the stripe with one halo row above and below.
+        wrap (bool): Whether the left and right edges wrap around.
+        table (tuple): 18-entry rule transition table indexed by alive * 9 + neighbors.
+
+    Returns:
+        (np.ndarray) Boolean next state of the stripe without halo rows.
+    """
+    cells = block[1:-1]
+    rows = block[:-2] + cells + block[2:]
+
+    if wrap:
+        total = rows + np.roll(rows, 1, axis=1) + np.roll(rows, -1, axis=1)
+    else:
+        padded = np.pad(rows, ((0, 0), (1, 1)))
+        total = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+
+    return next_state(cells, total - cells, table)
+
+
+def _release(pool, blocks):
+    """Stop the worker pool and free the shared buffers."""
+    pool.terminate()
+    pool.join()
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class ParallelGameOfLife(NumpyGameOfLife):
+    """
+    Fixed-size Game of Life stepped in parallel by a process pool.
+
+    ``grid`` is a boolean NumPy view of the current shared buffer, so it can be read and edited
+    like the grid of NumpyGameOfLife. Call ``close()`` (or use the instance as a context manager)
+    to stop the workers and release the shared memory; a closed game keeps working on a private
+    copy of the grid with the serial NumpyGameOfLife step.
+
+    Args:
+        width (int): Width of the grid in cells.
+        height (int): Height of the grid in cells.
+        wrap (bool): Whether the grid wraps around the edges.
+        workers (int, optional): Number of worker processes, defaults to the CPU count.
+    """
+
+    def __init__(self, width: int, height: int, wrap: bool = False, workers: int = None):
+        self.workers = workers or multiprocessing.cpu_count()
+        size = max(width * height, 1)
+        self._blocks = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self._buffers = [np.ndarray((height, width), dtype=np.uint8, buffer=block.buf)
+                         for block in self._blocks]
+        self._front = 0
+
+        self._pool = multiprocessing.Pool(self.workers, initializer=_attach_buffers,
+                                          initargs=([block.name for block in self._blocks], (height, width)))
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._blocks)
+
+        bounds = np.linspace(0, height, min(self.workers, max(height, 1)) + 1).astype(int)
+        self._stripes = [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+        super().__init__(width, height, wrap)
+
+    def _empty_grid(self) -> np.ndarray:
+        """
+        Clear the current shared buffer.
+
+        Returns:
+            (np.ndarray) Boolean view of the current buffer.
+        """
+        if not self._buffers:
+            return super()._empty_grid()
+        self._buffers[self._front].fill(0)
+        return self._buffers[self._front].view(bool)
+
+    def _advance(self):
+        """
+        Advance every stripe on the worker pool and swap the buffers.
+        """
+        if not self._buffers:
+            # closed, the pool and the shared memory are gone
+            return super()._advance()
+        front = self._buffers[self._front]
+        if not np.shares_memory(self.grid, front):
+            # the grid was replaced by a regular array, copy it into shared memory
+            front[:] = self.grid
+
+        # workers count neighbors and apply the rule in one pass per stripe
+        with phase(RULE):
+            self._pool.map(_step_stripe, [(self._front, start, stop, self.wrap, self.rule.table)
+                                          for start, stop in self._stripes])
+
+        with phase(SWAP):
+            old = front.view(bool)
+            self._front = 1 - self._front
+            self.grid = self._buffers[self._front].view(bool)
+            self.generation += 1
+            # the previous buffer is only overwritten by the next generation
+            return grid_changes(old, self.grid)
+
+    def close(self):
+        """Stop the worker processes and release the shared memory."""
+        if not self._buffers:
+            return
+        self.grid = self.grid.copy()
+        self._buffers = []
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
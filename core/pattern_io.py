@@ -0,0 +1,518 @@
+"""
+
+This module reads and writes patterns in the common Game of Life file formats:
+run-length encoded ``.rle`` files (with the ``rule =`` header and the ``#CXRLE Pos=`` offset
+of extended RLE), plaintext ``.cells`` files and Life 1.06 ``.lif`` files.
+
+Readers decode the pattern row by row into packed integers (bit i is the i-th cell of the row)
+using string operations that run in C, and stream the rows into an engine through its bulk ``set_rows``,
+so no Python object is created per cell. Writers build the output in chunks of a bounded size.
+
+Version: 1.1
+"""
+
+import os
+import re
+import string
+from collections import defaultdict
+from itertools import chain
+
+from core.engines import is_fixed
+from core.patterns import bit_runs
+from core.rules import as_rule
+
+RLE = "rle"
+PLAINTEXT = "plaintext"
+LIFE_106 = "life106"
+FORMATS = (RLE, PLAINTEXT, LIFE_106)
+EXTENSIONS = {".rle": RLE, ".cells": PLAINTEXT, ".lif": LIFE_106, ".life": LIFE_106}
+
+# characters written to the file at once
+WRITE_CHUNK = 1 << 16
+# longest line of RLE data, as recommended by the format
+RLE_LINE_LENGTH = 70
+
+_RLE_HEADER = re.compile(r"^x\s*=\s*(?P<width>\d+)\s*,\s*y\s*=\s*(?P<height>\d+)"
+                         r"(?:\s*,\s*rule\s*=\s*(?P<rule>[^\s:]+))?", re.IGNORECASE)
+_RLE_COUNTED = re.compile(r"(\d+)(\D)")
+# runs with counts of two or more digits, which are decoded without being expanded
+_RLE_LONG_COUNT = re.compile(r"(\d\d+)(\D)")
+_RLE_ANY_COUNT = re.compile(r"\d")
+_CXRLE_POS = re.compile(r"Pos\s*=\s*(-?\d+)\s*,\s*(-?\d+)", re.IGNORECASE)
+_NOT_BITS = re.compile(r"[^01]")
+# separates the parts of a row between long runs while they are expanded together
+_PART_MARK = "\0"
+_NOT_BITS_OR_MARK = re.compile(r"[^01\0]")
+_LIVE_BYTES = re.compile(b"\x01+")
+
+# cell characters to binary digits: 'b' and '.' are dead, any other state of multi-state RLE is alive
+_RLE_BITS = str.maketrans({**{letter: "1" for letter in string.ascii_letters}, "b": "0", ".": "0"})
+_PLAINTEXT_BITS = str.maketrans("O*.", "110")
+
+
+class PatternHeader:
+    """
+    Metadata read from the beginning of a pattern file.
+
+    Attributes:
+        name (str): Name of the pattern, or None.
+        comments (list): Comment lines.
+        rule (Rule): Rule given by the file, or None.
+        width (int): Width of the pattern, None if the format does not store it.
+        height (int): Height of the pattern, None if the format does not store it.
+        x (int): X-coordinate the file places the pattern's first column at.
+        y (int): Y-coordinate the file places the pattern's first row at.
+    """
+
+    def __init__(self):
+        self.name = None
+        self.comments = []
+        self.rule = None
+        self.width = None
+        self.height = None
+        self.x = 0
+        self.y = 0
+
+
+class PatternReader:
+    """
+    Reader of one pattern file: the header is parsed on creation, the cells are read on demand.
+
+    Args:
+        stream: Text stream positioned at the start of the file.
+        fmt (str): One of FORMATS.
+    """
+
+    def __init__(self, stream, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown pattern format {fmt!r}, expected one of {', '.join(FORMATS)}")
+        self.stream = stream
+        self.format = fmt
+        self.header = PatternHeader()
+        # first line of cell data, consumed while looking for the end of the header
+        self._first_line = ""
+        self._read_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying stream."""
+        self.stream.close()
+
+    def rows(self, dx: int = 0, dy: int = 0):
+        """
+        Yield the live cells of the pattern as packed rows.
+
+        Args:
+            dx (int): Horizontal shift added to every cell.
+            dy (int): Vertical shift added to every cell.
+
+        Returns:
+            Generator of (x, y, bits) tuples, where bit i of bits is the cell at (x + i, y).
+        """
+        lines = chain((self._first_line,), self.stream)
+        if self.format == RLE:
+            return self._rle_rows(lines, self.header.x + dx, self.header.y + dy)
+        if self.format == PLAINTEXT:
+            return self._plaintext_rows(lines, self.header.x + dx, self.header.y + dy)
+        return self._life_106_rows(lines, dx, dy)
+
+    def cells(self, dx: int = 0, dy: int = 0):
+        """
+        Yield the live cells of the pattern as (x, y) tuples.
+        """
+        for x, y, bits in self.rows(dx, dy):
+            for start, end in bit_runs(bits):
+                for cell_x in range(x + start, x + end):
+                    yield cell_x, y
+
+    def _read_header(self):
+        """Parse header and comment lines up to the first line of cell data."""
+        header = self.header
+        for line in self.stream:
+            text = line.strip()
+            if not text:
+                continue
+            if self.format == RLE:
+                if text.startswith("#"):
+                    self._rle_comment(text)
+                    continue
+                match = _RLE_HEADER.match(text)
+                if match:
+                    header.width, header.height = int(match.group("width")), int(match.group("height"))
+                    if match.group("rule"):
+                        header.rule = as_rule(match.group("rule"))
+                    continue
+            elif self.format == PLAINTEXT:
+                if text.startswith("!"):
+                    if text.lower().startswith("!name:"):
+                        header.name = text[6:].strip()
+                    else:
+                        header.comments.append(text[1:].strip())
+                    continue
+            elif text.startswith("#"):
+                if text.lower().startswith("#life"):
+                    if text.split()[-1] != "1.06":
+                        raise ValueError(f"Unsupported Life format {text!r}, only Life 1.06 is supported")
+                elif text.startswith("#N"):
+                    header.name = text[2:].strip()
+                elif text.startswith("#R"):
+                    header.rule = as_rule(text[2:])
+                else:
+                    header.comments.append(text[2:].strip())
+                continue
+            self._first_line = line
+            return
+
+    def _rle_comment(self, text):
+        """Interpret one '#' line of an RLE file."""
+        header = self.header
+        kind, value = text[:2], text[2:].strip()
+        if kind == "#N":
+            header.name = value
+        elif kind in ("#P", "#R") and len(value.split()) == 2:
+            # top-left corner in older RLE files
+            header.x, header.y = (int(part) for part in value.split())
+        elif kind == "#r":
+            header.rule = as_rule(value)
+        elif value.upper().startswith("XRLE"):
+            match = _CXRLE_POS.search(value)
+            if match:
+                header.x, header.y = int(match.group(1)), int(match.group(2))
+        else:
+            header.comments.append(value)
+
+    @classmethod
+    def _rle_rows(cls, lines, left, top):
+        """Decode RLE data, collecting lines until whole rows (ended by '$' or '!') are available."""
+        y = top
+        # lines of the row not ended yet, joined once its '$' arrives
+        pending = []
+        for line in lines:
+            if line.startswith("#"):
+                continue
+            line = line.strip()
+            stop = line.find("!")
+            if stop >= 0:
+                line = line[:stop] + "$"
+            # only the new line is searched, so a row spread over many lines is not scanned again and again
+            cut = line.rfind("$") + 1
+            if not cut:
+                pending.append(line)
+                continue
+
+            # every part ends with the count of the '$' that follows it, the last part is the empty rest
+            pending.append(line[:cut])
+            parts = "".join(pending).split("$")
+            pending = [line[cut:]]
+            for part in parts[:-1]:
+                row = part.rstrip("0123456789")
+                yield from cls._rle_row(row, left, y)
+                y += int(part[len(row):] or 1)
+            if stop >= 0:
+                return
+        rest = "".join(pending).rstrip("0123456789")
+        if rest:
+            yield from cls._rle_row(rest, left, y)
+
+    @staticmethod
+    def _rle_row(text, x, y):
+        """Decode the tokens of one RLE row into packed pieces."""
+        # the row is split at the tokens with counts of two or more digits, which are never expanded:
+        # a long live run is a piece of its own and a long dead run only moves x; the parts in between
+        # only have single digit counts and are expanded together by plain replacements
+        parts = _RLE_LONG_COUNT.split(text)
+        digits = _expand_short_tokens(_PART_MARK.join(parts[::3])).translate(_RLE_BITS)
+        invalid = _NOT_BITS_OR_MARK.search(digits)
+        if invalid:
+            raise ValueError(f"Unexpected character {invalid.group()!r} in RLE data")
+        counts, states = parts[1::3], parts[2::3]
+        for i, part in enumerate(digits.split(_PART_MARK)):
+            if "1" in part:
+                yield x, y, int(part[::-1], 2)
+            x += len(part)
+            if i < len(counts):
+                count, state = int(counts[i]), states[i].translate(_RLE_BITS)
+                if state == "1":
+                    yield x, y, (1 << count) - 1
+                elif state != "0":
+                    raise ValueError(f"Unexpected character {states[i]!r} in RLE data")
+                x += count
+
+    @staticmethod
+    def _plaintext_rows(lines, left, top):
+        """Decode plaintext rows of 'O' (or '*') and '.' characters."""
+        y = top
+        for line in lines:
+            if line.startswith("!"):
+                continue
+            digits = line.strip().translate(_PLAINTEXT_BITS)
+            invalid = _NOT_BITS.search(digits)
+            if invalid:
+                raise ValueError(f"Unexpected character {invalid.group()!r} in plaintext pattern")
+            if "1" in digits:
+                yield left, y, int(digits[::-1], 2)
+            y += 1
+
+    @staticmethod
+    def _life_106_rows(lines, dx, dy):
+        """Decode Life 1.06 data, one 'x y' pair per line."""
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            if len(parts) != 2:
+                raise ValueError(f"Invalid Life 1.06 line {line.strip()!r}")
+            yield int(parts[0]) + dx, int(parts[1]) + dy, 1
+
+
+def _expand_short_tokens(text):
+    """Expand RLE tokens with single digit counts, e.g. "3o2b" to "ooobb"."""
+    # the common tags are expanded by plain replacements, which run in C
+    for digit in "98765432":
+        if digit in text:
+            count = int(digit)
+            text = text.replace(digit + "o", "o" * count).replace(digit + "b", "b" * count)
+    if _RLE_ANY_COUNT.search(text):
+        text = _RLE_COUNTED.sub(_expand_token, text)
+    return text
+
+
+def _expand_token(match):
+    """Expand one counted RLE token matched by _RLE_COUNTED."""
+    return match.group(2) * int(match.group(1))
+
+
+def detect_format(path: str, first_line: str = "") -> str:
+    """
+    Guess the format of a pattern file from its extension, or from its first line if the extension is unknown.
+
+    Returns:
+        (str) One of FORMATS.
+    """
+    fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt:
+        return fmt
+    text = first_line.strip().lower()
+    if text.startswith("#life"):
+        return LIFE_106
+    if text.startswith("!") or (text and set(text) <= set(".o*")):
+        return PLAINTEXT
+    return RLE
+
+
+def open_pattern(path: str, fmt: str = None) -> PatternReader:
+    """
+    Open a pattern file and read its header.
+
+    Args:
+        path (str): Path of the file.
+        fmt (str, optional): One of FORMATS, detected from the file if not given.
+
+    Returns:
+        (PatternReader) Reader positioned at the cell data, to be closed by the caller.
+    """
+    stream = open(path, "r", encoding="utf-8", errors="replace")
+    try:
+        if fmt is None:
+            fmt = detect_format(path, stream.readline())
+            stream.seek(0)
+        return PatternReader(stream, fmt)
+    except BaseException:
+        stream.close()
+        raise
+
+
+def load_pattern(game, path: str, x: int = None, y: int = None, fmt: str = None,
+                 apply_rule: bool = True) -> PatternHeader:
+    """
+    Stream a pattern file into a game.
+
+    Cells are added to the board (it is not cleared first). Without a position, patterns are
+    centered on fixed grids and placed where the file puts them on infinite grids.
+
+    Args:
+        game: Game to edit.
+        path (str): Path of the file.
+        x (int, optional): Horizontal shift of the pattern.
+        y (int, optional): Vertical shift of the pattern.
+        fmt (str, optional): One of FORMATS, detected from the file if not given.
+        apply_rule (bool): Switch the game to the rule stored in the file, if any.
+
+    Returns:
+        (PatternHeader) Metadata of the loaded pattern.
+    """
+    with open_pattern(path, fmt) as reader:
+        header = reader.header
+        if apply_rule and header.rule is not None:
+            game.set_rule(header.rule)
+
+        if x is None:
+            x = _centering_shift(game.width, header.width, header.x) if is_fixed(game) else 0
+        if y is None:
+            y = _centering_shift(game.height, header.height, header.y) if is_fixed(game) else 0
+
+        game.set_rows(reader.rows(x, y))
+    return header
+
+
+def _centering_shift(grid_size, pattern_size, position):
+    """Shift that centers a pattern on a fixed grid (patterns of unknown size are centered on their origin)."""
+    if pattern_size is None:
+        return grid_size // 2
+    return (grid_size - pattern_size) // 2 - position
+
+
+def save_pattern(game, path: str, fmt: str = None, name: str = None):
+    """
+    Write the live cells of a game to a pattern file.
+
+    Args:
+        game: Game to save.
+        path (str): Path of the file.
+        fmt (str, optional): One of FORMATS, taken from the file extension if not given (RLE by default).
+        name (str, optional): Name of the pattern stored in the file.
+    """
+    fmt = fmt or EXTENSIONS.get(os.path.splitext(path)[1].lower(), RLE)
+    with open(path, "w", encoding="utf-8") as stream:
+        write_pattern(game, stream, fmt, name)
+
+
+def write_pattern(game, stream, fmt: str = RLE, name: str = None):
+    """
+    Write the live cells of a game to a text stream.
+
+    RLE files store the position of the pattern (``#CXRLE Pos=``) and the rule of the game,
+    so they load back exactly as saved.
+
+    Args:
+        game: Game to save.
+        stream: Writable text stream.
+        fmt (str): One of FORMATS.
+        name (str, optional): Name of the pattern stored in the file.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown pattern format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    # the bounds are needed for the header, the rows themselves are streamed into the lines
+    left, top, right, bottom = game.bounding_box() or (0, 0, 0, 0)
+    rows = live_runs(game)
+
+    if fmt == RLE:
+        lines = _rle_lines(rows, left, top, right, bottom, name, game.rule)
+    elif fmt == PLAINTEXT:
+        lines = _plaintext_lines(rows, left, top, name)
+    else:
+        lines = _life_106_lines(rows)
+
+    chunk, size = [], 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= WRITE_CHUNK:
+            stream.write("".join(chunk))
+            chunk, size = [], 0
+    stream.write("".join(chunk))
+
+
+def live_runs(game):
+    """
+    Yield the live cells of a game row by row, top to bottom.
+
+    Returns:
+        Generator of (y, runs) for every row with live cells, where runs is a sorted list
+        of (start, end) column ranges of consecutive live cells, end exclusive.
+    """
+    if is_fixed(game):
+        data = bytes(game.cell_bytes())
+        width = game.width
+        for y in range(game.height):
+            runs = [match.span() for match in _LIVE_BYTES.finditer(data, y * width, (y + 1) * width)]
+            if runs:
+                yield y, [(start - y * width, end - y * width) for start, end in runs]
+        return
+
+    box = game.bounding_box()
+    if box is None:
+        return
+    columns = defaultdict(list)
+    for x, y in game.cells_in_rect(*box):
+        columns[y].append(x)
+    for y in sorted(columns):
+        xs = sorted(columns.pop(y))
+        runs = []
+        start = end = xs[0]
+        for x in xs:
+            if x != end:
+                runs.append((start, end))
+                start = x
+            end = x + 1
+        runs.append((start, end))
+        yield y, runs
+
+
+def _rle_token(length, tag):
+    """Format one RLE token, omitting a count of 1."""
+    return f"{length}{tag}" if length > 1 else tag
+
+
+def _rle_lines(rows, left, top, right, bottom, name, rule):
+    """Yield the lines of an RLE file."""
+    if name:
+        yield f"#N {name}\n"
+    if left or top:
+        yield f"#CXRLE Pos={left},{top}\n"
+    yield f"x = {right - left}, y = {bottom - top}, rule = {rule}\n"
+
+    text = ""
+    previous_y = top
+    for y, runs in rows:
+        tokens = [text, _rle_token(y - previous_y, "$")] if y > previous_y else [text]
+        x = left
+        for start, end in runs:
+            if start > x:
+                tokens.append(f"{start - x}b" if start - x > 1 else "b")
+            tokens.append(f"{end - start}o" if end - start > 1 else "o")
+            x = end
+        previous_y = y
+        # lines are cut after the tag closing a token, so no token is split between lines
+        text = "".join(tokens)
+        start = 0
+        while len(text) - start > RLE_LINE_LENGTH:
+            cut = start + RLE_LINE_LENGTH
+            while text[cut - 1].isdigit():
+                cut -= 1
+            yield text[start:cut] + "\n"
+            start = cut
+        text = text[start:]
+    yield text + "!\n"
+
+
+def _plaintext_lines(rows, left, top, name):
+    """Yield the lines of a plaintext file, one per row of the bounding box."""
+    if name:
+        yield f"!Name: {name}\n"
+    previous_y = top
+    for y, runs in rows:
+        # empty rows in between
+        for _ in range(y - previous_y):
+            yield ".\n"
+        cells = []
+        x = left
+        for start, end in runs:
+            cells.append("." * (start - x) + "O" * (end - start))
+            x = end
+        yield "".join(cells) + "\n"
+        previous_y = y + 1
+
+
+def _life_106_lines(rows):
+    """Yield the lines of a Life 1.06 file, one per live cell."""
+    yield "#Life 1.06\n"
+    for y, runs in rows:
+        for start, end in runs:
+            for x in range(start, end):
+                yield f"{x} {y}\n"
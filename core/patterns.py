@@ -0,0 +1,195 @@
+"""
+
+This module provides a few well-known starting patterns and random soup generators,
+used by the headless runner and the benchmark suite, and the pasting and randomizing logic shared by the engines.
+
+Patterns are lists of (x, y) coordinates of live cells relative to the pattern's top-left corner.
+
+Version: 1.2
+"""
+
+import random
+import re
+
+_PLAINTEXT = {
+    "glider": """
+        .O.
+        ..O
+        OOO
+    """,
+    "blinker": """
+        OOO
+    """,
+    "r-pentomino": """
+        .OO
+        OO.
+        .O.
+    """,
+    "acorn": """
+        .O.....
+        ...O...
+        OO..OOO
+    """,
+    "gosper-gun": """
+        ........................O...........
+        ......................O.O...........
+        ............OO......OO............OO
+        ...........O...O....OO............OO
+        OO........O.....O...OO..............
+        OO........O...O.OO....O.O...........
+        ..........O.....O.......O...........
+        ...........O...O....................
+        ............OO......................
+    """,
+}
+
+
+def _parse(text):
+    """Convert rows of '.' and 'O' characters into a list of live cell coordinates."""
+    rows = [line.strip() for line in text.strip().splitlines()]
+    return [(x, y) for y, row in enumerate(rows) for x, char in enumerate(row) if char == "O"]
+
+
+PATTERNS = {name: _parse(text) for name, text in _PLAINTEXT.items()}
+
+# paste modes: add the pattern's cells, toggle them, or replace the whole bounding box of the pattern
+PASTE_OR = "or"
+PASTE_XOR = "xor"
+PASTE_REPLACE = "replace"
+PASTE_MODES = (PASTE_OR, PASTE_XOR, PASTE_REPLACE)
+
+_ONES = re.compile("1+")
+
+# densities of random_rows are rounded to multiples of 2 ** -DENSITY_BITS
+DENSITY_BITS = 16
+
+
+def pattern_size(cells):
+    """
+    Returns the (width, height) of the bounding box of a pattern.
+    """
+    if not cells:
+        return 0, 0
+    return max(x for x, _ in cells) + 1, max(y for _, y in cells) + 1
+
+
+def random_soup(width: int, height: int, density: float = 0.5, seed=None):
+    """
+    Generate a random pattern filling a width x height rectangle.
+
+    Args:
+        width (int): Width of the rectangle in cells.
+        height (int): Height of the rectangle in cells.
+        density (float): Probability of each cell being alive.
+        seed: Seed for the random generator, the same seed always gives the same soup.
+
+    Returns:
+        (list) Coordinates of live cells.
+    """
+    rng = random.Random(seed)
+    return [(x, y) for y in range(height) for x in range(width) if rng.random() < density]
+
+
+def random_rows(width: int, height: int, density: float = 0.5, seed=None):
+    """
+    Generate a random pattern filling a width x height rectangle as packed rows.
+
+    Each row is built from whole random words instead of one random number per cell:
+    starting from the lowest set bit of the density written in binary, a fresh random word
+    is ORed in for every 1 bit and ANDed in for every 0 bit, which makes each cell alive with
+    exactly the density (rounded to DENSITY_BITS bits). A density of 0.5 takes a single word per row.
+
+    Args:
+        width (int): Width of the rectangle in cells.
+        height (int): Height of the rectangle in cells.
+        density (float): Probability of each cell being alive, between 0 and 1.
+        seed: Seed for the random generator, the same seed always gives the same rows.
+
+    Returns:
+        Generator of (0, y, bits) tuples as accepted by the engines' ``set_rows``.
+    """
+    if not 0 <= density <= 1:
+        raise ValueError(f"Density must be between 0 and 1, got {density}")
+    # validated before the first row is asked for, so callers can rely on the error coming first
+    return _random_rows(max(width, 0), max(height, 0), round(density * (1 << DENSITY_BITS)), random.Random(seed))
+
+
+def _random_rows(width, height, scaled, rng):
+    """Yield the rows of random_rows for a density scaled to DENSITY_BITS bits."""
+    if width == 0 or scaled == 0:
+        return
+    if scaled >> DENSITY_BITS:
+        full = (1 << width) - 1
+        for y in range(height):
+            yield 0, y, full
+        return
+    # binary digits of the density after the point, least significant first, from the lowest set one
+    low = (scaled & -scaled).bit_length() - 1
+    digits = [scaled >> bit & 1 for bit in range(low + 1, DENSITY_BITS)]
+    for y in range(height):
+        bits = rng.getrandbits(width)
+        for digit in digits:
+            bits = bits | rng.getrandbits(width) if digit else bits & rng.getrandbits(width)
+        yield 0, y, bits
+
+
+def randomize_cells(game, density: float, seed=None, region=None):
+    """
+    Fill a region of a game with a random soup, used by the engines' ``randomize``.
+
+    The region is cleared and the soup is loaded with the game's packed ``set_rows``,
+    so no cell is edited on its own. The same density, seed and region size give the same soup on every engine.
+
+    Args:
+        game: Game to edit.
+        density (float): Probability of each cell being alive, between 0 and 1.
+        seed: Seed for the random generator.
+        region (tuple): (left, top, right, bottom) of the region, right and bottom exclusive.
+    """
+    left, top, right, bottom = region
+    if left >= right or top >= bottom:
+        return
+    rows = random_rows(right - left, bottom - top, density, seed)
+    game.clear_rect(left, top, right, bottom)
+    game.set_rows((left, top + y, bits) for _, y, bits in rows)
+
+
+def paste_cells(game, pattern, x: int = 0, y: int = 0, mode: str = PASTE_OR):
+    """
+    Paste a pattern onto a game with the game's bulk edits, used by the engines' ``paste_pattern``.
+
+    Args:
+        game: Game to edit.
+        pattern: Iterable of (x, y) coordinates of live cells relative to the pattern's top-left corner.
+        x (int): X-coordinate of the pattern's top-left corner.
+        y (int): Y-coordinate of the pattern's top-left corner.
+        mode (str): PASTE_OR makes the cells alive, PASTE_XOR toggles them and PASTE_REPLACE
+            also kills every other cell of the pattern's bounding box.
+    """
+    if mode not in PASTE_MODES:
+        raise ValueError(f"Unknown paste mode {mode!r}, expected one of {', '.join(PASTE_MODES)}")
+    pattern = [(int(px), int(py)) for px, py in pattern]
+    cells = [(px + x, py + y) for px, py in pattern]
+
+    if mode == PASTE_XOR:
+        game.toggle_cells(cells)
+        return
+    if mode == PASTE_REPLACE:
+        width, height = pattern_size(pattern)
+        game.clear_rect(x, y, x + width, y + height)
+    game.set_cells(cells, True)
+
+
+def bit_runs(bits: int):
+    """
+    Yield the runs of set bits of a packed row, lowest bit first.
+
+    Args:
+        bits (int): Non-negative integer, bit i holding the cell in column i.
+
+    Returns:
+        Generator of (start, end) column ranges, end exclusive.
+    """
+    # the binary string is scanned by the regex engine instead of testing bits one by one
+    for match in _ONES.finditer(format(bits, "b")[::-1]):
+        yield match.span()
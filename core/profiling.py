@@ -0,0 +1,247 @@
+"""
+
+This module implements opt-in timing of the hot paths of the simulation and the GUI.
+
+Code marks a phase with ``with phase(NEIGHBORS): ...``; while profiling is enabled the duration
+is added to a histogram of that phase, which reports percentiles (p50, p95, p99). While it is
+disabled ``phase`` returns a shared do-nothing context manager, so instrumented code only pays
+for one function call per phase. Phases are timed once per generation or frame, never per cell.
+
+Profiling is enabled by setting the environment variable GOL_PROFILE (to anything but "0"),
+in which case a report is printed to stderr on exit, or by calling ``enable``
+(the headless runner does this for ``--profile``).
+
+Version: 1.0
+"""
+
+import atexit
+import math
+import os
+import sys
+import time
+
+# engine phases
+NEIGHBORS = "neighbors"
+RULE = "rule"
+SWAP = "swap"
+# simulation worker phases
+STEP = "step"
+SNAPSHOT = "snapshot"
+# GUI phases
+RENDER = "render"
+PAINT = "paint"
+EVENTS = "events"
+
+PERCENTILES = (50, 95, 99)
+# histogram buckets per power of two, percentiles are exact to about 100 / BUCKETS_PER_OCTAVE %
+BUCKETS_PER_OCTAVE = 16
+
+
+class Histogram:
+    """
+    Histogram of durations with logarithmic buckets.
+
+    Memory stays bounded however many durations are added; percentiles are
+    reported as the middle of their bucket, count, mean, min and max are exact.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        """Add one duration in seconds."""
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        if seconds > 0:
+            # frexp splits off the power of two, the mantissa in [0.5, 1) picks the bucket within it
+            mantissa, exponent = math.frexp(seconds)
+            key = exponent * BUCKETS_PER_OCTAVE + int((mantissa - 0.5) * 2 * BUCKETS_PER_OCTAVE)
+        else:
+            key = None
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns the duration below which p percent of the durations fall, in seconds.
+        """
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        zeros = self.buckets.get(None, 0)
+        if zeros >= rank:
+            return 0.0
+        seen = zeros
+        for key, count in sorted(item for item in self.buckets.items() if item[0] is not None):
+            seen += count
+            if seen >= rank:
+                exponent, index = divmod(key, BUCKETS_PER_OCTAVE)
+                middle = math.ldexp(0.5 + (index + 0.5) / (2 * BUCKETS_PER_OCTAVE), exponent)
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+
+class _Phase:
+    """Context manager adding the time spent inside it to a histogram."""
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.add(time.perf_counter() - self._start)
+        return False
+
+
+class _NoPhase:
+    """Context manager doing nothing, returned by ``phase`` while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class Profiler:
+    """
+    Collects one histogram per phase.
+
+    Attributes:
+        histograms (dict): Histogram of every phase seen so far, by name.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+
+    def histogram(self, name: str) -> Histogram:
+        """Returns the histogram of a phase, creating it on first use."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def phase(self, name: str) -> _Phase:
+        """Returns a context manager timing a phase."""
+        return _Phase(self.histogram(name))
+
+    def record(self, name: str, seconds: float):
+        """Add a duration measured elsewhere to a phase."""
+        self.histogram(name).add(seconds)
+
+    def reset(self):
+        """Forget all durations."""
+        self.histograms = {}
+
+    def summary(self) -> dict:
+        """
+        Returns the statistics of every phase in milliseconds.
+
+        Returns:
+            (dict) Phase name to a dict with count, mean_ms, p50_ms, p95_ms, p99_ms and max_ms.
+        """
+        summary = {}
+        # copied first: other threads may add phases meanwhile
+        for name, histogram in sorted(list(self.histograms.items())):
+            stats = {"count": histogram.count, "mean_ms": histogram.mean * 1000}
+            for p in PERCENTILES:
+                stats[f"p{p}_ms"] = histogram.percentile(p) * 1000
+            stats["max_ms"] = histogram.max * 1000
+            summary[name] = stats
+        return summary
+
+    def report(self) -> str:
+        """
+        Returns the statistics of every phase as a text table.
+        """
+        header = f"{'phase':<10}{'count':>9}{'mean':>10}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+        lines = [header + f"{'max':>10}  (ms)"]
+        for name, stats in self.summary().items():
+            values = [stats["mean_ms"]] + [stats[f"p{p}_ms"] for p in PERCENTILES] + [stats["max_ms"]]
+            lines.append(f"{name:<10}{stats['count']:>9}" + "".join(f"{value:>10.3f}" for value in values))
+        return "\n".join(lines)
+
+
+_profiler = None
+_dump_registered = False
+
+
+def enable(dump_at_exit: bool = False) -> Profiler:
+    """
+    Start profiling (keeping the durations collected so far, if it already runs).
+
+    Args:
+        dump_at_exit (bool): Print the report to stderr when the interpreter exits.
+
+    Returns:
+        (Profiler) The active profiler.
+    """
+    global _profiler, _dump_registered
+    if _profiler is None:
+        _profiler = Profiler()
+    if dump_at_exit and not _dump_registered:
+        atexit.register(_dump)
+        _dump_registered = True
+    return _profiler
+
+
+def disable():
+    """Stop profiling and drop the collected durations."""
+    global _profiler
+    _profiler = None
+
+
+def enabled() -> bool:
+    """Returns whether profiling is enabled."""
+    return _profiler is not None
+
+
+def profiler():
+    """Returns the active Profiler, or None while profiling is disabled."""
+    return _profiler
+
+
+def phase(name: str):
+    """
+    Returns a context manager timing a phase, or one doing nothing while profiling is disabled.
+    """
+    if _profiler is None:
+        return _NO_PHASE
+    return _profiler.phase(name)
+
+
+def record(name: str, seconds: float):
+    """Add a duration measured elsewhere to a phase, if profiling is enabled."""
+    if _profiler is not None:
+        _profiler.record(name, seconds)
+
+
+def _dump():
+    """Print the report of the active profiler to stderr."""
+    if _profiler is not None and _profiler.histograms:
+        print("Game of Life profile:", file=sys.stderr)
+        print(_profiler.report(), file=sys.stderr)
+
+
+if os.environ.get("GOL_PROFILE", "0") not in ("", "0"):
+    enable(dump_at_exit=True)
@@ -0,0 +1,114 @@
+"""
+
+This module defines the rule object shared by all Game of Life engines.
+A rule is written in standard B/S notation (``B3/S23`` for Conway's Game of Life)
+and compiled into an 18-entry transition table indexed by ``alive * 9 + neighbors``,
+so engines look up the next state of a cell instead of branching on limits.
+
+Version: 1.0
+"""
+
+import re
+
+_BS_PATTERN = re.compile(r"^B(?P<birth>[0-8]*)/S(?P<survival>[0-8]*)$")
+_SB_PATTERN = re.compile(r"^S(?P<survival>[0-8]*)/B(?P<birth>[0-8]*)$")
+_LEGACY_PATTERN = re.compile(r"^(?P<survival>[0-8]*)/(?P<birth>[0-8]*)$")
+
+
+class Rule:
+    """
+    Outer-totalistic Life-like rule on the Moore neighborhood.
+
+    Args:
+        birth: Neighbor counts that make a dead cell alive.
+        survival: Neighbor counts that keep a live cell alive.
+    """
+
+    def __init__(self, birth, survival):
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        if not self.birth | self.survival <= set(range(9)):
+            raise ValueError("Neighbor counts must be between 0 and 8")
+
+        # next state of a cell, indexed by alive * 9 + neighbors
+        self.table = tuple([count in self.birth for count in range(9)]
+                           + [count in self.survival for count in range(9)])
+
+    @classmethod
+    def parse(cls, rulestring: str) -> "Rule":
+        """
+        Create a rule from B/S notation.
+
+        Accepts ``B3/S23``, ``S23/B3`` and the legacy survival/birth form ``23/3``, case-insensitive.
+
+        Args:
+            rulestring (str): Rule in B/S notation.
+
+        Returns:
+            (Rule) Parsed rule.
+        """
+        text = rulestring.strip().upper().replace(" ", "")
+        for pattern in (_BS_PATTERN, _SB_PATTERN, _LEGACY_PATTERN):
+            match = pattern.match(text)
+            if match:
+                return cls((int(digit) for digit in match.group("birth")),
+                           (int(digit) for digit in match.group("survival")))
+        raise ValueError(f"Invalid rulestring: {rulestring!r}")
+
+    @classmethod
+    def from_limits(cls, underpop: int, overpop: int, repro: int) -> "Rule":
+        """
+        Create a rule from the classic limit settings.
+
+        Args:
+            underpop (int): Minimum neighbors for a live cell to survive.
+            overpop (int): Maximum neighbors before a cell dies from overpopulation.
+            repro (int): Exact number of neighbors required for a dead cell to reproduce.
+
+        Returns:
+            (Rule) Equivalent rule.
+        """
+        return cls((repro,), range(underpop, overpop + 1))
+
+    def __str__(self):
+        birth = "".join(str(count) for count in sorted(self.birth))
+        survival = "".join(str(count) for count in sorted(self.survival))
+        return f"B{birth}/S{survival}"
+
+    def __repr__(self):
+        return f"Rule.parse({str(self)!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return self.birth == other.birth and self.survival == other.survival
+
+    def __hash__(self):
+        return hash((self.birth, self.survival))
+
+
+CONWAY = Rule.parse("B3/S23")
+
+NAMED_RULES = {
+    "Conway's Life": "B3/S23",
+    "HighLife": "B36/S23",
+    "Day & Night": "B3678/S34678",
+    "Seeds": "B2/S",
+    "Life without Death": "B3/S012345678",
+    "Maze": "B3/S12345",
+    "2x2": "B36/S125",
+    "Move": "B368/S245",
+}
+
+
+def as_rule(rule) -> Rule:
+    """
+    Convert a rulestring to a Rule, passing Rule instances through unchanged.
+
+    Args:
+        rule: Rule instance or rulestring in B/S notation.
+
+    Returns:
+        (Rule) The rule.
+    """
+    return rule if isinstance(rule, Rule) else Rule.parse(rule)
@@ -0,0 +1,216 @@
+"""
+
+This module implements the headless runner for the Game of Life engines.
+It loads a pattern, picks an engine, runs a number of generations without any GUI
+and reports generations per second, cell updates per second and peak memory use.
+
+Usage::
+
+    python -m core --engine tiled --pattern acorn --generations 5000
+    python -m core --engine numpy --width 1000 --height 1000 --wrap --pattern soup --json
+    python -m core --engine hashlife --pattern-file breeder.rle --generations 100000
+    python -m core --engine numpy --pattern soup --generations 1000000 --checkpoint run.gol --checkpoint-every 10000
+    python -m core --resume run.gol --generations 1000000 --checkpoint run.gol --checkpoint-every 10000
+    python -m core --engine tiled --pattern acorn --generations 5000 --stats-out acorn.csv
+    python -m core --engine numpy --width 2000 --height 2000 --pattern soup --profile
+
+Version: 1.4
+"""
+
+import argparse
+import json
+import sys
+import time
+from functools import partial
+
+from core import profiling
+from core.checkpoint import AutoCheckpoint, engine_name, restore
+from core.engines import ENGINES, close_game, create_game, is_fixed
+from core.pattern_io import load_pattern
+from core.patterns import PATTERNS, pattern_size
+from core.stats import StatsRecorder, open_sink
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """
+    Returns the peak resident set size of the current process in kilobytes, or None if unknown.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def load_initial_pattern(game, name: str, density: float = 0.5, seed=None, soup_size: int = 256):
+    """
+    Place a named pattern or a random soup on the board.
+
+    On fixed grids the pattern is centered and a soup fills the whole grid,
+    on the infinite grid a soup fills a soup_size x soup_size square at the origin.
+    Soups are generated in bulk by the engine's ``randomize``, the same seed gives the same soup on every engine.
+    """
+    if name == "soup":
+        game.randomize(density, seed, None if is_fixed(game) else (0, 0, soup_size, soup_size))
+        return
+
+    cells = PATTERNS[name]
+    if is_fixed(game):
+        width, height = pattern_size(cells)
+        game.paste_pattern(cells, (game.width - width) // 2, (game.height - height) // 2)
+    else:
+        game.paste_pattern(cells)
+
+
+def measure(game, generations: int, detect_cycles: bool = False, checkpoint: AutoCheckpoint = None,
+            stats: StatsRecorder = None) -> dict:
+    """
+    Run a game for a number of generations and time it.
+
+    Cell updates are width x height per generation on fixed grids; on the infinite grid
+    they are estimated as the mean of the starting and final population per generation.
+    With a checkpoint the game is saved periodically, and the time spent saving is included.
+    With a stats recorder every generation is computed and recorded on its own,
+    which is slower for engines that can skip generations (Hashlife).
+
+    Returns:
+        (dict) Timing results.
+    """
+    start_population = game.population
+    start = time.perf_counter()
+    step = game.step if stats is None else partial(stats.step, game)
+    if checkpoint is None:
+        report = step(generations, detect_cycles=detect_cycles)
+    else:
+        report = checkpoint.run(game, generations, detect_cycles, step)
+    elapsed = time.perf_counter() - start
+
+    if is_fixed(game):
+        cell_updates = game.width * game.height * report.generations
+    else:
+        cell_updates = (start_population + game.population) / 2 * report.generations
+
+    return {
+        "generations": report.generations,
+        "final_generation": game.generation,
+        "status": report.status,
+        "period": report.period,
+        "seconds": elapsed,
+        "generations_per_second": report.generations / elapsed if elapsed else None,
+        "cell_updates_per_second": cell_updates / elapsed if elapsed else None,
+        "start_population": start_population,
+        "final_population": game.population,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command line parser of the headless runner."""
+    parser = argparse.ArgumentParser(prog="python -m core", description="Run Game of Life engines without a GUI.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="tiled", help="simulation engine")
+    parser.add_argument("--width", type=int, default=500, help="grid width (fixed engines)")
+    parser.add_argument("--height", type=int, default=500, help="grid height (fixed engines)")
+    parser.add_argument("--wrap", action="store_true", help="wrap grid edges (fixed engines)")
+    parser.add_argument("--pattern", choices=sorted(PATTERNS) + ["soup"], default="r-pentomino",
+                        help="starting pattern")
+    parser.add_argument("--pattern-file", default=None,
+                        help="load the starting pattern from an RLE, plaintext (.cells) or Life 1.06 file")
+    parser.add_argument("--density", type=float, default=0.5, help="density of the random soup")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random soup")
+    parser.add_argument("--soup-size", type=int, default=256, help="side of the soup square (infinite engines)")
+    parser.add_argument("--rule", default=None, help="rule in B/S notation, e.g. B36/S23")
+    parser.add_argument("--generations", type=int, default=1000, help="number of generations to run")
+    parser.add_argument("--detect-cycles", action="store_true", help="stop once the pattern becomes periodic")
+    parser.add_argument("--checkpoint", default=None, help="save a binary checkpoint to this file while running")
+    parser.add_argument("--checkpoint-every", type=int, default=10000,
+                        help="generations between checkpoints")
+    parser.add_argument("--resume", default=None,
+                        help="continue from a checkpoint file (engine, grid, rule and generation come from the file)")
+    parser.add_argument("--stats-out", default=None,
+                        help="write per-generation statistics to this file (.csv, or .jsonl for JSON lines)")
+    parser.add_argument("--stats-bounds", action="store_true",
+                        help="include the bounding box of the live cells in the statistics (scans the board)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the phases of each generation and report their percentiles")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser
+
+
+def run(args) -> dict:
+    """
+    Set up a game from parsed arguments, run it and return the results.
+    """
+    if args.resume:
+        # the checkpoint decides the engine, the grid and the rule (unless --rule overrides it)
+        game = restore(args.resume)
+        engine = engine_name(game)
+    else:
+        game = create_game(args.engine, args.width, args.height, args.wrap)
+        engine = args.engine
+    try:
+        if args.resume:
+            pattern = args.resume
+        elif args.pattern_file:
+            pattern = args.pattern_file
+            # a rule given on the command line wins over the one stored in the file
+            load_pattern(game, args.pattern_file, apply_rule=not args.rule)
+        else:
+            pattern = args.pattern
+            load_initial_pattern(game, args.pattern, args.density, args.seed, args.soup_size)
+        if args.rule:
+            game.set_rule(args.rule)
+
+        fixed = is_fixed(game)
+        result = {
+            "engine": engine,
+            "pattern": pattern,
+            "rule": str(game.rule),
+            "width": game.width if fixed else None,
+            "height": game.height if fixed else None,
+            "wrap": game.wrap if fixed else None,
+        }
+        checkpoint = AutoCheckpoint(args.checkpoint, args.checkpoint_every) if args.checkpoint else None
+        stats = (StatsRecorder(sink=open_sink(args.stats_out), track_bounds=args.stats_bounds)
+                 if args.stats_out else None)
+        profiler = profiling.enable() if args.profile else None
+        if profiler is not None:
+            # only the run itself is profiled, not loading the pattern
+            profiler.reset()
+        try:
+            result.update(measure(game, args.generations, args.detect_cycles, checkpoint, stats))
+        finally:
+            if stats is not None:
+                stats.close()
+        if profiler is not None:
+            result["profile"] = profiler.summary()
+        return result
+    finally:
+        close_game(game)
+
+
+def main(argv=None):
+    """Entry point of ``python -m core``."""
+    args = build_parser().parse_args(argv)
+    result = run(args)
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    profile = result.pop("profile", None)
+    for key, value in result.items():
+        if isinstance(value, float):
+            value = f"{value:,.2f}"
+        print(f"{key.replace('_', ' '):>24}: {value}")
+    if profile is not None:
+        print()
+        print(profiling.profiler().report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,855 @@
+"""
+
+This module implements an asyncio simulation server for the Game of Life engines, so long runs
+can be driven and watched from other programs (dashboards, notebooks) instead of the PyQt5 window.
+
+Clients connect over TCP and send commands as JSON objects, one per line::
+
+    {"cmd": "load", "engine": "tiled", "pattern": "acorn"}
+    {"cmd": "load", "engine": "numpy", "width": 1000, "height": 1000, "wrap": true, "pattern": "soup", "seed": 1}
+    {"cmd": "load", "path": "breeder.rle"}    only with a pattern directory, relative to it
+    {"cmd": "step", "n": 100}
+    {"cmd": "run", "rate": 30}            generations per second, 0 stops
+    {"cmd": "stop"}
+    {"cmd": "edit", "cells": [[1, 2], [3, 4]], "alive": true}
+    {"cmd": "snapshot", "viewport": [0, 0, 64, 64]}
+    {"cmd": "subscribe", "viewport": [0, 0, 64, 64]}    viewport optional
+    {"cmd": "unsubscribe"}
+    {"cmd": "status"}
+
+Every command is answered with a reply; an "id" sent with the command is echoed in it.
+The server sends binary messages, each a 5-byte header (kind: uint8, payload length: uint32,
+little-endian) followed by the payload:
+
+- REPLY: UTF-8 JSON object with "ok" and either the result or an "error".
+- DELTA: generation (int64), population (int64), births and deaths counts (uint32 each),
+  then the births and the deaths as int32 x, y pairs.
+- BITMAP: generation (int64), population (int64), left, top (int64 each), width, height (uint32 each),
+  then height rows of (width + 7) // 8 bytes, bit i of a row being the cell at column left + i.
+
+Subscribers receive a BITMAP of their viewport (the whole fixed grid, or the bounding box of the
+live cells on the infinite grid, when none is given) and then a DELTA for every generation or
+edit, limited to their viewport. Steps of several generations are sent as a BITMAP.
+
+Slow clients never stall the simulation: every subscriber has a bounded queue of frames, and when
+it is full the queued frames are dropped and the subscriber is brought up to date with a BITMAP
+as soon as it catches up. Engines run in a worker thread, so the event loop keeps serving clients
+while a generation is computed.
+
+``SimulationClient`` is a client for the same protocol, and ``python -m core.server --demo``
+runs a server and a client against each other over the loopback interface.
+
+Boards and soups are limited to MAX_BOARD_CELLS cells, and pattern files can only be loaded
+from the directory given with ``--pattern-dir``.
+
+Usage::
+
+    python -m core.server --port 7777
+    python -m core.server --pattern-dir patterns/
+    python -m core.server --demo
+
+Version: 1.1
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from itertools import chain
+
+from core.engines import ENGINES, FIXED_ENGINES, close_game, create_game, is_fixed
+from core.pattern_io import RLE, PatternReader, load_pattern, open_pattern
+from core.patterns import PATTERNS, bit_runs
+from core.runner import load_initial_pattern
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+DEFAULT_ENGINE = "tiled"
+DEFAULT_SIZE = 256
+
+# message kinds
+REPLY = 1
+DELTA = 2
+BITMAP = 3
+
+# frames waiting for a slow subscriber before they are dropped in favor of a bitmap
+DEFAULT_MAX_PENDING_FRAMES = 16
+# generations with more changes are sent as a bitmap, which is smaller by then
+MAX_DELTA_CELLS = 1 << 16
+# largest viewport in cells, larger bounding boxes are cut at the bottom
+MAX_VIEWPORT_CELLS = 1 << 24
+# largest fixed grid, soup or pattern a client may load, in cells
+MAX_BOARD_CELLS = 1 << 26
+# runs faster than this advance several generations per frame
+MAX_FRAME_RATE = 60
+# longest command line in bytes
+MAX_LINE = 1 << 24
+
+_HEADER = struct.Struct("<BI")
+_DELTA = struct.Struct("<qqII")
+_BITMAP = struct.Struct("<qqqqII")
+# maps the one byte per cell of fixed grids to binary digits
+_BYTE_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def encode_message(kind: int, payload: bytes) -> bytes:
+    """Returns a message with its header."""
+    return _HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_delta(generation: int, population: int, births, deaths):
+    """
+    Encode births and deaths as a DELTA message.
+
+    Returns:
+        (bytes) The message, or None if a coordinate does not fit in 32 bits.
+    """
+    births, deaths = list(births), list(deaths)
+    try:
+        coordinates = array("i", [coordinate for cell in chain(births, deaths) for coordinate in cell])
+    except OverflowError:
+        return None
+    if sys.byteorder == "big":
+        coordinates.byteswap()
+    return encode_message(DELTA, _DELTA.pack(generation, population, len(births), len(deaths))
+                          + coordinates.tobytes())
+
+
+def encode_bitmap(game, viewport) -> bytes:
+    """
+    Encode the cells of a game inside a viewport as a BITMAP message.
+
+    Args:
+        game: Game to encode.
+        viewport (tuple): (left, top, right, bottom) of the area, right and bottom exclusive.
+    """
+    left, top, right, bottom = viewport
+    width, height = max(right - left, 0), max(bottom - top, 0)
+    # one byte per cell of the viewport, packed row by row at the end
+    cells = bytearray(width * height)
+    if is_fixed(game):
+        data = bytes(game.cell_bytes())
+        x0, x1 = max(left, 0), min(right, game.width)
+        if x0 < x1:
+            for y in range(max(top, 0), min(bottom, game.height)):
+                start = (y - top) * width + x0 - left
+                cells[start:start + x1 - x0] = data[y * game.width + x0:y * game.width + x1]
+    else:
+        for x, y in game.cells_in_rect(left, top, right, bottom):
+            cells[(y - top) * width + x - left] = 1
+
+    row_bytes = (width + 7) // 8
+    rows = []
+    for y in range(height):
+        digits = cells[y * width:(y + 1) * width].translate(_BYTE_DIGITS)[::-1]
+        rows.append(int(digits, 2).to_bytes(row_bytes, "little") if width else b"")
+    return encode_message(BITMAP, _BITMAP.pack(game.generation, game.population, left, top, width, height)
+                          + b"".join(rows))
+
+
+class DeltaFrame:
+    """
+    Decoded DELTA message.
+
+    Attributes:
+        generation (int): Generation after the change.
+        population (int): Number of live cells of the whole board after the change.
+        births (list): (x, y) cells that became alive.
+        deaths (list): (x, y) cells that died.
+    """
+    __slots__ = ('generation', 'population', 'births', 'deaths')
+
+    def __init__(self, generation, population, births, deaths):
+        self.generation = generation
+        self.population = population
+        self.births = births
+        self.deaths = deaths
+
+    def __repr__(self):
+        return (f"DeltaFrame(generation={self.generation}, population={self.population}, "
+                f"births={len(self.births)}, deaths={len(self.deaths)})")
+
+
+class BitmapFrame:
+    """
+    Decoded BITMAP message.
+
+    Attributes:
+        generation (int): Generation of the bitmap.
+        population (int): Number of live cells of the whole board.
+        left (int): X-coordinate of the first column.
+        top (int): Y-coordinate of the first row.
+        width (int): Number of columns.
+        height (int): Number of rows.
+        rows (list): Packed rows, bit i of a row being the cell at column left + i.
+    """
+    __slots__ = ('generation', 'population', 'left', 'top', 'width', 'height', 'rows')
+
+    def __init__(self, generation, population, left, top, width, height, rows):
+        self.generation = generation
+        self.population = population
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.rows = rows
+
+    def cells(self):
+        """Yield the live cells of the bitmap as (x, y) tuples."""
+        for y, bits in enumerate(self.rows, self.top):
+            for start, end in bit_runs(bits):
+                for x in range(self.left + start, self.left + end):
+                    yield x, y
+
+    def __repr__(self):
+        return (f"BitmapFrame(generation={self.generation}, population={self.population}, "
+                f"viewport={(self.left, self.top, self.left + self.width, self.top + self.height)})")
+
+
+def decode_frame(kind: int, payload: bytes):
+    """
+    Decode a DELTA or BITMAP message payload.
+
+    Returns:
+        (DeltaFrame | BitmapFrame) The frame.
+    """
+    if kind == DELTA:
+        generation, population, birth_count, death_count = _DELTA.unpack_from(payload)
+        coordinates = array("i")
+        coordinates.frombytes(payload[_DELTA.size:])
+        if sys.byteorder == "big":
+            coordinates.byteswap()
+        pairs = list(zip(coordinates[0::2], coordinates[1::2]))
+        return DeltaFrame(generation, population, pairs[:birth_count], pairs[birth_count:birth_count + death_count])
+    if kind == BITMAP:
+        generation, population, left, top, width, height = _BITMAP.unpack_from(payload)
+        row_bytes = (width + 7) // 8
+        start = _BITMAP.size
+        rows = [int.from_bytes(payload[start + y * row_bytes:start + (y + 1) * row_bytes], "little")
+                for y in range(height)]
+        return BitmapFrame(generation, population, left, top, width, height, rows)
+    raise ValueError(f"Unknown frame kind {kind}")
+
+
+def _inside(viewport, cells):
+    """Returns the cells inside a viewport, all of them if the viewport is None."""
+    if viewport is None:
+        return list(cells)
+    left, top, right, bottom = viewport
+    return [(x, y) for x, y in cells if left <= x < right and top <= y < bottom]
+
+
+def _parse_viewport(value):
+    """
+    Check a viewport sent by a client.
+
+    Returns:
+        (tuple) (left, top, right, bottom), or None if no viewport was given.
+    """
+    if value is None:
+        return None
+    left, top, right, bottom = (int(coordinate) for coordinate in value)
+    if right < left or bottom < top:
+        raise ValueError("Viewport must be [left, top, right, bottom] with right >= left and bottom >= top")
+    if (right - left) * (bottom - top) > MAX_VIEWPORT_CELLS:
+        raise ValueError(f"Viewport is larger than {MAX_VIEWPORT_CELLS} cells")
+    return left, top, right, bottom
+
+
+def _check_size(width: int, height: int):
+    """Check the size of a board, soup or pattern sent by a client."""
+    if width < 0 or height < 0:
+        raise ValueError("Sizes must not be negative")
+    if width * height > MAX_BOARD_CELLS:
+        raise ValueError(f"Board is larger than {MAX_BOARD_CELLS} cells")
+
+
+def _on_board(game, x: int, y: int) -> bool:
+    """Returns whether a cell lies on the board (always true on the infinite grid)."""
+    return not is_fixed(game) or (0 <= x < game.width and 0 <= y < game.height)
+
+
+def _is_alive(game, x: int, y: int) -> bool:
+    """Returns whether a cell on the board is alive."""
+    if is_fixed(game):
+        return bool(game.grid[y][x])
+    return any(True for _ in game.cells_in_rect(x, y, x + 1, y + 1))
+
+
+class _Client:
+    """
+    Connection of one client: replies are always sent, frames are dropped when the client falls behind.
+
+    Attributes:
+        subscribed (bool): Whether the client receives frames.
+        viewport (tuple): Viewport of the subscription, None for the whole board.
+        needs_bitmap (bool): Whether the next frame must be a bitmap (after subscribing or dropping frames).
+        dropped (int): Number of frames dropped so far.
+    """
+
+    def __init__(self, writer, max_pending_frames):
+        self.writer = writer
+        self.task = asyncio.current_task()
+        self.max_pending_frames = max_pending_frames
+        self.replies = deque()
+        self.frames = deque()
+        self.wake = asyncio.Event()
+        self.closed = False
+        self.subscribed = False
+        self.viewport = None
+        self.needs_bitmap = False
+        self.dropped = 0
+
+    def reply(self, message: bytes):
+        """Queue a message that must not be dropped."""
+        self.replies.append(message)
+        self.wake.set()
+
+    def offer(self, frame: bytes, bitmap: bool = False):
+        """
+        Queue a frame, dropping the queued ones if the client fell too far behind.
+
+        After a drop only a bitmap is accepted, deltas would not apply to what the client has seen.
+        """
+        if len(self.frames) >= self.max_pending_frames:
+            self.dropped += len(self.frames)
+            self.frames.clear()
+            self.needs_bitmap = True
+        if self.needs_bitmap and not bitmap:
+            self.dropped += 1
+            return
+        self.frames.append(frame)
+        if bitmap:
+            self.needs_bitmap = False
+        self.wake.set()
+
+
+class SimulationServer:
+    """
+    Serves one game to any number of clients (see the module documentation for the protocol).
+
+    Args:
+        game: Game to serve, by default an empty infinite grid; replaced by the "load" command.
+        max_pending_frames (int): Frames queued for a subscriber before they are dropped.
+        pattern_dir (str, optional): Directory the "load" command may read pattern files from,
+            by default no files can be loaded.
+    """
+
+    def __init__(self, game=None, max_pending_frames: int = DEFAULT_MAX_PENDING_FRAMES, pattern_dir: str = None):
+        self.game = game if game is not None else create_game(DEFAULT_ENGINE)
+        self.max_pending_frames = max_pending_frames
+        self.pattern_dir = os.path.realpath(pattern_dir) if pattern_dir is not None else None
+        self.rate = 0
+        self._lock = asyncio.Lock()
+        self._clients = set()
+        self._server = None
+        self._loop = None
+        self._run_task = None
+        self._commands = {
+            "load": self._load, "step": self._step, "run": self._run, "stop": self._stop,
+            "edit": self._edit, "snapshot": self._snapshot, "subscribe": self._subscribe,
+            "unsubscribe": self._unsubscribe, "status": self._status,
+        }
+
+    @property
+    def port(self):
+        """Port the server listens on, None before ``start``."""
+        return self._server.sockets[0].getsockname()[1] if self._server is not None else None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Start listening; port 0 picks a free port (see ``port``)."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._serve_client, host, port, limit=MAX_LINE)
+
+    async def serve_forever(self):
+        """Serve clients until cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop the simulation, disconnect all clients and release the game."""
+        await self._stop(None, {})
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        clients = list(self._clients)
+        for client in clients:
+            # the reader of a closed connection sees the end of the stream and the handler returns
+            client.writer.close()
+        await asyncio.gather(*(client.task for client in clients), return_exceptions=True)
+        close_game(self.game)
+
+    async def _serve_client(self, reader, writer):
+        """Read the commands of one client until it disconnects."""
+        client = _Client(writer, self.max_pending_frames)
+        # the set is read by _publish in the worker thread, which runs with the lock held
+        async with self._lock:
+            self._clients.add(client)
+        sender = asyncio.create_task(self._send(client))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    client.reply(encode_message(REPLY, json.dumps(await self._handle(client, line)).encode()))
+        except (ConnectionError, ValueError):
+            # connection reset, or a line longer than MAX_LINE
+            pass
+        finally:
+            client.closed = True
+            sender.cancel()
+            writer.close()
+            async with self._lock:
+                self._clients.discard(client)
+
+    async def _send(self, client):
+        """Write the replies and frames of one client, waiting for each write to drain."""
+        try:
+            while not client.closed:
+                await client.wake.wait()
+                client.wake.clear()
+                while client.replies or client.frames:
+                    message = client.replies.popleft() if client.replies else client.frames.popleft()
+                    client.writer.write(message)
+                    await client.writer.drain()
+                if client.subscribed and client.needs_bitmap:
+                    # the client caught up after dropping frames, bring it up to date
+                    await self._send_bitmap(client)
+        except ConnectionError:
+            client.closed = True
+
+    async def _handle(self, client, line: bytes) -> dict:
+        """Run one command and return its reply."""
+        request = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Commands must be JSON objects")
+            command = self._commands.get(request.get("cmd"))
+            if command is None:
+                raise ValueError(f"Unknown command {request.get('cmd')!r}, expected one of {', '.join(self._commands)}")
+            reply = {"ok": True, **(await command(client, request) or {})}
+        except (ValueError, TypeError, KeyError, OSError) as error:
+            reply = {"ok": False, "error": str(error)}
+        except Exception as error:
+            # a failing command must not take the connection down with it
+            reply = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    async def _locked(self, function, *args):
+        """Run a function on the game in a worker thread, one at a time."""
+        async with self._lock:
+            future = asyncio.get_running_loop().run_in_executor(None, function, *args)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # the thread cannot be interrupted: keep the lock until it is done, so "stop" really stops
+                await asyncio.wait([future])
+                raise
+
+    # commands
+
+    async def _load(self, client, request):
+        """Replace the game with a new one holding a named pattern, a random soup, RLE text or a pattern file."""
+        engine = request.get("engine", DEFAULT_ENGINE)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, available: {', '.join(ENGINES)}")
+
+        width, height = int(request.get("width", DEFAULT_SIZE)), int(request.get("height", DEFAULT_SIZE))
+        soup_size = int(request.get("soup_size", DEFAULT_SIZE))
+        if engine in FIXED_ENGINES:
+            _check_size(width, height)
+        _check_size(soup_size, soup_size)
+        path = self._pattern_path(request["path"]) if "path" in request else None
+
+        def load():
+            game = create_game(engine, width, height, bool(request.get("wrap", False)))
+            try:
+                if "rle" in request:
+                    with PatternReader(io.StringIO(request["rle"]), RLE) as reader:
+                        _check_size(reader.header.width or 0, reader.header.height or 0)
+                        if reader.header.rule is not None:
+                            game.set_rule(reader.header.rule)
+                        game.set_rows(reader.rows())
+                elif path is not None:
+                    with open_pattern(path) as reader:
+                        _check_size(reader.header.width or 0, reader.header.height or 0)
+                    load_pattern(game, path)
+                else:
+                    name = request.get("pattern", "r-pentomino")
+                    if name != "soup" and name not in PATTERNS:
+                        raise ValueError(f"Unknown pattern {name!r}, available: {', '.join(sorted(PATTERNS))}, soup")
+                    load_initial_pattern(game, name, float(request.get("density", 0.5)), request.get("seed"), soup_size)
+                if "rule" in request:
+                    game.set_rule(request["rule"])
+            except BaseException:
+                close_game(game)
+                raise
+            previous, self.game = self.game, game
+            close_game(previous)
+            self._publish(None, None)
+            return self._status_fields()
+        return await self._locked(load)
+
+    def _pattern_path(self, path):
+        """Returns the path of a pattern file inside the pattern directory."""
+        if self.pattern_dir is None:
+            raise ValueError("Loading pattern files is disabled, start the server with a pattern directory")
+        resolved = os.path.realpath(os.path.join(self.pattern_dir, path))
+        if os.path.commonpath([self.pattern_dir, resolved]) != self.pattern_dir:
+            raise ValueError(f"Pattern file {path!r} is outside the pattern directory")
+        return resolved
+
+    async def _step(self, client, request):
+        """Advance the game by n generations."""
+        n = int(request.get("n", 1))
+        if n < 0:
+            raise ValueError("Cannot step a negative number of generations")
+        return await self._locked(self._advance, n)
+
+    async def _run(self, client, request):
+        """Advance the game continuously at a rate in generations per second (0 stops)."""
+        rate = float(request.get("rate", 0))
+        if rate < 0:
+            raise ValueError("Rate must not be negative")
+        await self._stop(client, request)
+        if rate:
+            self.rate = rate
+            self._run_task = asyncio.create_task(self._run_loop(rate))
+        return await self._locked(self._status_fields)
+
+    async def _stop(self, client, request):
+        """Stop a continuous run."""
+        task, self._run_task = self._run_task, None
+        self.rate = 0
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        return await self._locked(self._status_fields)
+
+    async def _edit(self, client, request):
+        """Set the state of cells."""
+        cells = [(int(x), int(y)) for x, y in request["cells"]]
+        alive = bool(request.get("alive", True))
+
+        def edit():
+            # only cells on the board that change state are published, so deltas match the board
+            changed = [(x, y) for x, y in dict.fromkeys(cells)
+                       if _on_board(self.game, x, y) and _is_alive(self.game, x, y) != alive]
+            self.game.set_cells(changed, alive)
+            self._publish(changed if alive else (), () if alive else changed)
+            return self._status_fields()
+        return await self._locked(edit)
+
+    async def _snapshot(self, client, request):
+        """Send a bitmap of a viewport (by default the whole board) to the client and describe the board."""
+        viewport = _parse_viewport(request.get("viewport"))
+
+        def snapshot():
+            return (encode_bitmap(self.game, self._viewport(viewport)),
+                    {**self._status_fields(), "bounding_box": self.game.bounding_box()})
+        bitmap, fields = await self._locked(snapshot)
+        # the bitmap is a reply of its own, so it is never dropped
+        client.reply(bitmap)
+        return fields
+
+    async def _subscribe(self, client, request):
+        """Stream frames of a viewport (by default the whole board) to the client."""
+        viewport = _parse_viewport(request.get("viewport"))
+        async with self._lock:
+            client.viewport = viewport
+            client.subscribed = True
+            client.needs_bitmap = True
+        await self._send_bitmap(client)
+        return await self._locked(self._status_fields)
+
+    async def _unsubscribe(self, client, request):
+        """Stop streaming frames to the client."""
+        async with self._lock:
+            client.subscribed = False
+            client.frames.clear()
+        return {"dropped": client.dropped}
+
+    async def _status(self, client, request):
+        """Describe the game."""
+        return await self._locked(self._status_fields)
+
+    # simulation
+
+    def _status_fields(self) -> dict:
+        """Fields describing the game, included in most replies (reads the game, so only with the lock held)."""
+        fixed = is_fixed(self.game)
+        return {"generation": self.game.generation, "population": self.game.population, "rate": self.rate,
+                "rule": str(self.game.rule), "width": self.game.width if fixed else None,
+                "height": self.game.height if fixed else None}
+
+    async def _run_loop(self, rate):
+        """Advance the game at a steady rate, several generations per frame above MAX_FRAME_RATE."""
+        loop = asyncio.get_running_loop()
+        generations = max(1, round(rate / MAX_FRAME_RATE))
+        interval = generations / rate
+        next_tick = loop.time()
+        while True:
+            await self._locked(self._advance, generations)
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # running behind: carry on at the engine's speed instead of catching up in a burst
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def _advance(self, n):
+        """
+        Advance n generations and publish the change (in the worker thread).
+
+        Returns:
+            (dict) Status fields after the change.
+        """
+        if n == 1:
+            changes = self.game.next_generation()
+            if len(changes) <= MAX_DELTA_CELLS:
+                self._publish(changes.births, changes.deaths)
+                return self._status_fields()
+        elif n > 1:
+            self.game.step(n)
+        self._publish(None, None)
+        return self._status_fields()
+
+    def _viewport(self, viewport):
+        """Returns a viewport, or the area covering the whole board for None."""
+        if viewport is not None:
+            return viewport
+        if is_fixed(self.game):
+            return 0, 0, self.game.width, self.game.height
+        box = self.game.bounding_box()
+        if box is None:
+            return 0, 0, 0, 0
+        left, top, right, bottom = box
+        width = min(right - left, MAX_VIEWPORT_CELLS)
+        return left, top, left + width, min(bottom, top + MAX_VIEWPORT_CELLS // width)
+
+    def _publish(self, births, deaths):
+        """
+        Queue the frames of a change for every subscriber (in the worker thread, with the lock held).
+
+        Args:
+            births: Cells born, None if the change is unknown (every subscriber gets a bitmap).
+            deaths: Cells that died.
+        """
+        # frames are encoded once per distinct viewport
+        deltas, bitmaps = {}, {}
+        for client in [client for client in self._clients if client.subscribed]:
+            viewport = client.viewport
+            if births is not None and not client.needs_bitmap:
+                if viewport not in deltas:
+                    deltas[viewport] = encode_delta(self.game.generation, self.game.population,
+                                                    _inside(viewport, births), _inside(viewport, deaths))
+                if deltas[viewport] is not None:
+                    self._offer(client, deltas[viewport], False)
+                    continue
+            if viewport not in bitmaps:
+                bitmaps[viewport] = encode_bitmap(self.game, self._viewport(viewport))
+            self._offer(client, bitmaps[viewport], True)
+
+    async def _send_bitmap(self, client):
+        """Queue a bitmap of the client's viewport, bringing it up to date."""
+        def send():
+            if client.subscribed and client.needs_bitmap:
+                self._offer(client, encode_bitmap(self.game, self._viewport(client.viewport)), True)
+        await self._locked(send)
+
+    def _offer(self, client, frame, bitmap):
+        """Hand a frame to a client, on the event loop thread (callbacks run in order, so frames stay in order)."""
+        self._loop.call_soon_threadsafe(client.offer, frame, bitmap)
+
+
+class SimulationClient:
+    """
+    Client of a SimulationServer.
+
+    Replies are matched to their commands by id; frames go to a queue read with ``next_frame``.
+    A client that reads its frames too slowly only loses intermediate ones, the server then
+    sends a bitmap, so ``BoardView`` stays correct inside the viewport.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending = {}
+        self.frames = asyncio.Queue()
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "SimulationClient":
+        """Connect to a server."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, cmd: str, **arguments) -> dict:
+        """
+        Send a command and wait for its reply.
+
+        Returns:
+            (dict) The reply.
+
+        Raises:
+            ValueError: The server rejected the command.
+        """
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        self._writer.write(json.dumps({"cmd": cmd, "id": self._next_id, **arguments}).encode() + b"\n")
+        await self._writer.drain()
+        reply = await future
+        if not reply.get("ok"):
+            raise ValueError(reply.get("error"))
+        return reply
+
+    async def next_frame(self, timeout: float = None):
+        """
+        Returns the next frame sent by the server (a DeltaFrame or BitmapFrame).
+
+        Raises:
+            asyncio.TimeoutError: No frame arrived within the timeout.
+        """
+        return await asyncio.wait_for(self.frames.get(), timeout)
+
+    async def close(self):
+        """Disconnect from the server."""
+        self._receiver.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _receive(self):
+        """Read messages from the server, resolving replies and queueing frames."""
+        try:
+            while True:
+                kind, length = _HEADER.unpack(await self._reader.readexactly(_HEADER.size))
+                payload = await self._reader.readexactly(length)
+                if kind == REPLY:
+                    reply = json.loads(payload)
+                    future = self._pending.pop(reply.get("id"), None)
+                    if future is not None and not future.done():
+                        future.set_result(reply)
+                else:
+                    self.frames.put_nowait(decode_frame(kind, payload))
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Connection to the server was lost: {error}"))
+
+
+class BoardView:
+    """
+    Live cells of a viewport, kept up to date from the frames of a subscription.
+
+    Args:
+        viewport (tuple, optional): (left, top, right, bottom) the subscription was made with,
+            None when it covers the whole board.
+    """
+
+    def __init__(self, viewport=None):
+        self.viewport = viewport
+        self.cells = set()
+        self.generation = None
+        self.population = None
+
+    def apply(self, frame):
+        """Apply a DeltaFrame or replace the cells with those of a BitmapFrame."""
+        if isinstance(frame, BitmapFrame):
+            self.cells = set(frame.cells())
+        else:
+            self.cells.difference_update(frame.deaths)
+            self.cells.update(frame.births)
+        self.generation = frame.generation
+        self.population = frame.population
+
+
+async def demo(engine: str = DEFAULT_ENGINE, pattern: str = "acorn", rate: float = 30, seconds: float = 2.0):
+    """
+    Run a server and a client over the loopback interface: load a pattern, stream a run and
+    check that the streamed board matches a snapshot taken at the end.
+
+    Returns:
+        (dict) Frames received, the final generation and whether the boards matched.
+    """
+    server = SimulationServer()
+    await server.start(DEFAULT_HOST, 0)
+    client = await SimulationClient.connect(DEFAULT_HOST, server.port)
+    try:
+        await client.request("load", engine=engine, pattern=pattern, width=DEFAULT_SIZE, height=DEFAULT_SIZE)
+        await client.request("subscribe")
+        view = BoardView()
+        counts = {"delta": 0, "bitmap": 0}
+
+        async def watch():
+            while True:
+                frame = await client.next_frame()
+                counts["delta" if isinstance(frame, DeltaFrame) else "bitmap"] += 1
+                view.apply(frame)
+        watcher = asyncio.create_task(watch())
+        await client.request("run", rate=rate)
+        await asyncio.sleep(seconds)
+        status = await client.request("stop")
+        # frames already sent are still in flight
+        while view.generation != status["generation"]:
+            await asyncio.sleep(0.01)
+        watcher.cancel()
+
+        await client.request("snapshot")
+        snapshot = await client.next_frame(timeout=5)
+        return {"frames": counts, "generation": status["generation"], "population": status["population"],
+                "matched": set(snapshot.cells()) == view.cells}
+    finally:
+        await client.close()
+        await server.close()
+
+
+async def _serve(host, port, pattern_dir=None):
+    """Run a server until interrupted."""
+    server = SimulationServer(pattern_dir=pattern_dir)
+    await server.start(host, port)
+    print(f"Serving on {host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """Entry point of ``python -m core.server``."""
+    parser = argparse.ArgumentParser(prog="python -m core.server", description="Serve a Game of Life simulation.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (0 picks a free one)")
+    parser.add_argument("--pattern-dir", default=None,
+                        help="directory clients may load pattern files from (default: none)")
+    parser.add_argument("--demo", action="store_true", help="run a loopback client against a local server and exit")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default=DEFAULT_ENGINE, help="engine of the demo")
+    args = parser.parse_args(argv)
+
+    if args.demo:
+        print(json.dumps(asyncio.run(demo(args.engine))))
+        return
+    try:
+        asyncio.run(_serve(args.host, args.port, args.pattern_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
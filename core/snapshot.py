@@ -0,0 +1,129 @@
+"""
+
+This module defines read-only snapshots of a Game of Life board.
+A snapshot shares nothing mutable with the engine that produced it, so one thread
+can draw it while another thread keeps advancing the engine.
+
+Version: 1.2
+"""
+
+from core.density import count_blocks, density_bytes
+
+
+class CellStore:
+    """
+    Read-only copy of the live cells of an infinite grid, as kept by a Snapshot.
+
+    Engines subclass it for their own storage and implement ``cells_in_rect`` and ``bounding_box``.
+    Block populations come from ``pyramid`` (a PopulationPyramid, if the store has one) for levels
+    at or above its base level, and are counted from the cells inside the rectangle below it.
+    """
+    pyramid = None
+
+    def cells_in_rect(self, left: int, top: int, right: int, bottom: int):
+        """Yield live cells with left <= x < right and top <= y < bottom as (x, y) tuples."""
+        raise NotImplementedError
+
+    def bounding_box(self):
+        """Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty."""
+        raise NotImplementedError
+
+    def block_counts(self, level: int, left: int, top: int, right: int, bottom: int) -> dict:
+        """
+        Returns the populations of 2**level blocks, covering at least the given rectangle of blocks.
+
+        Args:
+            level (int): Block level.
+            left (int): Smallest block x-coordinate (inclusive).
+            top (int): Smallest block y-coordinate (inclusive).
+            right (int): Largest block x-coordinate (exclusive).
+            bottom (int): Largest block y-coordinate (exclusive).
+        """
+        if self.pyramid is not None and level >= self.pyramid.base_level:
+            return self.pyramid.counts(level)
+        return count_blocks(self.cells_in_rect(left << level, top << level, right << level, bottom << level), level)
+
+
+class Snapshot:
+    """
+    State of a game at one generation.
+
+    Fixed grids are captured as one byte per cell, infinite grids as a CellStore
+    holding a private copy of the engine's storage.
+
+    Args:
+        generation (int): Generation the snapshot was taken at.
+        population (int): Number of live cells.
+        width (int, optional): Width of a fixed grid, None on the infinite grid.
+        height (int, optional): Height of a fixed grid, None on the infinite grid.
+        cell_bytes (bytes, optional): Cells of a fixed grid, row by row (1 alive, 0 dead).
+        cells (CellStore, optional): Live cells of an infinite grid.
+
+    Attributes:
+        sequence (int): Number of the snapshot in the series published by its producer.
+        changes (frozenset): Cells that changed since the previous snapshot of the series,
+            or None when unknown (the whole board has to be redrawn).
+    """
+    __slots__ = ('generation', 'population', 'width', 'height', '_cell_bytes', '_cells', 'sequence', 'changes')
+
+    def __init__(self, generation: int, population: int, width: int = None, height: int = None,
+                 cell_bytes: bytes = None, cells: CellStore = None):
+        self.generation = generation
+        self.population = population
+        self.width = width
+        self.height = height
+        self._cell_bytes = cell_bytes
+        self._cells = cells
+        self.sequence = 0
+        self.changes = None
+
+    @property
+    def fixed(self) -> bool:
+        """Whether the snapshot was taken from a fixed-size grid."""
+        return self._cell_bytes is not None
+
+    def cell_bytes(self) -> bytes:
+        """
+        Returns the cells of a fixed grid, one byte per cell row by row.
+        """
+        return self._cell_bytes
+
+    def is_alive(self, x: int, y: int) -> bool:
+        """
+        Returns whether the cell at (x, y) is alive.
+        """
+        if self._cell_bytes is not None:
+            return 0 <= x < self.width and 0 <= y < self.height and bool(self._cell_bytes[y * self.width + x])
+        return any(True for _ in self.cells_in_rect(x, y, x + 1, y + 1))
+
+    def cells_in_rect(self, left: int, top: int, right: int, bottom: int):
+        """
+        Yield live cells with left <= x < right and top <= y < bottom as (x, y) tuples.
+        """
+        if self._cells is None:
+            return iter(())
+        return self._cells.cells_in_rect(left, top, right, bottom)
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells of an infinite grid, or None if empty.
+        """
+        if self._cells is None or not self.population:
+            return None
+        return self._cells.bounding_box()
+
+    def density(self, left: int, top: int, cols: int, rows: int, level: int) -> bytearray:
+        """
+        Returns the live fraction of a rectangle of 2**level blocks, one byte (0-255) per block.
+
+        Args:
+            left (int): Block x-coordinate of the first column.
+            top (int): Block y-coordinate of the first row.
+            cols (int): Number of block columns.
+            rows (int): Number of block rows.
+            level (int): Block level.
+        """
+        if self._cells is None:
+            return bytearray(cols * rows)
+        counts = self._cells.block_counts(level, left, top, left + cols, top + rows)
+        return density_bytes(counts, left, top, cols, rows, level)
@@ -0,0 +1,219 @@
+"""
+
+This module records per-generation statistics of a Game of Life run: population, births,
+deaths, bounding box of the live cells and the wall time of the step.
+
+The population is kept up to date from the birth and death counts of each generation's
+change set (see ``ChangeSet.counts``), which engines compute from their own data without
+building coordinate sets, so the board is only counted again after edits or multi-generation steps.
+The bounding box is only recorded on request, as engines may have to scan the board for it.
+Records go to a bounded ring buffer and, optionally, to a CSV or JSON lines sink.
+
+Version: 1.1
+"""
+
+import csv
+import json
+import os
+from collections import deque
+from itertools import islice
+
+from core.stepping import DEFAULT_MAX_PERIOD, run_steps
+
+DEFAULT_CAPACITY = 4096
+FIELDS = ("generation", "population", "births", "deaths", "left", "top", "right", "bottom", "seconds")
+
+
+class GenerationStats:
+    """
+    Statistics of one generation.
+
+    Attributes:
+        generation (int): Generation the record describes.
+        population (int): Number of live cells.
+        births (int): Cells born in this generation, None when several generations were computed at once.
+        deaths (int): Cells that died in this generation, None when several generations were computed at once.
+        bounds (tuple): (left, top, right, bottom) of the live cells, right and bottom exclusive,
+            or None when the board is empty or bounds are not tracked.
+        seconds (float): Wall time of computing the generation (the average over a multi-generation step).
+    """
+    __slots__ = ('generation', 'population', 'births', 'deaths', 'bounds', 'seconds')
+
+    def __init__(self, generation, population, births=None, deaths=None, bounds=None, seconds=None):
+        self.generation = generation
+        self.population = population
+        self.births = births
+        self.deaths = deaths
+        self.bounds = bounds
+        self.seconds = seconds
+
+    def as_dict(self) -> dict:
+        """
+        Returns the record as a flat dictionary with the keys in FIELDS.
+        """
+        left, top, right, bottom = self.bounds or (None, None, None, None)
+        return {"generation": self.generation, "population": self.population,
+                "births": self.births, "deaths": self.deaths,
+                "left": left, "top": top, "right": right, "bottom": bottom, "seconds": self.seconds}
+
+    def __repr__(self):
+        return (f"GenerationStats(generation={self.generation}, population={self.population}, "
+                f"births={self.births}, deaths={self.deaths}, bounds={self.bounds}, seconds={self.seconds})")
+
+
+class CsvSink:
+    """
+    Writes statistics records to a CSV file with a header row.
+
+    Args:
+        path (str): Path of the file, overwritten.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, FIELDS)
+        self._writer.writeheader()
+
+    def write(self, record: GenerationStats):
+        """Append one record."""
+        self._writer.writerow(record.as_dict())
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+
+class JsonLinesSink:
+    """
+    Writes statistics records to a file with one JSON object per line.
+
+    Args:
+        path (str): Path of the file, overwritten.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "w")
+
+    def write(self, record: GenerationStats):
+        """Append one record."""
+        self._file.write(json.dumps(record.as_dict()) + "\n")
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+
+def open_sink(path: str):
+    """
+    Open a statistics sink for a file, JSON lines for .jsonl and .json files and CSV otherwise.
+
+    Returns:
+        (CsvSink | JsonLinesSink) Sink writing to the file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    return JsonLinesSink(path) if extension in (".jsonl", ".json") else CsvSink(path)
+
+
+class StatsRecorder:
+    """
+    Collects the statistics of a game generation by generation.
+
+    Code that advances the game with ``next_generation`` passes the change set to ``record``;
+    multi-generation steps are summarized by ``record_steps``, and ``reset`` must be called after
+    the board was edited, so the incrementally maintained population is read from the engine again.
+    ``step`` advances a game like its own ``step`` while recording every generation.
+
+    Args:
+        capacity (int): Number of records kept in memory, older ones are dropped.
+        sink (CsvSink | JsonLinesSink, optional): Receives every record as it is made.
+        track_bounds (bool): Whether to record the bounding box of the live cells. The engine is asked
+            for it every generation, which scans the whole board on the list and NumPy engines.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, sink=None, track_bounds: bool = False):
+        self.records = deque(maxlen=capacity)
+        self.sink = sink
+        self.track_bounds = track_bounds
+        self._population = None
+
+    @property
+    def latest(self):
+        """Most recent record, None before the first one."""
+        return self.records[-1] if self.records else None
+
+    def reset(self, game):
+        """Read the population from the engine again, after the board was edited or replaced."""
+        self._population = game.population
+
+    def record(self, game, changes, seconds: float = None) -> GenerationStats:
+        """
+        Record a generation computed by ``next_generation``.
+
+        Args:
+            game: Game that advanced.
+            changes (ChangeSet): Change set returned by ``next_generation``.
+            seconds (float, optional): Wall time of the step.
+
+        Returns:
+            (GenerationStats) The new record.
+        """
+        births, deaths = changes.counts()
+        if self._population is None:
+            # first record: the population before this generation is not known
+            self._population = game.population
+        else:
+            self._population += births - deaths
+        return self._add(GenerationStats(game.generation, self._population, births, deaths,
+                                         self._bounds(game), seconds))
+
+    def record_steps(self, game, generations: int, seconds: float = None) -> GenerationStats:
+        """
+        Record a step over several generations, for which births and deaths are not known.
+
+        Args:
+            game: Game that advanced.
+            generations (int): Number of generations advanced.
+            seconds (float, optional): Wall time of the whole step.
+
+        Returns:
+            (GenerationStats) The new record.
+        """
+        self._population = game.population
+        average = seconds / generations if seconds is not None and generations else seconds
+        return self._add(GenerationStats(game.generation, self._population, bounds=self._bounds(game),
+                                         seconds=average))
+
+    def step(self, game, n: int = 1, detect_cycles: bool = False, max_period: int = DEFAULT_MAX_PERIOD):
+        """
+        Advance a game generation by generation, recording each one.
+
+        Returns:
+            (StepReport) Same report as ``game.step``.
+        """
+        if self._population is None:
+            self.reset(game)
+        return run_steps(game, n, detect_cycles, max_period,
+                         on_generation=lambda changes, seconds: self.record(game, changes, seconds))
+
+    def populations(self, n: int = None) -> list:
+        """
+        Returns the population of the last n records (all records by default), oldest first.
+        """
+        start = 0 if n is None else max(len(self.records) - n, 0)
+        return [record.population for record in islice(self.records, start, None)]
+
+    def close(self):
+        """Close the sink, if any."""
+        if self.sink is not None:
+            self.sink.close()
+
+    def _bounds(self, game):
+        """Bounding box of the live cells, if tracked."""
+        return game.bounding_box() if self.track_bounds else None
+
+    def _add(self, record: GenerationStats) -> GenerationStats:
+        """Store a record and pass it to the sink."""
+        self.records.append(record)
+        if self.sink is not None:
+            self.sink.write(record)
+        return record
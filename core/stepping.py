@@ -0,0 +1,131 @@
+"""
+
+This module implements multi-generation stepping shared by all Game of Life engines.
+While stepping, the state of the board can be hashed every generation to detect
+extinction, still lifes, oscillators and (on the infinite grid) spaceships,
+so long runs stop as soon as the pattern becomes periodic.
+
+Version: 1.1
+"""
+
+import time
+from collections import deque
+
+RUNNING = "running"
+EXTINCT = "extinct"
+STILL_LIFE = "still life"
+OSCILLATOR = "oscillator"
+SPACESHIP = "spaceship"
+
+DEFAULT_MAX_PERIOD = 1000
+
+
+class StepReport:
+    """
+    Result of a multi-generation step.
+
+    Attributes:
+        generations (int): Number of generations actually advanced.
+        generation (int): Generation of the board after stepping.
+        status (str): One of RUNNING, EXTINCT, STILL_LIFE, OSCILLATOR or SPACESHIP.
+        period (int): Period of the detected cycle (0 while running or extinct).
+        displacement (tuple): (dx, dy) travelled per period by a spaceship, otherwise None.
+    """
+
+    def __init__(self, generations, generation, status=RUNNING, period=0, displacement=None):
+        self.generations = generations
+        self.generation = generation
+        self.status = status
+        self.period = period
+        self.displacement = displacement
+
+    @property
+    def stabilized(self) -> bool:
+        """Whether the run ended early because the pattern died out or became periodic."""
+        return self.status != RUNNING
+
+    def __repr__(self):
+        return (f"StepReport(generations={self.generations}, generation={self.generation}, "
+                f"status={self.status!r}, period={self.period}, displacement={self.displacement})")
+
+
+def run_steps(game, n: int, detect_cycles: bool = False, max_period: int = DEFAULT_MAX_PERIOD,
+              on_generation=None) -> StepReport:
+    """
+    Advance a game by up to ``n`` generations.
+
+    Without cycle detection the engine's ``_step_many`` is used, which lets engines skip
+    per-generation overhead (Hashlife jumps straight to the target generation).
+    With cycle detection the state is hashed after every generation and stepping stops
+    as soon as the board is empty or repeats a state seen in the last ``max_period`` generations.
+    Games with a history (see core.history) report the generations they reached to it.
+    With ``on_generation`` every generation is computed on its own with ``next_generation``.
+
+    Args:
+        game: GameOfLife or InfiniteGameOfLife instance.
+        n (int): Maximum number of generations to advance.
+        detect_cycles (bool): Whether to stop early on extinction or periodic behavior.
+        max_period (int): Longest period that can be detected.
+        on_generation (callable, optional): Called after every generation with its ChangeSet
+            and the seconds it took to compute.
+
+    Returns:
+        (StepReport) What happened during the run.
+    """
+    if n < 0:
+        raise ValueError("Cannot step a negative number of generations")
+
+    if on_generation is None:
+        advance = game._step_many
+    else:
+        def advance(generations):
+            for _ in range(generations):
+                start = time.perf_counter()
+                changes = game.next_generation()
+                on_generation(changes, time.perf_counter() - start)
+
+    report = _run(game, n, detect_cycles, max_period, advance)
+    if game.history is not None:
+        game.history.advanced(game)
+    return report
+
+
+def _run(game, n, detect_cycles, max_period, advance):
+    """Advance a game with ``advance(generations)`` as described in run_steps and return the StepReport."""
+    start = game.generation
+    if not detect_cycles:
+        advance(n)
+        return StepReport(game.generation - start, game.generation)
+
+    if game.population == 0:
+        return StepReport(0, game.generation, EXTINCT)
+
+    seen = {}
+    order = deque()
+
+    def remember(generation):
+        key, offset = game._state_key()
+        previous = seen.get(key)
+        seen[key] = (generation, offset)
+        order.append(key)
+        if len(order) > max_period:
+            del seen[order.popleft()]
+        return previous, offset
+
+    remember(game.generation)
+    for _ in range(n):
+        advance(1)
+        if game.population == 0:
+            return StepReport(game.generation - start, game.generation, EXTINCT)
+
+        previous, offset = remember(game.generation)
+        if previous is not None:
+            previous_generation, previous_offset = previous
+            period = game.generation - previous_generation
+            if offset != previous_offset:
+                displacement = game._displacement(previous_offset, offset)
+                return StepReport(game.generation - start, game.generation, SPACESHIP, period, displacement)
+            status = STILL_LIFE if period == 1 else OSCILLATOR
+            return StepReport(game.generation - start, game.generation, status, period)
+
+    return StepReport(game.generation - start, game.generation)
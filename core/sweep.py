@@ -0,0 +1,307 @@
+"""
+
+This module implements parameter sweeps over rules and random soups.
+Every combination of rule, board size, soup density and seed is one case; cases run
+in parallel on a process pool, each until the board dies out or becomes periodic or a
+generation cap is reached, and every result is appended to a CSV table as soon as it is known.
+Running the same sweep again with the same output file skips the cases already in it,
+so an interrupted sweep picks up where it stopped.
+
+Rules are given in B/S notation or as the overpop,underpop,repro triple of ``set_custom_rules``.
+
+Usage::
+
+    python -m core.sweep --rules B3/S23 B36/S23 3,1,3 --sizes 64 128 --densities 0.2 0.35 0.5 --seeds 0-99
+    python -m core.sweep --rules 3,2,3 4,2,3 --seeds 0-999 --generations 20000 --output sweep.csv --workers 8
+
+Version: 1.2
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from core.engines import ENGINES, FIXED_ENGINES, close_game, create_game
+from core.rules import Rule
+from core.stepping import DEFAULT_MAX_PERIOD, RUNNING
+
+DEFAULT_ENGINE = "bitboard"
+DEFAULT_GENERATIONS = 5000
+FIELDS = ("rule", "size", "density", "seed", "engine", "wrap", "max_generations", "max_period", "status",
+          "lifespan", "period", "final_population", "generations", "seconds")
+# columns identifying a run, a row with the same values means the case is done
+KEY_FIELDS = ("rule", "size", "density", "seed", "engine", "wrap", "max_generations", "max_period")
+
+_TRIPLE_PATTERN = re.compile(r"^(\d),(\d),(\d)$")
+
+
+def parse_rule(text: str) -> Rule:
+    """
+    Parse a rule given in B/S notation or as an overpop,underpop,repro triple.
+
+    Args:
+        text (str): Rule such as "B36/S23" or "3,2,3" (the triple of ``set_custom_rules``).
+
+    Returns:
+        (Rule) Parsed rule.
+    """
+    match = _TRIPLE_PATTERN.match(text.replace(" ", ""))
+    if match:
+        overpop, underpop, repro = (int(group) for group in match.groups())
+        return Rule.from_limits(underpop, overpop, repro)
+    return Rule.parse(text)
+
+
+def parse_seeds(values) -> list:
+    """
+    Expand seeds given as numbers or inclusive ranges such as "0-99".
+
+    Returns:
+        (list) Seeds in the given order.
+    """
+    seeds = []
+    for value in values:
+        first, _, last = str(value).partition("-")
+        seeds.extend(range(int(first), int(last or first) + 1))
+    return seeds
+
+
+class SweepCase:
+    """
+    One run of a sweep: a random soup of a given density on a square board under a rule.
+
+    Args:
+        rule (Rule | str): Rule of the run.
+        size (int): Side of the board (fixed engines) or of the soup square (infinite engines).
+        density (float): Probability of each cell of the soup being alive.
+        seed (int): Seed of the soup.
+    """
+    __slots__ = ('rule', 'size', 'density', 'seed')
+
+    def __init__(self, rule, size: int, density: float, seed: int):
+        self.rule = parse_rule(rule) if isinstance(rule, str) else rule
+        self.size = size
+        self.density = density
+        self.seed = seed
+
+    def key(self, engine: str, wrap: bool, generations: int, max_period: int) -> tuple:
+        """Values of KEY_FIELDS of a run of the case, as they are written to the results table."""
+        return (str(self.rule), str(self.size), str(self.density), str(self.seed), engine, str(wrap),
+                str(generations), str(max_period))
+
+    def __repr__(self):
+        return f"SweepCase({str(self.rule)!r}, size={self.size}, density={self.density}, seed={self.seed})"
+
+
+def sweep_cases(rules, sizes, densities, seeds) -> list:
+    """
+    Build the cases of every combination of the parameters.
+
+    Returns:
+        (list) SweepCase objects, rules varying slowest and seeds fastest.
+    """
+    # the same rule written in two notations is run once
+    rules = list(dict.fromkeys(parse_rule(rule) if isinstance(rule, str) else rule for rule in rules))
+    return [SweepCase(rule, size, density, seed) for rule, size, density, seed in product(rules, sizes, densities, seeds)]
+
+
+def run_case(case: SweepCase, engine: str = DEFAULT_ENGINE, wrap: bool = False,
+             generations: int = DEFAULT_GENERATIONS, max_period: int = DEFAULT_MAX_PERIOD) -> dict:
+    """
+    Run one case until the board dies out or becomes periodic, or for at most ``generations``.
+
+    The lifespan is the generation at which the board died out or entered its cycle;
+    it is None (and the status "running") when the cap was reached first.
+
+    Returns:
+        (dict) Result with the keys in FIELDS.
+    """
+    game = create_game(engine, case.size, case.size, wrap)
+    try:
+        game.set_rule(case.rule)
+        game.randomize(case.density, case.seed, (0, 0, case.size, case.size))
+        start = time.perf_counter()
+        report = game.step(generations, detect_cycles=True, max_period=max_period)
+        elapsed = time.perf_counter() - start
+        population = game.population
+    finally:
+        close_game(game)
+
+    # a cycle is detected one period after the board first reached the repeated state
+    lifespan = None if report.status == RUNNING else report.generations - report.period
+    return {
+        "rule": str(case.rule),
+        "size": case.size,
+        "density": case.density,
+        "seed": case.seed,
+        "engine": engine,
+        "wrap": wrap,
+        "max_generations": generations,
+        "max_period": max_period,
+        "status": report.status,
+        "lifespan": lifespan,
+        "period": report.period,
+        "final_population": population,
+        "generations": report.generations,
+        "seconds": elapsed,
+    }
+
+
+def read_results(path: str) -> list:
+    """
+    Read the results table written by a previous sweep.
+
+    A row cut short by an interrupted write is dropped, and the file is truncated
+    after the last complete row, so appending to it continues the table cleanly.
+
+    Returns:
+        (list) Rows as dictionaries of strings, empty if the file does not exist.
+
+    Raises:
+        ValueError: The table has other columns than FIELDS.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is not None and tuple(reader.fieldnames) != FIELDS:
+            raise ValueError(f"{path} has other columns than this sweep writes, use another output file")
+        return [row for row in reader if None not in row.values()]
+
+
+def run_sweep(cases, output: str, engine: str = DEFAULT_ENGINE, wrap: bool = False,
+              generations: int = DEFAULT_GENERATIONS, max_period: int = DEFAULT_MAX_PERIOD,
+              workers: int = None, progress=None) -> list:
+    """
+    Run the cases that are not in the results table yet with the same settings and append their results to it.
+
+    Args:
+        cases: SweepCase objects to run.
+        output (str): Path of the CSV results table, created if missing.
+        engine (str): Engine to run the cases with, one of ``ENGINES``.
+        wrap (bool): Whether the board wraps around the edges (fixed engines only).
+        generations (int): Generation cap of every case.
+        max_period (int): Longest cycle that is detected.
+        workers (int, optional): Number of worker processes, by default one per CPU.
+        progress (callable, optional): Called with (result, done, total) after every finished case.
+
+    Returns:
+        (list) Results of the cases run now, in the order they finished.
+    """
+    done = {tuple(row[field] for field in KEY_FIELDS) for row in read_results(output)}
+    # a case run with other settings (engine, wrap, caps) is run again
+    pending = [case for case in cases if case.key(engine, wrap, generations, max_period) not in done]
+    results = []
+    if not pending:
+        return results
+
+    new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+    with open(output, "a", newline="") as f, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(f, FIELDS)
+        if new_file:
+            writer.writeheader()
+        futures = [executor.submit(run_case, case, engine, wrap, generations, max_period) for case in pending]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                writer.writerow(result)
+                # flushed row by row, so an interruption loses at most the cases still running
+                f.flush()
+                results.append(result)
+                if progress is not None:
+                    progress(result, len(results), len(pending))
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    return results
+
+
+def summarize(rows) -> list:
+    """
+    Summarize results per rule.
+
+    Args:
+        rows: Results as returned by ``run_sweep`` or ``read_results``.
+
+    Returns:
+        (list) Dictionaries with rule, cases, stabilized (share of cases that died out or became periodic),
+        mean_lifespan and max_lifespan (over the stabilized cases), sorted by mean lifespan, longest first.
+    """
+    by_rule = {}
+    for row in rows:
+        lifespan = row["lifespan"]
+        by_rule.setdefault(row["rule"], []).append(int(lifespan) if lifespan not in (None, "") else None)
+
+    summary = []
+    for rule, lifespans in by_rule.items():
+        finished = [lifespan for lifespan in lifespans if lifespan is not None]
+        summary.append({
+            "rule": rule,
+            "cases": len(lifespans),
+            "stabilized": len(finished) / len(lifespans),
+            "mean_lifespan": sum(finished) / len(finished) if finished else None,
+            "max_lifespan": max(finished) if finished else None,
+        })
+    summary.sort(key=lambda item: item["mean_lifespan"] or 0, reverse=True)
+    return summary
+
+
+def main(argv=None):
+    """Entry point of ``python -m core.sweep``."""
+    parser = argparse.ArgumentParser(prog="python -m core.sweep",
+                                     description="Run random soups across rules, sizes, densities and seeds.")
+    parser.add_argument("--rules", nargs="+", default=["B3/S23"],
+                        help="rules in B/S notation or as overpop,underpop,repro triples, e.g. 3,2,3")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[64], help="board sizes in cells")
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.35], help="soup densities")
+    parser.add_argument("--seeds", nargs="+", default=["0-9"], help="seeds or inclusive ranges, e.g. 0-99")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default=DEFAULT_ENGINE, help="simulation engine")
+    parser.add_argument("--wrap", action="store_true", help="wrap board edges (fixed engines)")
+    parser.add_argument("--generations", type=int, default=DEFAULT_GENERATIONS, help="generation cap of each case")
+    parser.add_argument("--max-period", type=int, default=DEFAULT_MAX_PERIOD, help="longest cycle detected")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--output", default="sweep.csv", help="CSV results table, resumed if it exists")
+    args = parser.parse_args(argv)
+
+    if args.wrap and args.engine not in FIXED_ENGINES:
+        parser.error("--wrap needs a fixed-size engine")
+    cases = sweep_cases(args.rules, args.sizes, args.densities, parse_seeds(args.seeds))
+    if args.engine not in FIXED_ENGINES:
+        # checked before any case runs, the engine would reject them in a worker process
+        filling = sorted({str(case.rule) for case in cases if 0 in case.rule.birth})
+        if filling:
+            parser.error(f"rules with birth on 0 neighbors fill the infinite plane, "
+                         f"use a fixed-size engine for {', '.join(filling)}")
+
+    def progress(result, done, total):
+        lifespan = result["lifespan"] if result["lifespan"] is not None else "-"
+        print(f"[{done}/{total}] {result['rule']:<16} size {result['size']:<5} density {result['density']:<5} "
+              f"seed {result['seed']:<6} {result['status']:<11} lifespan {lifespan}")
+
+    skipped = len(cases) - len(run_sweep(cases, args.output, args.engine, args.wrap, args.generations,
+                                         args.max_period, args.workers, progress))
+    if skipped:
+        print(f"{skipped} of {len(cases)} cases were already in {args.output}")
+
+    print(f"{'rule':<16}{'cases':>8}{'stabilized':>12}{'mean lifespan':>16}{'max lifespan':>14}")
+    settings = {"engine": args.engine, "wrap": str(args.wrap), "max_generations": str(args.generations),
+                "max_period": str(args.max_period)}
+    rows = [row for row in read_results(args.output) if all(row[key] == value for key, value in settings.items())]
+    for item in summarize(rows):
+        mean = f"{item['mean_lifespan']:.1f}" if item["mean_lifespan"] is not None else "-"
+        print(f"{item['rule']:<16}{item['cases']:>8}{item['stabilized']:>12.0%}{mean:>16}"
+              f"{item['max_lifespan'] if item['max_lifespan'] is not None else '-':>14}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
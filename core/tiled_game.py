@@ -0,0 +1,500 @@
+"""
+
+This module defines a tile-based version of the infinite Game of Life grid.
+The plane is split into 64x64 tiles, each stored as a single packed integer
+(bit ``y * 64 + x`` holds the cell at local coordinates x, y) in a dictionary keyed by tile coordinates.
+A tile is only recomputed when it, or one of its eight neighbors, changed in the previous generation,
+and tiles that become empty are freed.
+
+Version: 1.0
+"""
+
+from collections.abc import MutableSet
+from functools import lru_cache
+
+from core.bitboard_game import apply_rule, count_planes
+from core.infinite_game import InfiniteGameOfLife, as_pairs, pack_cell, unpack_cell
+from core.changes import NO_CHANGES, ChangeSet
+from core.density import PopulationPyramid
+from core.profiling import RULE, SWAP, phase
+from core.snapshot import CellStore, Snapshot
+
+TILE_SHIFT = 6
+TILE_SIZE = 1 << TILE_SHIFT
+_LOCAL_MASK = TILE_SIZE - 1
+_LAST_ROW_SHIFT = TILE_SIZE * (TILE_SIZE - 1)
+
+_ROW_MASK = (1 << TILE_SIZE) - 1
+_TILE_MASK = (1 << TILE_SIZE * TILE_SIZE) - 1
+_FIRST_COLUMN = sum(1 << (row * TILE_SIZE) for row in range(TILE_SIZE))
+_LAST_COLUMN = _FIRST_COLUMN << (TILE_SIZE - 1)
+_NOT_FIRST_COLUMN = _TILE_MASK ^ _FIRST_COLUMN
+_NOT_LAST_COLUMN = _TILE_MASK ^ _LAST_COLUMN
+
+_NEIGHBOR_TILES = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+
+
+def _rect_mask(x0, x1, y0, y1):
+    """Packed tile mask selecting local columns x0 <= x < x1 of rows y0 <= y < y1."""
+    row = ((1 << x1) - 1) ^ ((1 << x0) - 1)
+    return sum(row << (y * TILE_SIZE) for y in range(y0, y1))
+
+
+def tiles_in_rect(tiles, left, top, right, bottom):
+    """
+    Yield the (x, y) coordinates of live cells of a tile dictionary inside a rectangle.
+
+    Only tiles overlapping the rectangle are visited, and tiles crossing its border
+    are masked down to the covered part before their bits are extracted.
+
+    Args:
+        tiles (dict): Packed tiles keyed by tile coordinates.
+        left (int): Smallest x-coordinate (inclusive).
+        top (int): Smallest y-coordinate (inclusive).
+        right (int): Largest x-coordinate (exclusive).
+        bottom (int): Largest y-coordinate (exclusive).
+    """
+    if right <= left or bottom <= top:
+        return
+    tx0, ty0 = left >> TILE_SHIFT, top >> TILE_SHIFT
+    tx1, ty1 = (right - 1) >> TILE_SHIFT, (bottom - 1) >> TILE_SHIFT
+
+    if (tx1 - tx0 + 1) * (ty1 - ty0 + 1) < len(tiles):
+        keys = [(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1) if tiles.get((tx, ty))]
+    else:
+        keys = [(tx, ty) for tx, ty in tiles if tx0 <= tx <= tx1 and ty0 <= ty <= ty1]
+
+    for tx, ty in keys:
+        tile = tiles[tx, ty]
+        base_x, base_y = tx << TILE_SHIFT, ty << TILE_SHIFT
+        if tx in (tx0, tx1) or ty in (ty0, ty1):
+            tile &= _rect_mask(max(left - base_x, 0), min(right - base_x, TILE_SIZE),
+                               max(top - base_y, 0), min(bottom - base_y, TILE_SIZE))
+        while tile:
+            lowest = tile & -tile
+            bit = lowest.bit_length() - 1
+            yield base_x + (bit & _LOCAL_MASK), base_y + (bit >> TILE_SHIFT)
+            tile ^= lowest
+
+
+def _columns(tile):
+    """Fold all rows of a tile into one row, so bit x is set if any cell of column x is alive."""
+    shift = TILE_SIZE * TILE_SIZE
+    while shift > TILE_SIZE:
+        shift >>= 1
+        tile |= tile >> shift
+    return tile & _ROW_MASK
+
+
+def tiles_bounding_box(tiles):
+    """
+    Returns (left, top, right, bottom) of the live cells of a tile dictionary, or None if empty.
+
+    Only the tiles on the outer edges are inspected bit by bit.
+    """
+    if not tiles:
+        return None
+    min_tx = min(tx for tx, _ in tiles)
+    max_tx = max(tx for tx, _ in tiles)
+    min_ty = min(ty for _, ty in tiles)
+    max_ty = max(ty for _, ty in tiles)
+
+    left_columns = right_columns = 0
+    top_row, bottom_row = TILE_SIZE, -1
+    for (tx, ty), tile in tiles.items():
+        if tx == min_tx:
+            left_columns |= _columns(tile)
+        if tx == max_tx:
+            right_columns |= _columns(tile)
+        if ty == min_ty:
+            top_row = min(top_row, ((tile & -tile).bit_length() - 1) >> TILE_SHIFT)
+        if ty == max_ty:
+            bottom_row = max(bottom_row, (tile.bit_length() - 1) >> TILE_SHIFT)
+
+    return ((min_tx << TILE_SHIFT) + (left_columns & -left_columns).bit_length() - 1,
+            (min_ty << TILE_SHIFT) + top_row,
+            (max_tx << TILE_SHIFT) + right_columns.bit_length(),
+            (max_ty << TILE_SHIFT) + bottom_row + 1)
+
+
+@lru_cache(maxsize=None)
+def _block_masks(level):
+    """Masks of the 2**level blocks of a tile, as (local block x, local block y, mask) tuples."""
+    size = 1 << level
+    row = (1 << size) - 1
+    block = sum(row << (y * TILE_SIZE) for y in range(size))
+    blocks = TILE_SIZE >> level
+    return tuple((bx, by, block << (by * size * TILE_SIZE + bx * size))
+                 for by in range(blocks) for bx in range(blocks))
+
+
+def tiles_block_counts(tiles, level, left, top, right, bottom):
+    """
+    Count live cells per 2**level block (level below TILE_SHIFT) within a rectangle of blocks.
+
+    Tiles with more live cells than blocks are counted block by block with masks,
+    sparser tiles cell by cell.
+
+    Returns:
+        (dict) Block populations keyed by block coordinates.
+    """
+    shift = TILE_SHIFT - level
+    counts = {}
+    get = counts.get
+    # tiles touched by the rectangle, their blocks outside it are skipped by the caller
+    tx0, ty0 = left >> shift, top >> shift
+    tx1, ty1 = (right - 1) >> shift, (bottom - 1) >> shift
+    masks = _block_masks(level)
+
+    for (tx, ty), tile in tiles.items():
+        if not (tx0 <= tx <= tx1 and ty0 <= ty <= ty1):
+            continue
+        base_x, base_y = tx << shift, ty << shift
+        if bin(tile).count("1") > len(masks):
+            for bx, by, mask in masks:
+                if tile & mask:
+                    counts[base_x + bx, base_y + by] = bin(tile & mask).count("1")
+        else:
+            while tile:
+                lowest = tile & -tile
+                bit = lowest.bit_length() - 1
+                key = (base_x + ((bit & _LOCAL_MASK) >> level), base_y + (bit >> (TILE_SHIFT + level)))
+                counts[key] = get(key, 0) + 1
+                tile ^= lowest
+    return counts
+
+
+def _tile_changes(tiles, other_tiles):
+    """Yield (x, y) of cells alive in tiles but not in other_tiles (both keyed by the same tiles)."""
+    for (tx, ty), tile in tiles.items():
+        only = tile & ~other_tiles[tx, ty]
+        base_x, base_y = tx << TILE_SHIFT, ty << TILE_SHIFT
+        while only:
+            lowest = only & -only
+            bit = lowest.bit_length() - 1
+            yield base_x + (bit & _LOCAL_MASK), base_y + (bit >> TILE_SHIFT)
+            only ^= lowest
+
+
+class FrozenTiles(CellStore):
+    """
+    Read-only copy of the tiles of a TiledGameOfLife, kept by its snapshots.
+
+    Block populations of levels at or above the tile size start from the population of each tile.
+
+    Args:
+        tiles (dict): Packed tiles keyed by tile coordinates (copied by the caller).
+    """
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self.pyramid = PopulationPyramid(TILE_SHIFT, lambda: {key: bin(tile).count("1")
+                                                              for key, tile in tiles.items()})
+
+    def cells_in_rect(self, left, top, right, bottom):
+        return tiles_in_rect(self.tiles, left, top, right, bottom)
+
+    def block_counts(self, level, left, top, right, bottom):
+        if level >= TILE_SHIFT:
+            return self.pyramid.counts(level)
+        return tiles_block_counts(self.tiles, level, left, top, right, bottom)
+
+    def bounding_box(self):
+        return tiles_bounding_box(self.tiles)
+
+
+class TileCellsView(MutableSet):
+    """
+    Set-like view of the live cells of a TiledGameOfLife as (x, y) tuples.
+
+    Edits made through the view mark the affected tile as changed.
+    """
+
+    def __init__(self, game):
+        self._game = game
+
+    def __contains__(self, cell):
+        x, y = cell
+        tile = self._game.tiles.get((x >> TILE_SHIFT, y >> TILE_SHIFT), 0)
+        return bool(tile >> ((y & _LOCAL_MASK) * TILE_SIZE + (x & _LOCAL_MASK)) & 1)
+
+    def __iter__(self):
+        for (tx, ty), tile in list(self._game.tiles.items()):
+            base_x, base_y = tx << TILE_SHIFT, ty << TILE_SHIFT
+            while tile:
+                lowest = tile & -tile
+                bit = lowest.bit_length() - 1
+                yield base_x + (bit & _LOCAL_MASK), base_y + (bit >> TILE_SHIFT)
+                tile ^= lowest
+
+    def __len__(self):
+        return self._game.population
+
+    def add(self, cell):
+        self._game.set_cell(*cell, True)
+
+    def discard(self, cell):
+        self._game.set_cell(*cell, False)
+
+    def __repr__(self):
+        return f"TileCellsView({set(self)!r})"
+
+
+class TiledGameOfLife(InfiniteGameOfLife):
+    """
+    Infinite Game of Life that stores the plane as dense 64x64 tiles.
+
+    Drop-in replacement for InfiniteGameOfLife: ``live_cells`` is a set-like view
+    of (x, y) tuples, so the GUI canvas and other callers work unchanged.
+    Each tile is advanced with bit-sliced adders over the whole packed tile at once,
+    and stable regions of the plane cost nothing per generation.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tiles = {}
+        self._changed = set()
+        self._swept_rule = None
+
+    @property
+    def live_cells(self):
+        """Set-like view of live cells as (x, y) tuples."""
+        return TileCellsView(self)
+
+    @live_cells.setter
+    def live_cells(self, cells):
+        self.tiles = {}
+        self._changed = set()
+        for x, y in cells:
+            self.set_cell(x, y, True)
+
+    @property
+    def packed_cells(self):
+        """Copy of the live cells as a set of packed integer keys."""
+        return {pack_cell(x, y) for x, y in self.live_cells}
+
+    @packed_cells.setter
+    def packed_cells(self, cells):
+        self.live_cells = (unpack_cell(key) for key in cells)
+
+    @property
+    def population(self) -> int:
+        """Number of live cells."""
+        return sum(bin(tile).count("1") for tile in self.tiles.values())
+
+    def set_cell(self, x, y, alive=True):
+        """
+        Set the state of a single cell.
+
+        Args:
+            x (int): X-coordinate of the cell.
+            y (int): Y-coordinate of the cell.
+            alive (bool): New state of the cell.
+        """
+        key = (x >> TILE_SHIFT, y >> TILE_SHIFT)
+        bit = 1 << ((y & _LOCAL_MASK) * TILE_SIZE + (x & _LOCAL_MASK))
+        tile = self.tiles.get(key, 0)
+        tile = tile | bit if alive else tile & ~bit
+        self._store(key, tile)
+        self._changed.add(key)
+
+    def set_cells(self, cells, alive=True):
+        """
+        Set the state of many cells, applying one mask per touched tile.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+            alive (bool): New state of the cells.
+        """
+        for key, mask in self._tile_masks(cells).items():
+            tile = self.tiles.get(key, 0)
+            self._store(key, tile | mask if alive else tile & ~mask)
+            self._changed.add(key)
+
+    def toggle_cells(self, cells):
+        """
+        Toggle the state of many cells, each distinct cell once.
+
+        Args:
+            cells: Iterable of (x, y) coordinates, or an integer array of shape (n, 2).
+        """
+        for key, mask in self._tile_masks(cells).items():
+            self._store(key, self.tiles.get(key, 0) ^ mask)
+            self._changed.add(key)
+
+    def set_rows(self, rows):
+        """
+        Make cells alive from packed rows, cut at tile borders into 64-bit pieces of tile rows.
+
+        Args:
+            rows: Iterable of (x, y, bits) tuples, where bit i of bits is the cell at (x + i, y).
+        """
+        for x, y, bits in rows:
+            ty, row_shift = y >> TILE_SHIFT, (y & _LOCAL_MASK) * TILE_SIZE
+            tx = x >> TILE_SHIFT
+            # align the row so that bit 0 is the first column of tile tx
+            bits <<= x & _LOCAL_MASK
+            while bits:
+                piece = bits & _ROW_MASK
+                if piece:
+                    self.tiles[tx, ty] = self.tiles.get((tx, ty), 0) | piece << row_shift
+                    self._changed.add((tx, ty))
+                bits >>= TILE_SIZE
+                tx += 1
+
+    def fill_rect(self, left, top, right, bottom, alive=True):
+        """
+        Set the state of every cell with left <= x < right and top <= y < bottom, one tile at a time.
+
+        Clearing only visits the tiles that exist inside the rectangle, so it is cheap for any size.
+        """
+        if right <= left or bottom <= top:
+            return
+        tx0, ty0 = left >> TILE_SHIFT, top >> TILE_SHIFT
+        tx1, ty1 = (right - 1) >> TILE_SHIFT, (bottom - 1) >> TILE_SHIFT
+        if alive:
+            keys = [(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+        else:
+            keys = [(tx, ty) for tx, ty in self.tiles if tx0 <= tx <= tx1 and ty0 <= ty <= ty1]
+
+        for tx, ty in keys:
+            base_x, base_y = tx << TILE_SHIFT, ty << TILE_SHIFT
+            if left <= base_x and base_x + TILE_SIZE <= right and top <= base_y and base_y + TILE_SIZE <= bottom:
+                mask = _TILE_MASK
+            else:
+                mask = _rect_mask(max(left - base_x, 0), min(right - base_x, TILE_SIZE),
+                                  max(top - base_y, 0), min(bottom - base_y, TILE_SIZE))
+            tile = self.tiles.get((tx, ty), 0)
+            self._store((tx, ty), tile | mask if alive else tile & ~mask)
+            self._changed.add((tx, ty))
+
+    @staticmethod
+    def _tile_masks(cells):
+        """
+        Group cells by tile.
+
+        Returns:
+            (dict) Packed mask of the cells of each tile, keyed by tile coordinates.
+        """
+        masks = {}
+        for x, y in as_pairs(cells):
+            key = (x >> TILE_SHIFT, y >> TILE_SHIFT)
+            masks[key] = masks.get(key, 0) | 1 << ((y & _LOCAL_MASK) * TILE_SIZE + (x & _LOCAL_MASK))
+        return masks
+
+    def cells_in_rect(self, left, top, right, bottom):
+        """
+        Yield live cells with left <= x < right and top <= y < bottom as (x, y) tuples.
+
+        Used by the GUI to draw only the visible part of the plane.
+        """
+        return tiles_in_rect(self.tiles, left, top, right, bottom)
+
+    def snapshot(self):
+        """Returns a read-only copy of the current state that other threads can draw."""
+        # tiles are immutable integers, copying the dictionary is enough
+        tiles = dict(self.tiles)
+        return Snapshot(self.generation, self.population, cells=FrozenTiles(tiles))
+
+    def bounding_box(self):
+        """
+        Returns (left, top, right, bottom) of the live cells, right and bottom exclusive, or None if empty.
+        """
+        return tiles_bounding_box(self.tiles)
+
+    def toggle_cell(self, x, y):
+        """Toggle cell state at given coordinates."""
+        self.set_cell(x, y, (x, y) not in self.live_cells)
+
+    def next_generation(self):
+        """
+        Calculate the next generation, recomputing only tiles next to last generation's changes.
+
+        Returns:
+            (ChangeSet) Cells born and died in this generation.
+        """
+        if not self.tiles:
+            return NO_CHANGES
+
+        survive, birth = self.rule.survival, self.rule.birth
+        if self.rule != self._swept_rule:
+            # results of stable tiles were computed under the old rules
+            self._changed.update(self.tiles)
+            self._swept_rule = self.rule
+
+        candidates = {(tx + dx, ty + dy) for tx, ty in self._changed for dx, dy in _NEIGHBOR_TILES}
+        updates = {}
+        # neighbor planes and the rule are computed together tile by tile
+        with phase(RULE):
+            for key in candidates:
+                new_tile = self._advance_tile(key, survive, birth)
+                if new_tile != self.tiles.get(key, 0):
+                    updates[key] = new_tile
+
+        with phase(SWAP):
+            previous = {key: self.tiles.get(key, 0) for key in updates}
+            for key, tile in updates.items():
+                self._store(key, tile)
+        self._changed = set(updates)
+        self.generation += 1
+        return ChangeSet(lambda: (_tile_changes(updates, previous), _tile_changes(previous, updates)),
+                         lambda: sum(bin(updates[key] ^ previous[key]).count("1") for key in updates),
+                         lambda: (sum(bin(updates[key] & ~previous[key]).count("1") for key in updates),
+                                  sum(bin(previous[key] & ~updates[key]).count("1") for key in updates)))
+
+    def clear(self):
+        """Clear the grid and reset generation counter."""
+        self.tiles = {}
+        self._changed = set()
+        self.generation = 0
+
+    def _store(self, key, tile):
+        """Store a tile, freeing it if it became empty."""
+        if tile:
+            self.tiles[key] = tile
+        else:
+            self.tiles.pop(key, None)
+
+    def _advance_tile(self, key, survive, birth):
+        """
+        Compute the next state of one tile from itself and its eight neighbors.
+
+        Returns:
+            (int) Packed next state of the tile.
+        """
+        tx, ty = key
+        get = self.tiles.get
+        tile = get(key, 0)
+        north, south = get((tx, ty - 1), 0), get((tx, ty + 1), 0)
+        west, east = get((tx - 1, ty), 0), get((tx + 1, ty), 0)
+        north_west, north_east = get((tx - 1, ty - 1), 0), get((tx + 1, ty - 1), 0)
+        south_west, south_east = get((tx - 1, ty + 1), 0), get((tx + 1, ty + 1), 0)
+
+        if not (tile or north or south or west or east
+                or north_west or north_east or south_west or south_east):
+            return 0
+
+        # neighbor on the left/right of every cell, taking edge columns from the adjacent tiles
+        left = ((tile << 1) & _NOT_FIRST_COLUMN) | ((west & _LAST_COLUMN) >> (TILE_SIZE - 1))
+        right = ((tile >> 1) & _NOT_LAST_COLUMN) | ((east & _FIRST_COLUMN) << (TILE_SIZE - 1))
+
+        # the same three planes for the row just above and just below the tile
+        north_row = north >> _LAST_ROW_SHIFT
+        north_left = ((north_row << 1) & _ROW_MASK) | (north_west >> (_LAST_ROW_SHIFT + TILE_SIZE - 1))
+        north_right = (north_row >> 1) | ((north_east >> _LAST_ROW_SHIFT & 1) << (TILE_SIZE - 1))
+        south_row = south & _ROW_MASK
+        south_left = ((south_row << 1) & _ROW_MASK) | ((south_west & _ROW_MASK) >> (TILE_SIZE - 1))
+        south_right = (south_row >> 1) | ((south_east & 1) << (TILE_SIZE - 1))
+
+        def shift_down(plane, incoming_row):
+            return ((plane << TILE_SIZE) & _TILE_MASK) | incoming_row
+
+        def shift_up(plane, incoming_row):
+            return (plane >> TILE_SIZE) | (incoming_row << _LAST_ROW_SHIFT)
+
+        planes = count_planes(shift_down(left, north_left), shift_down(tile, north_row),
+                              shift_down(right, north_right),
+                              left, right,
+                              shift_up(left, south_left), shift_up(tile, south_row),
+                              shift_up(right, south_right))
+        return apply_rule(tile, planes, _TILE_MASK, survive, birth)
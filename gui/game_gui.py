@@ -5,24 +5,52 @@ A zoomable, pannable, interactive GUI for Conway's Game of Life.
 Integrates both fixed and infinite grid implementations.
 
 Author: Darya Sharnevich
-Version: 1.1
+Version: 1.4
 """
 
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QMessageBox)
-from PyQt5.QtCore import QTimer, QPoint
-from PyQt5.QtGui import QColor
+import time
+from collections import deque
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QMessageBox, QFileDialog, QShortcut)
+from PyQt5.QtCore import Qt, QTimer, QPoint, QThread
+from PyQt5.QtGui import QColor, QKeySequence
+
+from core import profiling
 
 from core.game_of_life import GameOfLife
-from core.infinite_game import InfiniteGameOfLife
+from core.tiled_game import TiledGameOfLife
+try:
+    # vectorized engine is optional, fall back to pure Python grid without NumPy
+    from core.numpy_game import NumpyGameOfLife as FixedGameOfLife
+except ImportError:
+    FixedGameOfLife = GameOfLife
 from gui.game_modules.header_bar import HeaderBar
-from gui.game_modules.control_panel import ControlPanel
+from gui.game_modules.control_panel import ControlPanel, PER_FRAME, MAX_SPEED
 from gui.game_modules.grid_canvas import GridCanvas
+from gui.game_modules.simulation_worker import SimulationWorker
+
+# the canvas is refreshed from the latest snapshot at up to 60 frames per second
+TARGET_FPS = 60
+FRAME_INTERVAL_MS = 1000 // TARGET_FPS
+# frames are spaced out so that painting takes at most this share of the time
+MAX_PAINT_SHARE = 0.25
+# window of the generations per second measurement
+SPEED_WINDOW_S = 1.0
+# file dialog filter of the supported pattern formats
+PATTERN_FILTER = "Patterns (*.rle *.cells *.lif *.life);;All files (*)"
+# largest side of the square filled by "Random" on the infinite grid, in cells
+MAX_RANDOM_SIDE = 2048
+# seconds between updates of the profiling overlay, so its numbers stay readable
+PROFILE_REFRESH_S = 0.5
 
 
 class GameOfLifeGUI(QWidget):
     """
     GUI for the Game of Life.
 
+    The simulation runs on a worker thread (see SimulationWorker), so slow generations never
+    block the interface; the canvas is repainted at display rate from the latest published snapshot.
+
     Args:
         menu_window (QWidget): Reference to menu window (optional).
         speed (int): Initial simulation speed (generations / second).
@@ -30,8 +58,9 @@ class GameOfLifeGUI(QWidget):
         width (int, optional): Width of the grid in cells (required for fixed grid mode).
         height (int, optional): Height of the grid in cells (required for fixed grid mode).
         wrap (bool, optional): Enable grid wrapping (only for fixed grid mode).
+        rule (Rule, optional): Rule of the game, Conway's rules by default.
     """
-    def __init__(self, menu_window=None, speed=10, fixed_view=False, width=None, height=None, wrap=False):
+    def __init__(self, menu_window=None, speed=10, fixed_view=False, width=None, height=None, wrap=False, rule=None):
         super().__init__()
         self.fixed_view = fixed_view
         self.menu_window = menu_window
@@ -41,9 +70,14 @@ class GameOfLifeGUI(QWidget):
             self.width = width
             self.height = height
             self.wrap = wrap
-            self.game = GameOfLife(width, height, wrap)
+            self.game = FixedGameOfLife(width, height, wrap)
         else:
-            self.game = InfiniteGameOfLife()
+            self.game = TiledGameOfLife()
+        # set before the history is enabled, so its first keyframe already holds the rule
+        if rule is not None:
+            self.game.set_rule(rule)
+        # lets the user step back and scrub through recent generations
+        self.game.enable_history()
 
         self.setWindowTitle("The Game of Life")
         self.setMinimumSize(800, 800)
@@ -53,8 +87,21 @@ class GameOfLifeGUI(QWidget):
         self.offset = QPoint(0, 0)
         self.last_mouse_pos = None
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.next_generation)
+        self.running = False
+        self.worker = SimulationWorker(self.game)
+        self.worker.loaded.connect(self.pattern_loaded)
+        self.worker.failed.connect(self.show_error)
+        self.worker_thread = QThread()
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.start()
+
+        self.frame_timer = QTimer()
+        self.frame_timer.timeout.connect(self.refresh_frame)
+        # (time, generation) samples of recent frames, used to measure gen/s
+        self.speed_samples = deque()
+        # the profiling overlay is toggled with F3, last_profile_refresh is when its text was last updated
+        self.show_profile = False
+        self.last_profile_refresh = 0.0
 
         self.current_theme = "dark"
         self.bg_color = QColor("#2d3133")
@@ -63,6 +110,7 @@ class GameOfLifeGUI(QWidget):
         self.live_color = QColor("#458557")
 
         self.build_gui()
+        self.frame_timer.start(FRAME_INTERVAL_MS)
 
     def build_gui(self):
         """Build header, canvas, and controls layout."""
@@ -72,7 +120,7 @@ class GameOfLifeGUI(QWidget):
         self.header.exit_btn.clicked.connect(self.confirm_exit_to_menu)
         
         self.canvas = GridCanvas(
-            game=self.game,
+            snapshot=self.worker.latest_snapshot,
             fixed_view_callable=lambda: self.fixed_view,
             zoom=self.zoom,
             offset=self.offset,
@@ -81,7 +129,9 @@ class GameOfLifeGUI(QWidget):
                 'grid': self.grid_line_color,
                 'dead': self.dead_color,
                 'live': self.live_color
-            }
+            },
+            toggle_callback=self.worker.toggle_cell,
+            draw_callback=self.worker.set_cells
         )
         
         self.controls = ControlPanel(
@@ -90,45 +140,174 @@ class GameOfLifeGUI(QWidget):
             clear_callback=self.clear_grid,
             theme_callback=self.toggle_theme,
             speed_change_callback=self.change_speed,
-            initial_speed=self.speed
+            initial_speed=self.speed,
+            mode_change_callback=self.change_speed,
+            fit_callback=lambda: self.canvas.fit_to_view(),
+            load_callback=self.load_pattern_file,
+            save_callback=self.save_pattern_file,
+            back_callback=self.previous_generation,
+            scrub_callback=self.scrub_history,
+            random_callback=self.randomize_grid
         )
+        # the fixed grid is always fitted to the window
+        self.controls.fit_btn.setEnabled(not self.fixed_view)
         self.controls.theme_btn.setText("Light Mode")
 
         layout.addWidget(self.header)
         layout.addWidget(self.canvas)
         layout.addWidget(self.controls)
 
+        QShortcut(QKeySequence(Qt.Key_F3), self, self.toggle_profile_overlay)
+
     def toggle_timer(self):
-        """Start or pause simulation timer."""
-        if self.timer.isActive():
-            self.timer.stop()
+        """Start or pause the simulation."""
+        if self.running:
+            self.running = False
+            self.worker.stop()
             self.controls.start_btn.setText("Start")
         else:
+            self.running = True
             self._start_timer_with_current_speed()
             self.controls.start_btn.setText("Pause")
 
-    def change_speed(self):
-        """Adjust simulation speed from slider."""
-        if self.timer.isActive():
+    def change_speed(self, *_):
+        """Adjust simulation speed from the slider or the stepping mode."""
+        if self.running:
             self._start_timer_with_current_speed()
 
     def _start_timer_with_current_speed(self):
         """Start timer with current speed setting."""
-        # generations per second
-        delay = int(1000 / self.controls.speed_slider.value())
-        self.timer.start(delay)
+        mode = self.controls.mode_box.currentText()
+        if mode == MAX_SPEED:
+            # one frame worth of generations between published snapshots
+            self.worker.start_turbo(FRAME_INTERVAL_MS)
+        elif mode == PER_FRAME:
+            self.worker.start(FRAME_INTERVAL_MS, self.controls.generations_box.value())
+        else:
+            # generations per second
+            delay = int(1000 / self.controls.speed_slider.value())
+            self.worker.start(delay)
 
     def clear_grid(self):
         """Clear grid and reset generation count."""
-        self.game.clear()
-        self.header.set_generation(self.game.generation)
-        self.canvas.update()
+        self.worker.clear()
+
+    def randomize_grid(self):
+        """
+        Fill the grid with a random soup of the density and seed set in the controls.
+
+        The fixed grid is filled whole; on the infinite grid the visible area is filled,
+        limited to MAX_RANDOM_SIDE cells around its center when zoomed far out.
+        """
+        region = None
+        if not self.fixed_view:
+            left, top, right, bottom = self.canvas.visible_rect()
+            center_x, center_y = (left + right) // 2, (top + bottom) // 2
+            half = MAX_RANDOM_SIDE // 2
+            region = (max(left, center_x - half), max(top, center_y - half),
+                      min(right, center_x + half), min(bottom, center_y + half))
+        self.worker.randomize(self.controls.density_box.value() / 100, self.controls.seed_box.value(), region)
 
     def next_generation(self):
         """Update the game_window state by one generation."""
-        self.game.next_generation()
-        self.header.set_generation(self.game.generation)
-        self.canvas.update()
+        self.worker.step()
+
+    def previous_generation(self):
+        """Go back one generation, pausing the simulation first."""
+        self._pause()
+        self.worker.rewind()
+
+    def scrub_history(self, generation):
+        """Show a generation picked on the history slider, pausing the simulation first."""
+        self._pause()
+        self.worker.seek(generation)
+
+    def _pause(self):
+        """Pause the simulation if it is running."""
+        if self.running:
+            self.toggle_timer()
+
+    def load_pattern_file(self):
+        """Ask for a pattern file and replace the board with it."""
+        path, _ = QFileDialog.getOpenFileName(self, "Load Pattern", "", PATTERN_FILTER)
+        if path:
+            self.worker.load_pattern(path)
+
+    def save_pattern_file(self):
+        """Ask for a file name and save the board to it."""
+        path, _ = QFileDialog.getSaveFileName(self, "Save Pattern", "pattern.rle", PATTERN_FILTER)
+        if path:
+            self.worker.save_pattern(path)
+
+    def pattern_loaded(self, header, box):
+        """Show a freshly loaded pattern as a whole."""
+        if box is not None:
+            self.canvas.fit_to_view(box)
+
+    def show_error(self, message):
+        """Show an error reported by the simulation worker."""
+        QMessageBox.warning(self, "Error", message)
+
+    def refresh_frame(self):
+        """Show the latest snapshot published by the worker, if it changed since the last frame."""
+        snapshot = self.worker.latest_snapshot
+        if snapshot is not self.canvas.snapshot:
+            self.canvas.set_snapshot(snapshot)
+            self.header.set_generation(snapshot.generation)
+            self.header.set_population(snapshot.population, self.worker.latest_populations)
+            history = self.worker.latest_history
+            if history is not None:
+                self.controls.set_history(*history, snapshot.generation)
+        self._update_speed(snapshot.generation)
+        if self.show_profile:
+            self._update_profile_overlay()
+
+        # governor: when painting gets slow, paint less often instead of starving the simulation
+        interval = max(FRAME_INTERVAL_MS, int(self.canvas.last_paint_ms / MAX_PAINT_SHARE))
+        if interval != self.frame_timer.interval():
+            self.frame_timer.setInterval(interval)
+
+    def toggle_profile_overlay(self):
+        """Show or hide the profiling overlay, enabling profiling the first time it is shown."""
+        self.show_profile = not self.show_profile
+        if self.show_profile:
+            profiling.enable()
+            self.last_profile_refresh = 0.0
+            self._update_profile_overlay()
+        else:
+            self.canvas.set_overlay_text(None)
+
+    def _update_profile_overlay(self):
+        """Show the current profiling report on the canvas, at most every PROFILE_REFRESH_S seconds."""
+        now = time.perf_counter()
+        if now - self.last_profile_refresh < PROFILE_REFRESH_S:
+            return
+        self.last_profile_refresh = now
+        profiler = profiling.profiler()
+        if profiler is not None:
+            self.canvas.set_overlay_text(profiler.report())
+
+    def _update_speed(self, generation):
+        """Measure generations per second over the last SPEED_WINDOW_S seconds and show it in the header."""
+        now = time.perf_counter()
+        samples = self.speed_samples
+        if samples and generation < samples[-1][1]:
+            # cleared, start measuring again
+            samples.clear()
+        samples.append((now, generation))
+        while now - samples[0][0] > SPEED_WINDOW_S:
+            samples.popleft()
+        first_time, first_generation = samples[0]
+        speed = (generation - first_generation) / (now - first_time) if now > first_time else 0
+        self.header.set_speed(speed)
+
+    def closeEvent(self, event):
+        """Stop the simulation thread when the window is closed."""
+        self.frame_timer.stop()
+        self.worker.stop()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        super().closeEvent(event)
 
     def confirm_exit_to_menu(self):
         """Shows confirmation dialog to return to the game_window menu."""
@@ -1,17 +1,29 @@
 from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QVBoxLayout, QSlider, QLabel
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QVBoxLayout, QSlider, QLabel, QComboBox, QSpinBox
+
+# stepping modes
+REAL_TIME = "Real time"
+PER_FRAME = "Per frame"
+MAX_SPEED = "Max speed"
 
 
 class ControlPanel(QWidget):
     """
     Control panel for game_window controls. Consists of:
     - Start/Pause button
-    - Next generation button
+    - Back and Next generation buttons
+    - History slider scrubbing through the recorded generations
     - Clear grid button
+    - Random button filling the board with a seeded soup of the chosen density
     - Theme toggle button
     - Speed control slider with labels
+    - Stepping mode selector (real time, fixed generations per frame, max speed)
+    - Fit button zooming the view to the whole pattern
+    - Load and Save buttons for pattern files
     """
-    def __init__(self, start_callback, next_callback, clear_callback, theme_callback, speed_change_callback, initial_speed):
+    def __init__(self, start_callback, next_callback, clear_callback, theme_callback, speed_change_callback, initial_speed,
+                 mode_change_callback=None, fit_callback=None, load_callback=None, save_callback=None,
+                 back_callback=None, scrub_callback=None, random_callback=None):
         """
         Initialize the control panel.
         
@@ -22,6 +34,13 @@ class ControlPanel(QWidget):
             theme_callback: Function to call when theme button is clicked
             speed_change_callback: Function to call when speed slider value changes
             initial_speed: Initial simulation speed (generations per second)
+            mode_change_callback: Function to call when the stepping mode or generations per frame change
+            fit_callback: Function to call when the fit button is clicked
+            load_callback: Function to call when the load button is clicked
+            save_callback: Function to call when the save button is clicked
+            back_callback: Function to call when the back button is clicked
+            scrub_callback: Function to call with the generation picked on the history slider
+            random_callback: Function to call when the random button is clicked
         """
         super().__init__()
         self.start_callback = start_callback
@@ -30,6 +49,13 @@ class ControlPanel(QWidget):
         self.theme_callback = theme_callback
         self.speed_change_callback = speed_change_callback
         self.initial_speed = initial_speed
+        self.mode_change_callback = mode_change_callback or (lambda *_: None)
+        self.fit_callback = fit_callback or (lambda: None)
+        self.load_callback = load_callback or (lambda: None)
+        self.save_callback = save_callback or (lambda: None)
+        self.back_callback = back_callback or (lambda: None)
+        self.scrub_callback = scrub_callback or (lambda *_: None)
+        self.random_callback = random_callback or (lambda: None)
         self.build_ui()
 
     def build_ui(self):
@@ -46,13 +72,55 @@ class ControlPanel(QWidget):
         clear_btn.clicked.connect(self.clear_callback)
         controls.addWidget(clear_btn)
 
+        # random soup, the same density and seed always give the same board
+        random_btn = QPushButton("Random")
+        random_btn.clicked.connect(self.random_callback)
+        controls.addWidget(random_btn)
+
+        self.density_box = QSpinBox()
+        self.density_box.setRange(1, 100)
+        self.density_box.setValue(35)
+        self.density_box.setSuffix(" %")
+        self.density_box.setToolTip("Density of the random soup")
+        controls.addWidget(self.density_box)
+
+        self.seed_box = QSpinBox()
+        self.seed_box.setRange(0, 999999)
+        self.seed_box.setPrefix("seed ")
+        self.seed_box.setToolTip("Seed of the random soup")
+        controls.addWidget(self.seed_box)
+
         self.start_btn = QPushButton("Start")
         self.start_btn.clicked.connect(self.start_callback)
         controls.addWidget(self.start_btn)
 
+        self.back_btn = QPushButton("Back")
+        self.back_btn.clicked.connect(self.back_callback)
+        controls.addWidget(self.back_btn)
+
         next_btn = QPushButton("Next")
         next_btn.clicked.connect(self.next_callback)
         controls.addWidget(next_btn)
+
+        # history scrubbing, the range follows the generations kept by the history
+        self.history_slider = QSlider(Qt.Horizontal)
+        self.history_slider.setFixedWidth(160)
+        self.history_slider.setRange(0, 0)
+        self.history_slider.setToolTip("Scrub through past generations")
+        self.history_slider.valueChanged.connect(self.scrub_callback)
+        controls.addWidget(self.history_slider)
+
+        self.fit_btn = QPushButton("Fit")
+        self.fit_btn.clicked.connect(self.fit_callback)
+        controls.addWidget(self.fit_btn)
+
+        load_btn = QPushButton("Load")
+        load_btn.clicked.connect(self.load_callback)
+        controls.addWidget(load_btn)
+
+        save_btn = QPushButton("Save")
+        save_btn.clicked.connect(self.save_callback)
+        controls.addWidget(save_btn)
         controls.addStretch()
 
         # speed control
@@ -76,5 +144,42 @@ class ControlPanel(QWidget):
 
         controls.addLayout(self.speed_layout)
 
+        # stepping mode
+        self.mode_box = QComboBox()
+        self.mode_box.addItems([REAL_TIME, PER_FRAME, MAX_SPEED])
+        self.mode_box.currentTextChanged.connect(self.update_mode_inputs)
+        self.mode_box.currentTextChanged.connect(self.mode_change_callback)
+        controls.addWidget(self.mode_box)
+
+        self.generations_box = QSpinBox()
+        self.generations_box.setRange(1, 100000)
+        self.generations_box.setValue(10)
+        self.generations_box.setSuffix(" gen/frame")
+        self.generations_box.valueChanged.connect(self.mode_change_callback)
+        controls.addWidget(self.generations_box)
+        self.update_mode_inputs()
+
         self.setLayout(controls)
 
+    def set_history(self, first, last, generation):
+        """
+        Show the recorded generations and the current one on the history slider.
+
+        Args:
+            first (int): Oldest recorded generation.
+            last (int): Latest recorded generation.
+            generation (int): Generation on display.
+        """
+        # programmatic updates must not be mistaken for scrubbing
+        self.history_slider.blockSignals(True)
+        self.history_slider.setRange(first, last)
+        if not self.history_slider.isSliderDown():
+            self.history_slider.setValue(generation)
+        self.history_slider.blockSignals(False)
+        self.back_btn.setEnabled(generation > first)
+
+    def update_mode_inputs(self, *_):
+        """Enable only the inputs used by the selected stepping mode."""
+        mode = self.mode_box.currentText()
+        self.speed_slider.setEnabled(mode == REAL_TIME)
+        self.generations_box.setEnabled(mode == PER_FRAME)
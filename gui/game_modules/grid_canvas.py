@@ -1,7 +1,25 @@
 from PyQt5.QtWidgets import QWidget, QSizePolicy
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QPainter, QMouseEvent, QWheelEvent, QColor
-from math import floor
+from PyQt5.QtCore import Qt, QPoint, QRect, QLine, QEvent
+from PyQt5.QtGui import QPainter, QMouseEvent, QWheelEvent, QColor, QPixmap, QImage, QFontDatabase, QFontMetrics
+from math import floor, ceil, log2, sqrt
+import time
+
+from core.profiling import EVENTS, PAINT, RENDER, phase, record
+
+# zoom limits of the infinite view
+MIN_ZOOM = 2 ** -20
+MAX_ZOOM = 5.0
+# below this cell size the infinite view shows a density map instead of cells
+MIN_CELL_PX = 2
+# share of the canvas used by the pattern after "fit to view"
+FIT_MARGIN = 0.9
+# above this number of changed cells a single full-widget update is cheaper than many small ones
+MAX_UPDATE_RECTS = 256
+# input events timed as the "events" profiling phase
+INPUT_EVENTS = (QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.MouseButtonRelease, QEvent.Wheel)
+# margin and padding of the profiling overlay in pixels
+OVERLAY_MARGIN = 8
+OVERLAY_PADDING = 6
 
 class GridCanvas(QWidget):
     """
@@ -10,83 +28,344 @@ class GridCanvas(QWidget):
     Supports:
     - Cell toggling with left mouse button
     - Grid panning with right mouse button
-    - Zoom with mouse wheel
+    - Zoom with mouse wheel, down to a density map where each pixel shows many cells
     - Fixed and infinite grid modes
     - Custom color schemes
+
+    The canvas draws a read-only Snapshot of the game and never edits the game itself:
+    cell edits are passed to callbacks, so they can be queued to the thread running the simulation.
+
+    Drawing goes to a persistent backing pixmap that is copied to the screen on paint events.
+    A new snapshot that lists its changed cells only patches those cells in the pixmap,
+    and panning scrolls the pixmap and draws just the strips that came into view.
     """
-    def __init__(self, game, fixed_view_callable, zoom, offset, colors):
+    def __init__(self, snapshot, fixed_view_callable, zoom, offset, colors, toggle_callback, draw_callback):
         """
         Initialize the grid canvas.
 
         Args:
-            game: GameOfLife instance to visualize
+            snapshot: Snapshot of the game to visualize
             fixed_view_callable: Function that returns whether the view is fixed
             zoom: Initial zoom level
             offset: Initial view offset
             colors: Dictionary with color scheme (bg, grid, dead, live)
+            toggle_callback: Function called with (x, y) when a cell is clicked
+            draw_callback: Function called with a list of (x, y) cells drawn alive by dragging
         """
         super().__init__()
-        self.game = game
+        self.snapshot = snapshot
+        self.toggle_callback = toggle_callback
+        self.draw_callback = draw_callback
         self.fixed_view_callable = fixed_view_callable
         self.zoom = zoom
         self.offset = offset
         self.colors = colors
         self.base_cell_size = 20
+        # grid lines are only drawn over the fixed grid when cells are at least this large
+        self.min_grid_line_px = 4
         self.last_mouse_pos = None
+        # duration of the last repaint, used by the GUI to limit the frame rate
+        self.last_paint_ms = 0.0
+        # background tile (one dead cell with its grid lines), rebuilt when size or colors change
+        self._cell_tile = None
+        self._cell_tile_key = None
+        # color table of the density map, rebuilt when colors change
+        self._density_colors = None
+        self._density_colors_key = None
+        # backing pixmap, the view state it was drawn for and the offset it was drawn at
+        self._backing = None
+        self._backing_state = None
+        self._backing_offset = None
+        self._backing_stale = True
+        # text of the profiling overlay drawn over the grid, None when it is hidden
+        self.overlay_text = None
+        self._overlay_rect = QRect()
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
     # redefine QWidget paintEvent() to be called when paint event is issued (QWidget.update())
     def paintEvent(self, event):
-        """Paint the grid and live cells based on current state."""
+        """Paint the requested area from the backing pixmap, bringing the pixmap up to date first."""
+        start = time.perf_counter()
+        self._update_backing()
         qp = QPainter(self)
-        qp.setRenderHint(QPainter.Antialiasing)
-        qp.fillRect(self.rect(), self.colors['bg'])
+        qp.drawPixmap(event.rect(), self._backing, event.rect())
+        if self.overlay_text is not None and event.rect().intersects(self._overlay_rect):
+            self._draw_overlay(qp)
+        qp.end()
+        elapsed = time.perf_counter() - start
+        self.last_paint_ms = elapsed * 1000
+        record(PAINT, elapsed)
 
-        width, height = self.width(), self.height()
-        cell_px = max(5, int(self.base_cell_size * self.zoom))
+    def event(self, event):
+        """Dispatch an event, timing mouse and wheel input as the "events" profiling phase."""
+        if event.type() in INPUT_EVENTS:
+            with phase(EVENTS):
+                return super().event(event)
+        return super().event(event)
 
-        if self.fixed_view_callable():
-            cols, rows = self.game.width, self.game.height
-            cell_px = min(width // cols, height // rows)
-            x_offset = (width - cols * cell_px) // 2
-            y_offset = (height - rows * cell_px) // 2
-
-            for gx in range(cols):
-                for gy in range(rows):
-                    sx = x_offset + gx * cell_px
-                    sy = y_offset + gy * cell_px
-
-                    if self.game.grid[gy][gx]:
-                        self._draw_live_cell(qp, sx, sy, cell_px)
-                    else:
-                        self._draw_dead_cell(qp, sx, sy, cell_px)
+    def set_overlay_text(self, text):
+        """
+        Show text in a box over the top left corner of the grid, e.g. the profiling report.
+
+        Args:
+            text: Text to show, one or more lines, or None to hide the overlay
+        """
+        if text == self.overlay_text:
+            return
+        # the previous box is repainted too, in case the new one is smaller
+        self.update(self._overlay_rect)
+        self.overlay_text = text
+        if text is None:
+            self._overlay_rect = QRect()
+            return
+        size = QFontMetrics(self._overlay_font()).size(0, text)
+        self._overlay_rect = QRect(OVERLAY_MARGIN, OVERLAY_MARGIN,
+                                   size.width() + 2 * OVERLAY_PADDING, size.height() + 2 * OVERLAY_PADDING)
+        self.update(self._overlay_rect)
+
+    def set_snapshot(self, snapshot):
+        """
+        Show a new snapshot.
+
+        When the snapshot directly follows the one on screen and lists its changed cells,
+        only those cells are redrawn and only their rectangles are updated on screen.
+        """
+        previous, self.snapshot = self.snapshot, snapshot
+        rects = None
+        if (self._backing is not None and not self._backing_stale and snapshot.changes is not None
+                and snapshot.sequence == previous.sequence + 1):
+            # catch up with pans or zooms first, so the patch lands on a pixmap of the current view
+            self._update_backing()
+            with phase(RENDER):
+                rects = self._patch_cells(snapshot.changes)
+
+        if rects is None:
+            self._backing_stale = True
+            self.update()
+        elif len(rects) > MAX_UPDATE_RECTS:
+            self.update()
         else:
-            dx = -(self.offset.x() % cell_px)
-            dy = -(self.offset.y() % cell_px)
-            
-            start_x = self.offset.x() // cell_px
-            start_y = self.offset.y() // cell_px
+            for rect in rects:
+                self.update(rect)
+
+    def _view_state(self):
+        """Everything besides the offset and the snapshot that the backing pixmap depends on."""
+        return (self.width(), self.height(), self.zoom, self.fixed_view_callable(),
+                tuple(color.rgba() for color in self.colors.values()))
+
+    def _update_backing(self):
+        """Redraw the backing pixmap if the view changed, or scroll it if the view was only panned."""
+        state = self._view_state()
+        if self._backing is None or self._backing_stale or state != self._backing_state:
+            self._backing = QPixmap(self.size())
+            self._render(self._backing.rect())
+            self._backing_state = state
+            self._backing_offset = QPoint(self.offset)
+            self._backing_stale = False
+        elif self.offset != self._backing_offset:
+            self._scroll_backing()
+
+    def _scroll_backing(self):
+        """Move the backing pixmap by the pan distance and draw the strips that came into view."""
+        dx = self._backing_offset.x() - self.offset.x()
+        dy = self._backing_offset.y() - self.offset.y()
+        width, height = self._backing.width(), self._backing.height()
+        self._backing_offset = QPoint(self.offset)
+
+        if abs(dx) >= width or abs(dy) >= height:
+            self._render(self._backing.rect())
+            return
+
+        self._backing.scroll(dx, dy, self._backing.rect())
+        if dx > 0:
+            self._render(QRect(0, 0, dx, height))
+        elif dx < 0:
+            self._render(QRect(width + dx, 0, -dx, height))
+        if dy > 0:
+            self._render(QRect(0, 0, width, dy))
+        elif dy < 0:
+            self._render(QRect(0, height + dy, width, -dy))
+
+    def _render(self, rect):
+        """Draw the part of the view inside rect onto the backing pixmap."""
+        with phase(RENDER):
+            qp = QPainter(self._backing)
+            qp.setClipRect(rect)
+            # everything is aligned to whole pixels, and sharp edges let single cells be patched later
+            qp.fillRect(rect, self.colors['bg'])
+
+            if self.fixed_view_callable():
+                cols, rows, cell_px, x_offset, y_offset = self._fixed_geometry()
+
+                # one byte per cell is used directly as an 8-bit indexed image and scaled in one call
+                cell_bytes = self.snapshot.cell_bytes()
+                image = QImage(cell_bytes, cols, rows, cols, QImage.Format_Indexed8)
+                image.setColorTable([self.colors['dead'].rgba(), self.colors['live'].rgba()])
+                qp.drawImage(QRect(x_offset, y_offset, cols * cell_px, rows * cell_px), image)
+
+                if cell_px >= self.min_grid_line_px:
+                    self._draw_grid_lines(qp, x_offset, y_offset, cols, rows, cell_px)
+            else:
+                cell_px, level = self._view_scale()
+                if level is not None:
+                    self._draw_density(qp, level, rect)
+                else:
+                    self._draw_cells(qp, cell_px, rect)
+
+            qp.end()
+
+    def _patch_cells(self, cells):
+        """
+        Redraw single cells on the backing pixmap.
+
+        Returns:
+            (list) Widget rectangles that changed, or None if the current view cannot be patched
+            cell by cell (density map), in which case nothing was drawn.
+        """
+        fixed = self.fixed_view_callable()
+        if fixed:
+            cols, rows, cell_px, x_offset, y_offset = self._fixed_geometry()
+            grid_lines = cell_px >= self.min_grid_line_px
+        else:
+            cell_px, level = self._view_scale()
+            if level is not None:
+                return None
+            x_offset, y_offset = -self.offset.x(), -self.offset.y()
+            tile = self._background_tile(cell_px) if cell_px >= self.min_grid_line_px else None
+        bounds = self._backing.rect()
+
+        qp = QPainter(self._backing)
+        rects = []
+        for x, y in cells:
+            rect = QRect(x_offset + x * cell_px, y_offset + y * cell_px, cell_px, cell_px)
+            if not rect.intersects(bounds):
+                continue
+            alive = self.snapshot.is_alive(x, y)
+            if fixed:
+                qp.fillRect(rect, self.colors['live'] if alive else self.colors['dead'])
+                if grid_lines:
+                    qp.setPen(self.colors['grid'])
+                    qp.setBrush(Qt.NoBrush)
+                    qp.drawRect(rect)
+                    # the outline covers one extra pixel on the right and bottom
+                    rect = rect.adjusted(0, 0, 1, 1)
+            else:
+                if tile is not None:
+                    qp.drawPixmap(rect.topLeft(), tile)
+                else:
+                    qp.fillRect(rect, self.colors['dead'])
+                if alive:
+                    inset = 1 if tile is not None else 0
+                    qp.fillRect(rect.adjusted(inset, inset, -inset, -inset), self.colors['live'])
+            rects.append(rect)
+        qp.end()
+        return rects
+
+    def _overlay_font(self):
+        """Fixed-width font of the overlay, so the columns of a report line up."""
+        return QFontDatabase.systemFont(QFontDatabase.FixedFont)
 
-            # +1 additional cell in addition to all full cells
-            cols = width // cell_px + 1
-            rows = height // cell_px + 1
+    def _draw_overlay(self, qp):
+        """Draw the overlay text in a translucent box."""
+        background = QColor(self.colors['bg'])
+        background.setAlpha(200)
+        qp.fillRect(self._overlay_rect, background)
+        qp.setPen(self.colors['live'].lighter(150))
+        qp.setFont(self._overlay_font())
+        qp.drawText(self._overlay_rect.adjusted(OVERLAY_PADDING, OVERLAY_PADDING, -OVERLAY_PADDING, -OVERLAY_PADDING),
+                    Qt.AlignLeft | Qt.AlignTop, self.overlay_text)
 
-            # draw grid
-            for i in range(cols):
-                for j in range(rows):
-                    # game coords
-                    gx = start_x + i
-                    gy = start_y + j
+    def _fixed_geometry(self):
+        """Returns (cols, rows, cell_px, x_offset, y_offset) of the fixed grid centered in the canvas."""
+        cols, rows = self.snapshot.width, self.snapshot.height
+        cell_px = min(self.width() // cols, self.height() // rows)
+        x_offset = (self.width() - cols * cell_px) // 2
+        y_offset = (self.height() - rows * cell_px) // 2
+        return cols, rows, cell_px, x_offset, y_offset
 
-                    # screen coords
-                    sx = i * cell_px + dx
-                    sy = j * cell_px + dy
+    def _draw_cells(self, qp, cell_px, rect):
+        """Draw the part of the infinite grid inside rect cell by cell."""
+        ox, oy = self.offset.x(), self.offset.y()
+        if cell_px >= self.min_grid_line_px:
+            # empty grid drawn in one call by repeating a single cell pixmap
+            qp.drawTiledPixmap(rect, self._background_tile(cell_px),
+                               QPoint((ox + rect.left()) % cell_px, (oy + rect.top()) % cell_px))
+            inset = 1
+        else:
+            # cells too small for grid lines
+            qp.fillRect(rect, self.colors['dead'])
+            inset = 0
+
+        # cells overlapping the rectangle (QRect.right() and bottom() are inclusive)
+        left = (ox + rect.left()) // cell_px
+        top = (oy + rect.top()) // cell_px
+        right = (ox + rect.right()) // cell_px + 1
+        bottom = (oy + rect.bottom()) // cell_px + 1
+
+        # only live cells inside the rectangle are fetched from the snapshot
+        visible = self.snapshot.cells_in_rect(left, top, right, bottom)
+        rects = [QRect(gx * cell_px - ox + inset, gy * cell_px - oy + inset,
+                       cell_px - 2 * inset, cell_px - 2 * inset)
+                 for gx, gy in visible]
+        if rects:
+            qp.setBrush(self.colors['live'])
+            qp.setPen(Qt.NoPen)
+            qp.drawRects(rects)
+
+    def _draw_density(self, qp, level, rect):
+        """
+        Draw the part of the infinite grid inside rect zoomed out below one cell per pixel.
+
+        Each pixel covers a block of 2**level by 2**level cells and is shaded by the live fraction
+        of that block, taken from the block populations kept by the snapshot.
+        """
+        cols, rows = rect.width(), rect.height()
+        # in this mode the offset is measured in blocks
+        pixels = self.snapshot.density(self.offset.x() + rect.left(), self.offset.y() + rect.top(), cols, rows, level)
+        image = QImage(pixels, cols, rows, cols, QImage.Format_Indexed8)
+        image.setColorTable(self._density_color_table())
+        qp.drawImage(rect.topLeft(), image)
+
+    def _view_scale(self):
+        """
+        Returns the scale of the infinite view as (cell_px, level).
+
+        When cells are at least MIN_CELL_PX pixels wide, cell_px is their size and level is None;
+        otherwise cell_px is None and every pixel shows a block of 2**level by 2**level cells.
+        """
+        pixels = self.base_cell_size * self.zoom
+        if pixels >= MIN_CELL_PX:
+            return int(pixels), None
+        return None, max(0, ceil(log2(1 / pixels)))
+
+    def _pixels_per_cell(self):
+        """Returns the size of a cell in pixels in the infinite view (below 1 when zoomed out)."""
+        cell_px, level = self._view_scale()
+        return cell_px if level is None else 1 / (1 << level)
+
+    def fit_to_view(self, box=None):
+        """
+        Zoom and pan the infinite view so that the whole pattern is visible.
+
+        Args:
+            box: (left, top, right, bottom) to fit, defaults to the bounding box of the shown snapshot
+        """
+        if self.fixed_view_callable():
+            return
+        if box is None:
+            box = self.snapshot.bounding_box()
+        if box is None:
+            return
+        left, top, right, bottom = box
+
+        pixels = min(self.width() / (right - left), self.height() / (bottom - top)) * FIT_MARGIN
+        self.zoom = min(max(MIN_ZOOM, pixels / self.base_cell_size), MAX_ZOOM)
 
-                    if (gx, gy) in self.game.live_cells:
-                        self._draw_live_cell(qp, sx, sy, cell_px)
-                    else:
-                        self._draw_dead_cell(qp, sx, sy, cell_px)
+        scale = self._pixels_per_cell()
+        self.offset = QPoint(int(round((left + right) / 2 * scale - self.width() / 2)),
+                             int(round((top + bottom) / 2 * scale - self.height() / 2)))
+        self.update()
 
     def mousePressEvent(self, event: QMouseEvent):
         """
@@ -98,8 +377,7 @@ class GridCanvas(QWidget):
         if event.button() == Qt.LeftButton:
             coords = self._get_cell_coords(event.pos())
             if coords:
-                self.game.toggle_cell(*coords)
-                self.update()
+                self.toggle_callback(*coords)
             self.last_mouse_pos = event.pos()
         elif event.button() == Qt.RightButton:
             self.last_mouse_pos = event.pos()
@@ -125,7 +403,6 @@ class GridCanvas(QWidget):
                 self._draw_line_between_points(*coords1, *coords2)
 
             self.last_mouse_pos = current_pos
-            self.update()
 
     def mouseReleaseEvent(self, event):
         """Reset drag state on mouse button release."""
@@ -143,28 +420,39 @@ class GridCanvas(QWidget):
         if delta == 0:
             return
 
-        old_zoom = self.zoom
-        zoom_factor = 1.0 + (delta / 120)
-        new_zoom = min(max(0.2, self.zoom * zoom_factor), 5.0)
+        # one wheel notch doubles or halves the zoom
+        zoom_factor = 2 ** (delta / 120)
+        new_zoom = min(max(MIN_ZOOM, self.zoom * zoom_factor), MAX_ZOOM)
 
         center_x = self.width() / 2
         center_y = self.height() / 2
         
         # convert center point to grid coordinates
-        cell_px = max(5, int(self.base_cell_size * old_zoom))
-        grid_x = (center_x + self.offset.x()) / cell_px
-        grid_y = (center_y + self.offset.y()) / cell_px
+        scale = self._pixels_per_cell()
+        grid_x = (center_x + self.offset.x()) / scale
+        grid_y = (center_y + self.offset.y()) / scale
 
         self.zoom = new_zoom
         
         # convert grid coordinates back to screen
-        cell_px = max(5, int(self.base_cell_size * new_zoom))
-        new_screen_x = grid_x * cell_px - center_x
-        new_screen_y = grid_y * cell_px - center_y
+        scale = self._pixels_per_cell()
+        new_screen_x = grid_x * scale - center_x
+        new_screen_y = grid_y * scale - center_y
         
         self.offset = QPoint(int(round(new_screen_x)), int(round(new_screen_y)))
         self.update()
 
+    def visible_rect(self):
+        """
+        Returns the cells shown by the infinite view.
+
+        Returns:
+            Tuple (left, top, right, bottom) in cell coordinates, right and bottom exclusive
+        """
+        scale = self._pixels_per_cell()
+        return (floor(self.offset.x() / scale), floor(self.offset.y() / scale),
+                ceil((self.offset.x() + self.width()) / scale), ceil((self.offset.y() + self.height()) / scale))
+
     def _get_cell_coords(self, pos):
         """
         Convert screen coordinates to cell grid coordinates.
@@ -173,43 +461,80 @@ class GridCanvas(QWidget):
             pos: QPoint with screen coordinates
             
         Returns:
-            Tuple (x, y) with grid coordinates or None if outside grid
+            Tuple (x, y) with grid coordinates or None if outside grid (or zoomed out to the density map)
         """
         if not pos:
             return None
             
-        width, height = self.width(), self.height()
-        cell_px = max(5, int(self.base_cell_size * self.zoom))
+        cell_px, level = self._view_scale()
 
         if self.fixed_view_callable():
-            cell_px = min(width // self.game.width, height // self.game.height)
-            x_offset = (width - self.game.width * cell_px) // 2
-            y_offset = (height - self.game.height * cell_px) // 2
+            cols, rows, cell_px, x_offset, y_offset = self._fixed_geometry()
 
             x = (pos.x() - x_offset) // cell_px
             y = (pos.y() - y_offset) // cell_px
 
-            if not (0 <= x < self.game.width and 0 <= y < self.game.height):
+            if not (0 <= x < cols and 0 <= y < rows):
                 return None
+        elif level is not None:
+            # single cells cannot be picked on the density map
+            return None
         else:
             x = (pos.x() + self.offset.x()) // cell_px
             y = (pos.y() + self.offset.y()) // cell_px
 
         return x, y
 
-    def _draw_live_cell(self, qp, x, y, cell_px):
-        """Helper method to draw a single cell."""
-        qp.setBrush(self.colors['live'])
-        # no border
-        qp.setPen(Qt.NoPen)
-        # move by 1px from start, size adjusted
-        qp.drawRect(x + 1, y + 1, cell_px - 2, cell_px - 2)
-
-    def _draw_dead_cell(self, qp, x, y, cell_px):
-        """Helper method to draw a grid for cell."""
+    def _draw_grid_lines(self, qp, x_offset, y_offset, cols, rows, cell_px):
+        """Draw the grid lines of the fixed grid on top of the cell image."""
+        right = x_offset + cols * cell_px
+        bottom = y_offset + rows * cell_px
+        lines = [QLine(x_offset + i * cell_px, y_offset, x_offset + i * cell_px, bottom) for i in range(cols + 1)]
+        lines += [QLine(x_offset, y_offset + j * cell_px, right, y_offset + j * cell_px) for j in range(rows + 1)]
         qp.setPen(self.colors['grid'])
-        qp.setBrush(self.colors['dead'])
-        qp.drawRect(x, y, cell_px, cell_px)
+        qp.drawLines(lines)
+
+    def _density_color_table(self):
+        """
+        Returns the 256-entry color table of the density map, from dead (0) to live (255).
+
+        Shades follow the square root of the live fraction and start at 30%, so sparse blocks stay visible.
+        """
+        dead, live = self.colors['dead'], self.colors['live']
+        key = (dead.rgba(), live.rgba())
+        if key != self._density_colors_key:
+            table = [dead.rgba()]
+            for value in range(1, 256):
+                t = 0.3 + 0.7 * sqrt(value / 255)
+                table.append(QColor(round(dead.red() + (live.red() - dead.red()) * t),
+                                    round(dead.green() + (live.green() - dead.green()) * t),
+                                    round(dead.blue() + (live.blue() - dead.blue()) * t)).rgba())
+            self._density_colors = table
+            self._density_colors_key = key
+        return self._density_colors
+
+    def _background_tile(self, cell_px):
+        """
+        Return a pixmap of one dead cell with its grid lines, cached per cell size and colors.
+
+        Args:
+            cell_px (int): Size of a cell in pixels.
+
+        Returns:
+            (QPixmap) Pixmap of cell_px x cell_px pixels.
+        """
+        key = (cell_px, self.colors['grid'].rgba(), self.colors['dead'].rgba())
+        if key != self._cell_tile_key:
+            tile = QPixmap(cell_px, cell_px)
+            tile.fill(self.colors['dead'])
+            qp = QPainter(tile)
+            qp.setPen(self.colors['grid'])
+            qp.drawLine(0, 0, cell_px - 1, 0)
+            qp.drawLine(0, 0, 0, cell_px - 1)
+            qp.end()
+            self._cell_tile = tile
+            self._cell_tile_key = key
+        return self._cell_tile
 
     def _draw_line_between_points(self, x1, y1, x2, y2):
         """Draw a continuous line of live cells between two points using Bresenham's algorithm."""
@@ -218,13 +543,14 @@ class GridCanvas(QWidget):
         sx = 1 if x1 < x2 else -1
         sy = 1 if y1 < y2 else -1
         err = dx - dy
+        cells = []
 
         while True:
             if self.fixed_view_callable():
-                if 0 <= x1 < self.game.width and 0 <= y1 < self.game.height:
-                    self.game.grid[y1][x1] = 1
+                if 0 <= x1 < self.snapshot.width and 0 <= y1 < self.snapshot.height:
+                    cells.append((x1, y1))
             else:
-                self.game.live_cells[(x1, y1)] = 1
+                cells.append((x1, y1))
                 
             if x1 == x2 and y1 == y2:
                 break
@@ -235,4 +561,7 @@ class GridCanvas(QWidget):
                 x1 += sx
             if e2 < dx:
                 err += dx
-                y1 += sy
\ No newline at end of file
+                y1 += sy
+
+        # the whole line is sent as one edit
+        self.draw_callback(cells)
@@ -3,6 +3,8 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 from PyQt5.QtSvg import QSvgWidget
 
+from gui.game_modules.sparkline import Sparkline
+
 
 class HeaderBar(QWidget):
     """Header bar widget for displaying game_window information."""
@@ -32,6 +34,20 @@ class HeaderBar(QWidget):
         self.generation_label.setObjectName("GenerationLabel")
         layout.addWidget(self.generation_label)
 
+        # live population and its recent history
+        self.population_label = QLabel("Population: 0")
+        self.population_label.setObjectName("PopulationLabel")
+        layout.addWidget(self.population_label)
+
+        self.population_sparkline = Sparkline()
+        self.population_sparkline.setToolTip("Population of the last generations")
+        layout.addWidget(self.population_sparkline)
+
+        # measured simulation speed
+        self.speed_label = QLabel("0 gen/s")
+        self.speed_label.setObjectName("SpeedLabel")
+        layout.addWidget(self.speed_label)
+
         self.exit_btn = QPushButton()
         self.exit_btn.setObjectName("ExitButton")
         self.exit_btn.setIcon(QIcon("assets/exit.svg"))
@@ -40,3 +56,18 @@ class HeaderBar(QWidget):
     def set_generation(self, gen_number):
         """Update the generation counter display."""
         self.generation_label.setText(f"Generation: {gen_number}")
+
+    def set_population(self, population, history=()):
+        """
+        Update the population display.
+
+        Args:
+            population: Current number of live cells
+            history: Populations of recent generations for the sparkline, oldest first
+        """
+        self.population_label.setText(f"Population: {population:,}")
+        self.population_sparkline.set_values(list(history))
+
+    def set_speed(self, generations_per_second):
+        """Update the measured speed display."""
+        self.speed_label.setText(f"{generations_per_second:,.0f} gen/s")
@@ -0,0 +1,297 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from core.engines import is_fixed
+from core.pattern_io import load_pattern, save_pattern
+from core.profiling import SNAPSHOT, STEP, phase, record
+from core.stats import StatsRecorder
+
+
+class SimulationWorker(QObject):
+    """
+    Runs a Game of Life engine on its own thread.
+
+    The worker is meant to be moved to a QThread. All public methods can be called from
+    the GUI thread: they only queue a command, which the worker thread runs between generations.
+    After every generation or command the worker replaces ``latest_snapshot`` with a fresh
+    read-only Snapshot of the board, which the GUI can draw at its own pace.
+
+    Stepping modes:
+    - ``start(interval_ms, generations)``: advance a fixed number of generations every interval.
+    - ``start_turbo(budget_ms)``: advance as many generations as fit in the time budget,
+      then publish only the last one.
+
+    Each snapshot is numbered and carries the cells that changed since the previous one
+    (from the engine's change sets and the edits), so the canvas can redraw just those cells.
+    Changes are not tracked when several generations are computed per snapshot or when there
+    are more than MAX_TRACKED_CHANGES of them; such snapshots have ``changes`` set to None.
+
+    Games with a history (see core.history) can be rewound and scrubbed with ``rewind`` and ``seek``;
+    generations and edits made through the worker are reported to the history, and
+    ``latest_history`` holds the (first, last) generations it covers, or None.
+
+    Statistics of every step are collected in ``stats`` (a StatsRecorder, see core.stats);
+    ``latest_populations`` holds the population of the last PUBLISHED_POPULATIONS records.
+
+    Pattern files are read and written on the worker thread as well; ``loaded`` is emitted with
+    the pattern header and the bounding box of the board (None on fixed grids), ``failed`` with
+    an error message.
+    """
+    MAX_TRACKED_CHANGES = 4096
+    PUBLISHED_POPULATIONS = 200
+
+    loaded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+    _command = pyqtSignal(object)
+
+    def __init__(self, game):
+        """
+        Initialize the worker.
+
+        Args:
+            game: GameOfLife or InfiniteGameOfLife instance, owned by the worker from now on
+        """
+        super().__init__()
+        self.game = game
+        # replaced as a whole (never mutated), so reading it from another thread is safe
+        self.latest_snapshot = game.snapshot()
+        self.latest_history = self._history_range()
+        # the bounding box is not shown, so it is not asked from the engine every generation
+        self.stats = StatsRecorder()
+        self.stats.reset(game)
+        self.latest_populations = []
+        # cells changed since the latest snapshot, None if unknown
+        self._changes = set()
+
+        # created as a child so it moves to the worker thread together with the worker
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._tick)
+        self._generations = 1
+        # turbo mode: time budget per published snapshot and generations computed per engine call
+        self._budget = None
+        self._chunk = 1
+        # generation the scrub control asked for last, earlier requests still queued are skipped
+        self._seek_target = None
+        self._command.connect(self._execute)
+
+    def submit(self, command):
+        """
+        Queue a function taking no arguments to be run on the worker thread.
+
+        The function returns the cells it changed, or None if they are not known.
+        """
+        self._command.emit(command)
+
+    def start(self, interval_ms, generations=1):
+        """Start (or restart) stepping by the given number of generations every interval_ms milliseconds."""
+        def start_timer():
+            self._generations = generations
+            self._budget = None
+            self._timer.start(interval_ms)
+            return ()
+        self.submit(start_timer)
+
+    def start_turbo(self, budget_ms):
+        """
+        Start stepping as fast as the engine allows.
+
+        Generations are computed back to back for budget_ms milliseconds, then a single snapshot
+        of the last one is published, so the cost of snapshots stays bounded by the frame rate.
+        """
+        def start_timer():
+            self._budget = budget_ms / 1000
+            self._chunk = 1
+            self._timer.start(0)
+            return ()
+        self.submit(start_timer)
+
+    def stop(self):
+        """Stop stepping automatically."""
+        def stop_timer():
+            self._timer.stop()
+            return ()
+        self.submit(stop_timer)
+
+    def step(self, n=1):
+        """Advance the simulation by n generations."""
+        self.submit(lambda: self._advance(n))
+
+    def toggle_cell(self, x, y):
+        """Toggle the state of one cell."""
+        def toggle():
+            self.game.toggle_cell(x, y)
+            self._edited()
+            return [(x, y)]
+        self.submit(toggle)
+
+    def set_cells(self, cells, alive=True):
+        """Set the state of several cells at once."""
+        cells = list(cells)
+
+        def set_all():
+            self.game.set_cells(cells, alive)
+            self._edited()
+            return cells
+        self.submit(set_all)
+
+    def clear(self):
+        """Clear the grid and reset the generation counter."""
+        def clear_all():
+            self.game.clear()
+            self._edited()
+            self.stats.records.clear()
+            # everything may have changed
+            return None
+        self.submit(clear_all)
+
+    def randomize(self, density, seed, region=None):
+        """Replace the board, or a region of it, with a seeded random soup."""
+        def randomize():
+            self.game.randomize(density, seed, region)
+            self._edited()
+            return None
+        self.submit(randomize)
+
+    def rewind(self, n=1):
+        """Go back n generations in the history of the game."""
+        def rewind():
+            if self.game.history is not None:
+                self.game.rewind(n)
+                self.stats.reset(self.game)
+            return None
+        self.submit(rewind)
+
+    def seek(self, generation):
+        """Restore a generation from the history of the game, e.g. while the scrub control is dragged."""
+        self._seek_target = generation
+
+        def seek():
+            try:
+                self.game.seek(self._seek_target)
+                self.stats.reset(self.game)
+            except ValueError as error:
+                # the generation was evicted from the history in the meantime
+                self.failed.emit(str(error))
+            return None
+        self.submit(seek)
+
+    def load_pattern(self, path):
+        """Replace the board with a pattern file (RLE, plaintext or Life 1.06)."""
+        def load():
+            self.game.clear()
+            try:
+                header = load_pattern(self.game, path)
+            except (OSError, ValueError) as error:
+                self._edited()
+                self.failed.emit(f"Could not load {path}: {error}")
+            else:
+                self._edited()
+                self.loaded.emit(header, None if is_fixed(self.game) else self.game.bounding_box())
+        self.submit(load)
+
+    def save_pattern(self, path):
+        """Write the board to a pattern file, in the format given by its extension (RLE by default)."""
+        def save():
+            try:
+                save_pattern(self.game, path)
+            except OSError as error:
+                self.failed.emit(f"Could not save {path}: {error}")
+            return ()
+        self.submit(save)
+
+    # decorated slots are invoked in the worker's thread, plain methods would run in the caller's
+    @pyqtSlot(object)
+    def _execute(self, command):
+        """Run a queued command on the worker thread and publish the result."""
+        self._record(command())
+        self._publish()
+
+    @pyqtSlot()
+    def _tick(self):
+        """Advance the simulation on a timer tick."""
+        if self._budget is None:
+            self._record(self._advance(self._generations))
+        else:
+            self._run_for_budget()
+            self._record(None)
+        self._publish()
+
+    def _advance(self, n):
+        """
+        Advance n generations.
+
+        Returns:
+            Cells changed by a single generation, or None when several were computed.
+        """
+        start = time.perf_counter()
+        if n == 1:
+            changes = self.game.next_generation()
+            elapsed = time.perf_counter() - start
+            record(STEP, elapsed)
+            self.stats.record(self.game, changes, elapsed)
+            if self.game.history is not None:
+                self.game.history.advanced(self.game, changes)
+            return changes.cells() if len(changes) <= self.MAX_TRACKED_CHANGES else None
+        report = self.game.step(n)
+        elapsed = time.perf_counter() - start
+        record(STEP, elapsed)
+        self.stats.record_steps(self.game, report.generations, elapsed)
+        return None
+
+    def _edited(self):
+        """Report an edit of the board to the statistics and the history of the game."""
+        self.stats.reset(self.game)
+        if self.game.history is not None:
+            self.game.history.edited(self.game)
+
+    def _history_range(self):
+        """Returns the (first, last) generations of the game's history, or None."""
+        history = self.game.history
+        if history is None or history.last is None:
+            return None
+        return history.first, history.last
+
+    def _record(self, cells):
+        """Add changed cells to those of the next snapshot (None makes the whole snapshot unknown)."""
+        if cells is None or self._changes is None:
+            self._changes = None
+        else:
+            self._changes.update(cells)
+            if len(self._changes) > self.MAX_TRACKED_CHANGES:
+                self._changes = None
+
+    def _run_for_budget(self):
+        """
+        Advance as many generations as fit in the turbo time budget.
+
+        Generations are computed in chunks; the chunk size adapts so that one engine call takes
+        between an eighth and a half of the budget, which keeps per-call overhead low for fast engines
+        (Hashlife advances a whole chunk in logarithmic time) without overshooting on slow ones.
+        """
+        start = time.perf_counter()
+        deadline = start + self._budget
+        generations = 0
+        while True:
+            chunk_start = time.perf_counter()
+            generations += self.game.step(self._chunk).generations
+            now = time.perf_counter()
+            record(STEP, now - chunk_start)
+            if now - chunk_start < self._budget / 8:
+                self._chunk *= 2
+            elif now - chunk_start > self._budget / 2 and self._chunk > 1:
+                self._chunk //= 2
+            if now >= deadline:
+                break
+        self.stats.record_steps(self.game, generations, now - start)
+
+    def _publish(self):
+        """Replace the latest snapshot with the current state of the game."""
+        with phase(SNAPSHOT):
+            snapshot = self.game.snapshot()
+        snapshot.sequence = self.latest_snapshot.sequence + 1
+        snapshot.changes = frozenset(self._changes) if self._changes is not None else None
+        self._changes = set()
+        self.latest_history = self._history_range()
+        self.latest_populations = self.stats.populations(self.PUBLISHED_POPULATIONS)
+        self.latest_snapshot = snapshot
@@ -0,0 +1,48 @@
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtGui import QPainter, QPalette, QPen, QPolygonF
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+
+class Sparkline(QWidget):
+    """
+    Small line chart of recent values, e.g. the population of the last generations.
+
+    The line is drawn in the text color of the current style, scaled between the smallest
+    and largest value shown, so it follows the theme without any colors of its own.
+    """
+
+    def __init__(self, width=160, height=36):
+        """
+        Initialize the sparkline.
+
+        Args:
+            width: Width of the chart in pixels
+            height: Height of the chart in pixels
+        """
+        super().__init__()
+        self.values = []
+        self.setFixedSize(width, height)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+
+    def set_values(self, values):
+        """Replace the values shown, oldest first, and repaint."""
+        if values != self.values:
+            self.values = values
+            self.update()
+
+    def paintEvent(self, event):
+        """Draw the values as a polyline across the widget."""
+        if len(self.values) < 2:
+            return
+        low, high = min(self.values), max(self.values)
+        span = (high - low) or 1
+        width, height = self.width() - 1, self.height() - 1
+        step = width / (len(self.values) - 1)
+        line = QPolygonF([QPointF(i * step, height - (value - low) / span * height)
+                          for i, value in enumerate(self.values)])
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.palette().color(QPalette.WindowText), 1.5, Qt.SolidLine))
+        painter.drawPolyline(line)
+        painter.end()
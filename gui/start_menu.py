@@ -1,8 +1,11 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox)
 from PyQt5.QtCore import Qt
 
+from core.rules import NAMED_RULES, Rule
 from gui.game_gui import GameOfLifeGUI
 
+CUSTOM_LIMITS = "Custom limits"
+
 
 class MainMenu(QWidget):
     """
@@ -25,6 +28,7 @@ class MainMenu(QWidget):
         self.overpopulation_limit = 3
         self.underpopulation_limit = 2
         self.reproduction_number = 3
+        self.rule_preset = CUSTOM_LIMITS
         
         self.setWindowTitle("Menu")
         self.setMinimumSize(600, 400)
@@ -71,15 +75,18 @@ class MainMenu(QWidget):
                 'wrap': self.wrap_enabled
             })
 
-        self.game_window = GameOfLifeGUI(**game_params)
-
-        if self.custom_rules_enabled:
-            self.game_window.game.set_custom_rules(
-                overpop=self.overpopulation_limit,
+        # the rule is passed to the game window, which sets it before the simulation starts
+        if self.custom_rules_enabled and self.rule_preset != CUSTOM_LIMITS:
+            game_params['rule'] = NAMED_RULES[self.rule_preset]
+        elif self.custom_rules_enabled:
+            game_params['rule'] = Rule.from_limits(
                 underpop=self.underpopulation_limit,
+                overpop=self.overpopulation_limit,
                 repro=self.reproduction_number
             )
 
+        self.game_window = GameOfLifeGUI(**game_params)
+
         with open("gui/styles/dark_theme.qss", "r") as f:
             self.game_window.setStyleSheet(f.read())
         self.game_window.show()
@@ -139,6 +146,12 @@ class MainMenu(QWidget):
         rules_layout = QFormLayout(rules_group)
 
         custom_rules_check = QCheckBox("Enable custom rules")
+        preset_box = QComboBox()
+        preset_box.addItem(CUSTOM_LIMITS)
+        for name, rulestring in NAMED_RULES.items():
+            preset_box.addItem(f"{name} ({rulestring})", name)
+        preset_index = preset_box.findData(self.rule_preset)
+        preset_box.setCurrentIndex(max(preset_index, 0))
         overpop_box = QSpinBox()
         underpop_box = QSpinBox()
         repro_box = QSpinBox()
@@ -153,18 +166,23 @@ class MainMenu(QWidget):
         repro_box.setValue(self.reproduction_number)
 
         rules_layout.addRow(custom_rules_check)
+        rules_layout.addRow("Rule:", preset_box)
         rules_layout.addRow("Overpopulation Limit:", overpop_box)
         rules_layout.addRow("Underpopulation Limit:", underpop_box)
         rules_layout.addRow("Reproduction Number:", repro_box)
 
-        def toggle_rules_inputs(checked):
-            """Enable or disable rule inputs based on checkbox state"""
-            overpop_box.setEnabled(checked)
-            underpop_box.setEnabled(checked)
-            repro_box.setEnabled(checked)
+        def toggle_rules_inputs(*_):
+            """Enable or disable rule inputs based on checkbox state and selected rule"""
+            checked = custom_rules_check.isChecked()
+            limits = preset_box.currentIndex() == 0
+            preset_box.setEnabled(checked)
+            overpop_box.setEnabled(checked and limits)
+            underpop_box.setEnabled(checked and limits)
+            repro_box.setEnabled(checked and limits)
 
         custom_rules_check.toggled.connect(toggle_rules_inputs)
-        toggle_rules_inputs(custom_rules_check.isChecked())
+        preset_box.currentIndexChanged.connect(toggle_rules_inputs)
+        toggle_rules_inputs()
 
         main_layout.addWidget(rules_group)
 
@@ -193,6 +211,7 @@ class MainMenu(QWidget):
             self.overpopulation_limit = overpop_box.value()
             self.underpopulation_limit = underpop_box.value()
             self.reproduction_number = repro_box.value()
+            self.rule_preset = preset_box.currentData() or CUSTOM_LIMITS
 
     def show_info(self):
         """Display information about Conway's Game of Life."""